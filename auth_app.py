@@ -5,6 +5,7 @@ A comprehensive Flask application with user authentication, session management,
 """
 
 import os
+import sys
 import json
 from datetime import datetime, timedelta
 from functools import wraps
@@ -13,8 +14,14 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-import pandas as pd
-import numpy as np
+
+# Background job queue lives in src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+try:
+    from job_routes import create_jobs_blueprint
+    JOBS_AVAILABLE = True
+except ImportError:
+    JOBS_AVAILABLE = False
 
 # Initialize Flask app
 app = Flask(__name__, template_folder='.', static_folder='.')
@@ -273,7 +280,7 @@ def logout():
 def dashboard():
     """User dashboard with personalized content"""
     user_preferences = UserPreferences.query.filter_by(user_id=current_user.id).first()
-    recent_analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).limit(5).all()
+    recent_analyses = sync_job_results(SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).limit(5).all())
     
     return render_template('user_dashboard.html', 
                          preferences=user_preferences, 
@@ -328,13 +335,19 @@ def save_analysis():
     """Save analysis results"""
     data = request.get_json()
     
+    # Forecast bands are computed at the user's confidence level unless the analysis sets one
+    parameters = data.get('parameters', {})
+    if data.get('analysis_type', 'forecast') == 'forecast' and 'confidence_level' not in parameters:
+        preferences = UserPreferences.query.filter_by(user_id=current_user.id).first()
+        parameters['confidence_level'] = preferences.confidence_level if preferences else 0.95
+    
     analysis = SavedAnalysis(
         user_id=current_user.id,
         title=data.get('title', 'Untitled Analysis'),
         analysis_type=data.get('analysis_type', 'forecast'),
         description=data.get('description', ''),
         countries=json.dumps(data.get('countries', [])),
-        parameters=json.dumps(data.get('parameters', {})),
+        parameters=json.dumps(parameters),
         results=json.dumps(data.get('results', {})),
         chart_data=json.dumps(data.get('chart_data', {})),
         is_public=data.get('is_public', False)
@@ -348,6 +361,15 @@ def save_analysis():
         db.session.rollback()
         return jsonify({'success': False, 'message': 'Failed to save analysis.'})
 
+# Background jobs (processed by `python src/job_queue.py`)
+if JOBS_AVAILABLE:
+    jobs_blueprint = create_jobs_blueprint(db, SavedAnalysis, UserPreferences)
+    app.register_blueprint(jobs_blueprint)
+
+def sync_job_results(analyses):
+    """Analyses with the results of their finished background jobs filled in"""
+    return jobs_blueprint.sync_analyses(analyses) if JOBS_AVAILABLE else analyses
+
 @app.route('/analytics')
 @login_required
 def analytics():
@@ -358,14 +380,14 @@ def analytics():
 @login_required
 def saved_analyses():
     """User saved analyses page"""
-    user_analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all()
+    user_analyses = sync_job_results(SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all())
     return render_template('user_saved.html', analyses=user_analyses)
 
 @app.route('/my_analyses')
 @login_required
 def my_analyses():
     """User's saved analyses"""
-    analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all()
+    analyses = sync_job_results(SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all())
     return render_template('my_analyses.html', analyses=analyses)
 
 @app.route('/api/user/preferences')
@@ -408,10 +430,8 @@ def internal_error(error):
     db.session.rollback()
     return render_template('500.html'), 500
 
-# Initialize database
-@app.before_first_request
-def create_tables():
-    """Create database tables"""
+# Initialize database at import; Flask 2.3 removed before_first_request
+with app.app_context():
     db.create_all()
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ A basic Flask application with user authentication for testing the new user page
 """
 
 import os
+import sys
 import json
 from datetime import datetime, timedelta
 from functools import wraps
@@ -13,6 +14,14 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# Background job queue lives in src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+try:
+    from job_routes import create_jobs_blueprint
+    JOBS_AVAILABLE = True
+except ImportError:
+    JOBS_AVAILABLE = False
+
 # Initialize Flask app
 app = Flask(__name__, template_folder='.', static_folder='.')
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'climate-action-hub-secret-key-2024')
@@ -270,7 +279,7 @@ def logout():
 def dashboard():
     """User dashboard with personalized content"""
     user_preferences = UserPreferences.query.filter_by(user_id=current_user.id).first()
-    recent_analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).limit(5).all()
+    recent_analyses = sync_job_results(SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).limit(5).all())
     
     return render_template('user_dashboard.html', 
                          preferences=user_preferences, 
@@ -329,7 +338,7 @@ def analytics():
 @login_required
 def saved_analyses():
     """User saved analyses page"""
-    user_analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all()
+    user_analyses = sync_job_results(SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).all())
     return render_template('user_saved.html', analyses=user_analyses)
 
 @app.route('/save_analysis', methods=['POST'])
@@ -338,13 +347,19 @@ def save_analysis():
     """Save analysis results"""
     data = request.get_json()
     
+    # Forecast bands are computed at the user's confidence level unless the analysis sets one
+    parameters = data.get('parameters', {})
+    if data.get('analysis_type', 'forecast') == 'forecast' and 'confidence_level' not in parameters:
+        preferences = UserPreferences.query.filter_by(user_id=current_user.id).first()
+        parameters['confidence_level'] = preferences.confidence_level if preferences else 0.95
+    
     analysis = SavedAnalysis(
         user_id=current_user.id,
         title=data.get('title', 'Untitled Analysis'),
         analysis_type=data.get('analysis_type', 'forecast'),
         description=data.get('description', ''),
         countries=json.dumps(data.get('countries', [])),
-        parameters=json.dumps(data.get('parameters', {})),
+        parameters=json.dumps(parameters),
         results=json.dumps(data.get('results', {})),
         chart_data=json.dumps(data.get('chart_data', {})),
         is_public=data.get('is_public', False)
@@ -358,6 +373,15 @@ def save_analysis():
         db.session.rollback()
         return jsonify({'success': False, 'message': 'Failed to save analysis.'})
 
+# Background jobs (processed by `python src/job_queue.py`)
+if JOBS_AVAILABLE:
+    jobs_blueprint = create_jobs_blueprint(db, SavedAnalysis, UserPreferences)
+    app.register_blueprint(jobs_blueprint)
+
+def sync_job_results(analyses):
+    """Analyses with the results of their finished background jobs filled in"""
+    return jobs_blueprint.sync_analyses(analyses) if JOBS_AVAILABLE else analyses
+
 # Create database tables
 with app.app_context():
     db.create_all()
@@ -2,9 +2,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.ensemble import RandomForestRegressor
+from concurrent.futures import ThreadPoolExecutor
+import io
+import json
 import os
+import threading
+
+from feature_store import get_feature_store
+from forecasting import forecast_intervals
+from model_store import ModelStore, model_key, training_data_fingerprint
+from serving_config import load_serving_config
+
+# Hyperparameters (tuned by hyperparameter_search.py), part of the model cache key
+RF_PARAMS = load_serving_config()['random_forest']
+
+features = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+target = 'co2'
+
+# Trees are grown in this many warm-started steps so training can report progress
+TRAINING_STEPS = 10
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -17,10 +33,122 @@ st.set_page_config(
 # --- Data Loading and Caching ---
 @st.cache_data
 def load_data():
+    """The dataset indexed by (country, year), so a selection is an index slice rather than a scan"""
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(script_dir, '..', 'data', 'owid-co2-data.csv')
     df = pd.read_csv(data_path)
-    return df
+    return df.set_index(['country', 'year'], drop=False).sort_index()
+
+@st.cache_resource
+def get_model_store():
+    return ModelStore()
+
+@st.cache_resource
+def get_training_pool():
+    """Background threads fitting models while the page stays responsive"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='forest-training')
+
+class TrainingJob:
+    """
+    Random Forest fit for one selection, run on the training pool.
+
+    A model already in the model store is loaded immediately; otherwise the
+    forest grows in TRAINING_STEPS warm-started steps (identical to a single
+    fit) and progress reports the share of trees built.
+    """
+
+    def __init__(self, countries, start_year, end_year):
+        feature_store = get_feature_store()
+        rows = feature_store.select(list(countries), start_year, end_year)
+        self.X = feature_store.features(features, rows)
+        self.y = feature_store.column(target, rows)
+        self.key = model_key(training_data_fingerprint(self.X, self.y), features, RF_PARAMS, list(countries))
+        self.progress = 0.0
+        self.model = None
+        self.error = None
+        self.done = threading.Event()
+
+        if self.y.size == 0:
+            self.error = "No training data for the selected countries and years."
+            self.done.set()
+            return
+        self.model = get_model_store().get(self.key)
+        if self.model is not None:
+            self.progress = 1.0
+            self.done.set()
+        else:
+            get_training_pool().submit(self._fit)
+
+    def _fit(self):
+        try:
+            from sklearn.ensemble import RandomForestRegressor
+            model = RandomForestRegressor(**{**RF_PARAMS, 'warm_start': True})
+            n_trees = model.n_estimators
+            for step in range(1, TRAINING_STEPS + 1):
+                model.set_params(n_estimators=max(1, n_trees * step // TRAINING_STEPS))
+                model.fit(self.X, self.y)
+                self.progress = step / TRAINING_STEPS
+            model.set_params(warm_start=False)
+            self.model = get_model_store().put(self.key, model)
+        except Exception as e:
+            self.error = f"Training failed: {e}"
+        finally:
+            self.done.set()
+
+@st.cache_resource(max_entries=32)
+def get_training_job(countries, start_year, end_year, params):
+    """Training job per (countries, years, hyperparameters); reruns reuse the running or finished fit"""
+    return TrainingJob(countries, start_year, end_year)
+
+@st.cache_data(max_entries=256)
+def forecast_tables(_model, key, countries, end_year, forecast_horizon, confidence_level):
+    """Forecast frames per country for a model (identified by its store key)"""
+    feature_store = get_feature_store()
+    forecast_results = {}
+    forecast_years = np.arange(end_year + 1, end_year + forecast_horizon + 1)
+    forecast_countries, latest_rows = feature_store.latest_rows(list(countries), end_year)
+    if forecast_countries:
+        # One vectorized pass over all trees for every selected country x horizon year
+        predictions, lower, upper = forecast_intervals(_model, feature_store.features(features, latest_rows),
+                                                       forecast_years, confidence_level)
+        for row, country in enumerate(forecast_countries):
+            forecast_results[country] = pd.DataFrame({
+                'year': forecast_years,
+                'predicted_co2': predictions[row],
+                'lower_bound': lower[row],
+                'upper_bound': upper[row]
+            })
+    return forecast_results
+
+@st.cache_data(max_entries=128)
+def render_chart(_forecast_results, key, countries, start_year, end_year, forecast_horizon, confidence_level):
+    """PNG of the historical and forecast chart, rendered once per selection, horizon and confidence level"""
+    from matplotlib.figure import Figure
+
+    df = load_data()
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+
+    for country in countries:
+        # Plot historical data
+        hist_df = df.loc[(country, slice(start_year, end_year)), :] if country in df.index else df.iloc[:0]
+        ax.plot(hist_df['year'], hist_df['co2'], label=f"Historical CO2 Emissions - {country}")
+
+        # Plot forecasted data
+        if country in _forecast_results:
+            forecast_df = _forecast_results[country]
+            ax.plot(forecast_df['year'], forecast_df['predicted_co2'], linestyle='--', label=f"Forecasted CO2 Emissions - {country}")
+            ax.fill_between(forecast_df['year'], forecast_df['lower_bound'], forecast_df['upper_bound'], alpha=0.2)
+
+    ax.set_title("CO2 Emissions Forecast")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("CO2 Emissions (in million tonnes)")
+    ax.legend()
+    ax.grid(True)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
 
 df = load_data()
 
@@ -28,7 +156,7 @@ df = load_data()
 st.sidebar.title("Configuration")
 
 # Country selection
-countries = sorted(df['country'].unique())
+countries = list(df.index.get_level_values('country').unique())
 selected_countries = st.sidebar.multiselect("Select Countries", countries, default=['Kenya', 'China', 'United States'])
 
 # Year selection
@@ -39,85 +167,50 @@ end_year = st.sidebar.slider("End Year", min_year, max_year, max_year)
 # Forecast horizon
 forecast_horizon = st.sidebar.slider("Forecast Horizon (Years)", 1, 20, 8)
 
+# Prediction interval, as in UserPreferences.confidence_level
+confidence_level = st.sidebar.slider("Confidence Level", 0.50, 0.99, 0.95, 0.01)
+
 # --- Main Content ---
 st.title("CO2 Emissions Forecast")
 st.write("This application forecasts CO2 emissions for selected countries using a Random Forest Regressor model.")
 
-# Filter data based on selection
-filtered_df = df[(df['country'].isin(selected_countries)) & (df['year'] >= start_year) & (df['year'] <= end_year)]
+# Slice the selection out of the (country, year) index
+selection = tuple(selected_countries)
+filtered_df = df.loc[(list(selection), slice(start_year, end_year)), :] if selection else df.iloc[:0]
 
 # --- Model Training and Forecasting ---
 
-# Prepare data for the model
-model_df = filtered_df.copy()
-features = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
-target = 'co2'
-
-# Handle missing values
-for col in features + [target]:
-    model_df[col].fillna(model_df.groupby('country')[col].transform('mean'), inplace=True)
-    model_df[col].fillna(model_df[col].mean(), inplace=True) # Fill remaining NaNs
-
-X = model_df[features]
-y = model_df[target]
-
-# Train the model
-model = RandomForestRegressor(n_estimators=100, random_state=42)
-model.fit(X, y)
+# Only the countries and training years select a model; horizon and confidence changes reuse it.
+# Imputed features come precomputed from the feature store; no per-rerun fillna passes.
+job_args = (tuple(sorted(selection)), start_year, end_year, json.dumps(RF_PARAMS, sort_keys=True))
+job = get_training_job(*job_args)
+if not job.done.is_set():
+    # Any widget change interrupts this wait; the fit carries on in the background
+    progress = st.progress(job.progress, text="Training Random Forest...")
+    while not job.done.wait(0.1):
+        progress.progress(job.progress, text=f"Training Random Forest... {job.progress:.0%}")
+    progress.empty()
+if job.error:
+    # Forget the failed job so the next rerun tries again
+    get_training_job.clear(*job_args)
+    st.warning(job.error)
+    st.stop()
+model = job.model
 
 # --- Forecasting ---
-forecast_results = {}
-for country in selected_countries:
-    country_df = model_df[model_df['country'] == country]
-    if not country_df.empty:
-        latest_data = country_df.iloc[-1]
-        forecast_data = []
-        for year in range(end_year + 1, end_year + forecast_horizon + 1):
-            gdp = latest_data['gdp'] * (1.02 ** (year - latest_data['year']))
-            population = latest_data['population'] * (1.01 ** (year - latest_data['year']))
-            energy_use = latest_data['primary_energy_consumption'] * (1.02 ** (year - latest_data['year']))
-            energy_per_capita = latest_data['energy_per_capita'] * (1.05 ** (year - latest_data['year']))
-            
-            prediction = model.predict([[year, gdp, population, energy_use, energy_per_capita]])
-            forecast_data.append({'year': year, 'predicted_co2': prediction[0]})
-            
-            latest_data = {
-                'year': year,
-                'gdp': gdp,
-                'population': population,
-                'primary_energy_consumption': energy_use,
-                'energy_per_capita': energy_per_capita
-            }
-        forecast_results[country] = pd.DataFrame(forecast_data)
+forecast_results = forecast_tables(model, job.key, selection, end_year, forecast_horizon, confidence_level)
 
 # --- Visualization ---
 st.subheader("Historical and Forecasted CO2 Emissions")
-
-fig, ax = plt.subplots(figsize=(12, 8))
-
-for country in selected_countries:
-    # Plot historical data
-    hist_df = filtered_df[filtered_df['country'] == country]
-    ax.plot(hist_df['year'], hist_df['co2'], label=f"Historical CO2 Emissions - {country}")
-    
-    # Plot forecasted data
-    if country in forecast_results:
-        forecast_df = forecast_results[country]
-        ax.plot(forecast_df['year'], forecast_df['predicted_co2'], linestyle='--', label=f"Forecasted CO2 Emissions - {country}")
-
-ax.set_title("CO2 Emissions Forecast")
-ax.set_xlabel("Year")
-ax.set_ylabel("CO2 Emissions (in million tonnes)")
-ax.legend()
-ax.grid(True)
-st.pyplot(fig)
+st.image(render_chart(forecast_results, job.key, selection, start_year, end_year, forecast_horizon, confidence_level),
+         width='stretch')
 
 # --- Display Data ---
 st.subheader("Raw and Forecasted Data")
-st.write(filtered_df)
+st.write(filtered_df.reset_index(drop=True))
 
 if forecast_results:
     st.subheader("Forecasted Data")
     for country, forecast_df in forecast_results.items():
         st.write(f"**{country}**")
-        st.write(forecast_df)
\ No newline at end of file
+        st.write(forecast_df)
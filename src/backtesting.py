@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Rolling-Origin Backtesting for Climate Action Hub
+Evaluates forecasting models per country across many cutoff years
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from forecasting import batch_forecast
+from imputation import impute_rows
+from trend_forecaster import TrendForecaster
+
+# Models available to the harness; "trend" is the damped log-linear trend model.
+# Factories take hyperparameters overriding the defaults.
+MODEL_FACTORIES = {
+    "linear_regression": LinearRegression,
+    "random_forest": lambda **params: RandomForestRegressor(**{"n_estimators": 100, "random_state": 42, **params}),
+}
+MODELS = ("linear_regression", "random_forest", "trend")
+
+DEFAULT_HORIZON = 5
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'backtest_results.json')
+
+class BacktestData:
+    """
+    Dataset as arrays: one row per country and year, features with the year first.
+
+    Rows keep file order within a country, so the "latest row" at a cutoff is
+    the same one the production forecast would use. Missing values are NaN:
+    features are imputed per fold from the years up to the cutoff, and rows
+    without an observed target are neither trained on nor scored.
+    """
+
+    def __init__(self, countries, years, X, y):
+        self.countries = np.asarray(countries)
+        self.years = np.asarray(years, dtype=int)
+        self.X = np.asarray(X, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.names, self.codes = np.unique(self.countries, return_inverse=True)
+
+    @classmethod
+    def from_feature_store(cls, feature_store, features, target):
+        """
+        Build from the feature store; features[0] must be the year.
+
+        The store's imputed cells are interpolated from each country's whole
+        series, later years included, so they are reset to NaN here.
+        """
+        countries = np.asarray(feature_store.countries)[feature_store.row_codes]
+        X = np.array(feature_store.features(features))
+        for index, name in enumerate(features[1:], start=1):
+            if f"{name}_imputed" not in feature_store.column_index:
+                raise ValueError(f"Backtests need observed values for every feature; {name} is derived")
+            X[feature_store.column(f"{name}_imputed") > 0, index] = np.nan
+        y = np.where(feature_store.column(f"{target}_imputed") > 0, np.nan, feature_store.column(target))
+        return cls(countries, feature_store.column('year'), X, y)
+
+    def fold_features(self, cutoff):
+        """Features with gaps in years <= cutoff imputed from those years only; later rows are left as observed"""
+        X = self.X.copy()
+        rows = np.flatnonzero(self.years <= cutoff)
+        if np.isnan(X[rows]).any():
+            X[rows], _ = impute_rows(self.codes[rows], self.years[rows], X[rows], len(self.names))
+        return X
+
+    def latest_rows(self, mask):
+        """Index of the last masked row per country (-1 where a country has none)"""
+        rows = np.flatnonzero(mask)
+        latest = np.full(len(self.names), -1)
+        latest[self.codes[rows]] = rows  # later rows overwrite earlier ones
+        return latest
+
+    def actuals(self, cutoff, horizon):
+        """(countries, horizon) matrix of observed targets after the cutoff, NaN where missing"""
+        actual = np.full((len(self.names), horizon), np.nan)
+        offset = self.years - cutoff - 1
+        rows = np.flatnonzero((offset >= 0) & (offset < horizon))
+        actual[self.codes[rows], offset[rows]] = self.y[rows]
+        return actual
+
+    def target_matrix(self, cutoff):
+        """(years, countries) target matrix up to the cutoff, for the trend model"""
+        years = np.unique(self.years[self.years <= cutoff])
+        matrix = np.full((len(years), len(self.names)), np.nan)
+        rows = np.flatnonzero(self.years <= cutoff)
+        matrix[np.searchsorted(years, self.years[rows]), self.codes[rows]] = self.y[rows]
+        return years, matrix
+
+# Dataset installed in each worker process by the pool initializer
+_worker_data = {}
+
+def _install_data(data):
+    _worker_data["data"] = data
+
+def run_fold(data, model_name, cutoff, horizon, params=None):
+    """
+    Train on years <= cutoff and forecast cutoff+1..cutoff+horizon for every country.
+
+    Machine learning models are evaluated through the production forecasting
+    path (latest row + growth assumptions + one batched predict), on features
+    imputed from years <= cutoff only. params are
+    hyperparameters for the model (TrendForecaster keyword arguments for "trend").
+    """
+    params = params or {}
+    actual = data.actuals(cutoff, horizon)
+    start = time.perf_counter()
+
+    if model_name == "trend":
+        years, matrix = data.target_matrix(cutoff)
+        forecaster = TrendForecaster(list(data.names), years, matrix, **params)
+        fit_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        predicted = np.full(actual.shape, np.nan)
+        # The trend model's base year is the cutoff whenever any country reports in it
+        if forecaster.base_year == cutoff:
+            result = forecaster.forecast(horizon=horizon)
+            for country, forecast in result["forecasts"].items():
+                predicted[forecaster.index[country]] = forecast["co2"]
+    else:
+        history = data.years <= cutoff
+        train = history & ~np.isnan(data.y)
+        X = data.fold_features(cutoff)
+        model = MODEL_FACTORIES[model_name](**params)
+        model.fit(X[train], data.y[train])
+        fit_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        latest = data.latest_rows(history)
+        predicted = np.full(actual.shape, np.nan)
+        has_history = latest >= 0
+        if has_history.any():
+            predicted[has_history] = batch_forecast(model, X[latest[has_history]],
+                                                    np.arange(cutoff + 1, cutoff + horizon + 1))
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        "model": model_name,
+        "cutoff": cutoff,
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "predicted": predicted,
+        "actual": actual
+    }
+
+def _run_worker_fold(model_name, cutoff, horizon, params=None):
+    return run_fold(_worker_data["data"], model_name, cutoff, horizon, params)
+
+def _errors(predicted, actual):
+    """Absolute and relative errors; NaN where either side is missing"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        abs_error = np.abs(predicted - actual)
+        return abs_error, np.where(actual > 0, abs_error / np.abs(actual), np.nan)
+
+def _error_summary(abs_error, pct_error):
+    """MAE and MAPE (%) over the finite entries"""
+    abs_error = abs_error[np.isfinite(abs_error)]
+    pct_error = pct_error[np.isfinite(pct_error)]
+    return {
+        "mae": round(float(abs_error.mean()), 4) if abs_error.size else None,
+        "mape": round(float(pct_error.mean()) * 100, 2) if pct_error.size else None,
+        "n": int(abs_error.size)
+    }
+
+def summarize(folds, names, horizon):
+    """Accuracy tables per model, per model x horizon and per model x country"""
+    models = {}
+    by_country = {}
+    for model_name in sorted({fold["model"] for fold in folds}):
+        model_folds = [fold for fold in folds if fold["model"] == model_name]
+        abs_error, pct_error = _errors(np.stack([fold["predicted"] for fold in model_folds]),
+                                       np.stack([fold["actual"] for fold in model_folds]))
+        fit_seconds = [fold["fit_seconds"] for fold in model_folds]
+
+        models[model_name] = {
+            **_error_summary(abs_error, pct_error),
+            "by_horizon": [_error_summary(abs_error[:, :, h], pct_error[:, :, h]) for h in range(horizon)],
+            "folds": len(model_folds),
+            "fit_seconds_mean": round(float(np.mean(fit_seconds)), 4),
+            "fit_seconds_total": round(float(np.sum(fit_seconds)), 4),
+            "predict_seconds_total": round(float(sum(fold["predict_seconds"] for fold in model_folds)), 4)
+        }
+        by_country[model_name] = {
+            str(country): summary
+            for column, country in enumerate(names)
+            for summary in [_error_summary(abs_error[:, column], pct_error[:, column])]
+            if summary["n"]
+        }
+    return models, by_country
+
+def run_backtest(data, cutoffs, horizon=DEFAULT_HORIZON, models=MODELS, max_workers=None, output_file=None):
+    """
+    Run every (model, cutoff) fold in a process pool and return the results.
+
+    The results (accuracy tables, per-fold timings and total wall-clock time)
+    are also written as JSON when output_file is given.
+    """
+    for model_name in models:
+        if model_name != "trend" and model_name not in MODEL_FACTORIES:
+            raise ValueError(f"Unknown model: {model_name}")
+
+    start = time.perf_counter()
+    tasks = [(model_name, int(cutoff)) for model_name in models for cutoff in cutoffs]
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks)) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_install_data, initargs=(data,)) as pool:
+        futures = [pool.submit(_run_worker_fold, model_name, cutoff, horizon) for model_name, cutoff in tasks]
+        folds = [future.result() for future in futures]
+    wall_clock = time.perf_counter() - start
+
+    summary, by_country = summarize(folds, data.names, horizon)
+    results = {
+        "generated_at": datetime.now().isoformat(),
+        "horizon": horizon,
+        "cutoffs": [int(cutoff) for cutoff in cutoffs],
+        "workers": workers,
+        "wall_clock_seconds": round(wall_clock, 4),
+        "models": summary,
+        "by_country": by_country,
+        "folds": [
+            {
+                "model": fold["model"],
+                "cutoff": fold["cutoff"],
+                "fit_seconds": round(fold["fit_seconds"], 4),
+                "predict_seconds": round(fold["predict_seconds"], 4),
+                **_error_summary(*_errors(fold["predicted"], fold["actual"]))
+            }
+            for fold in folds
+        ]
+    }
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Backtest results written to {output_file}")
+    return results
+
+def main():
+    from feature_store import get_feature_store
+    from main import features, target
+
+    data = BacktestData.from_feature_store(get_feature_store(), features, target)
+    last_year = int(data.years.max())
+    cutoffs = range(last_year - 20, last_year - DEFAULT_HORIZON + 1)
+
+    results = run_backtest(data, cutoffs, output_file=RESULTS_FILE)
+    print(f"\n{'Model':<20}{'MAE':>12}{'MAPE %':>10}{'Fit s':>10}")
+    for model_name, summary in results["models"].items():
+        print(f"{model_name:<20}{summary['mae']:>12}{summary['mape']:>10}{summary['fit_seconds_mean']:>10}")
+    print(f"\nWall clock: {results['wall_clock_seconds']}s over {len(results['folds'])} folds")
+
+if __name__ == "__main__":
+    main()
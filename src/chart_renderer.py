@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Headless Chart Rendering for Climate Action Hub
+Renders history + forecast charts with the Agg backend into a content-addressed PNG cache
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Rendered charts live under <repo>/data/charts as <key>.png
+CHART_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'charts')
+
+# Disk budget for cached charts; the least recently used files are evicted beyond it
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+DEFAULT_SIZE = (1200, 800)
+MIN_SIZE, MAX_SIZE = 200, 4000
+DPI = 100
+
+DEFAULT_HORIZON = 10
+MAX_HORIZON = 50
+MAX_COUNTRIES = 12
+
+# Forecast band drawn around the forest's mean forecast
+CHART_CONFIDENCE = 0.95
+
+CHART_SUFFIX = '.png'
+
+def chart_key(data_version, countries, horizon, size):
+    """
+    Content address of a chart.
+
+    Changes with the data and model version, the countries (in legend order),
+    the horizon and the pixel size.
+    """
+    description = {
+        "data": data_version,
+        "countries": list(countries),
+        "horizon": int(horizon),
+        "size": [int(size[0]), int(size[1])],
+        "confidence": CHART_CONFIDENCE
+    }
+    encoded = json.dumps(description, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+def chart_request(countries, horizon=DEFAULT_HORIZON, size=DEFAULT_SIZE):
+    """Validated (countries, horizon, size); raises ValueError for unusable requests"""
+    countries = tuple(country for country in countries if country)
+    if not countries:
+        raise ValueError("At least one country is required")
+    if len(countries) > MAX_COUNTRIES:
+        raise ValueError(f"At most {MAX_COUNTRIES} countries fit in one chart")
+    width, height = (int(value) for value in size)
+    if not (MIN_SIZE <= width <= MAX_SIZE and MIN_SIZE <= height <= MAX_SIZE):
+        raise ValueError(f"Chart size must be between {MIN_SIZE} and {MAX_SIZE} pixels per side")
+    return countries, max(1, min(int(horizon), MAX_HORIZON)), (width, height)
+
+def data_version(feature_store, forest):
+    """Version of everything a chart is drawn from: the feature store build and the forest"""
+    return f"{os.path.basename(feature_store.directory)}-{forest.fingerprint}"
+
+def draw_chart(feature_store, forest, countries, horizon, size):
+    """PNG bytes of the historical series and forest forecasts for the countries"""
+    # Agg canvas on a standalone Figure: no pyplot state, no display needed
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from forecasting import forest_forecast
+
+    forecast = forest_forecast(forest, feature_store, list(countries), horizon, CHART_CONFIDENCE)
+    fig = Figure(figsize=(size[0] / DPI, size[1] / DPI), dpi=DPI)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    for country in countries:
+        rows = feature_store.select([country])
+        if rows.size:
+            ax.plot(feature_store.column('year', rows), feature_store.column('co2', rows),
+                    label=f'Historical CO2 Emissions - {country}')
+        if country in forecast["forecasts"]:
+            predicted = forecast["forecasts"][country]
+            ax.plot(forecast["years"], predicted["co2"], linestyle='--', label=f'Forecasted CO2 Emissions - {country}')
+            ax.fill_between(forecast["years"], predicted["lower"], predicted["upper"], alpha=0.2)
+
+    ax.set_title(f'CO2 Emissions Forecast up to {forecast["years"][-1]}')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('CO2 Emissions (in million tonnes)')
+    ax.legend()
+    ax.grid(True)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+class ChartRenderer:
+    """
+    Content-addressed PNG cache of forecast charts.
+
+    Charts are drawn from the feature store and the exported serving forest
+    and stored as <key>.png, so every process (the data server, email digests,
+    static page builds) reuses a chart once any of them has rendered it.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, data_file=None, features_dir=None,
+                 forest_dir=None):
+        self.directory = os.path.abspath(directory or CHART_DIR)
+        self.max_bytes = max_bytes
+        self.data_file = data_file
+        self.features_dir = features_dir
+        self.forest_dir = forest_dir
+
+    def sources(self):
+        """Current (feature store, serving forest); raises RuntimeError without them"""
+        from feature_store import get_feature_store
+        from forest_export import get_serving_forest
+
+        forest = get_serving_forest(self.forest_dir)
+        feature_store = get_feature_store(self.data_file, self.features_dir) if forest is not None else None
+        if forest is None or feature_store is None:
+            raise RuntimeError("Random forest model not exported; run src/main.py first")
+        return feature_store, forest
+
+    def path(self, key):
+        return os.path.join(self.directory, key + CHART_SUFFIX)
+
+    def cached(self, key):
+        """Path of a stored chart (marked as recently used), or None"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def _write(self, key, png):
+        path = self.path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_file = f"{path}.{os.getpid()}.tmp"
+        with open(temp_file, 'wb') as file:
+            file.write(png)
+        os.replace(temp_file, path)
+        return path
+
+    def render(self, countries, horizon=DEFAULT_HORIZON, size=DEFAULT_SIZE):
+        """Return (key, path) of the chart, drawing it in this process on a cache miss"""
+        countries, horizon, size = chart_request(countries, horizon, size)
+        feature_store, forest = self.sources()
+        key = chart_key(data_version(feature_store, forest), countries, horizon, size)
+        path = self.cached(key)
+        if path is None:
+            path = self._write(key, draw_chart(feature_store, forest, countries, horizon, size))
+            self._evict(keep=key)
+        return key, path
+
+    def render_many(self, requests, max_workers=None):
+        """
+        Render (countries, horizon, size) requests across a process pool.
+
+        Cached charts and duplicate requests are not redrawn. Returns the
+        (key, path) of every request, in order.
+        """
+        requests = [chart_request(*request) for request in requests]
+        version = data_version(*self.sources())
+        keys = [chart_key(version, *request) for request in requests]
+
+        missing = {}
+        for key, request in zip(keys, requests):
+            if key not in missing and self.cached(key) is None:
+                missing[key] = request
+        if missing:
+            workers = min(max_workers or os.cpu_count() or 1, len(missing))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_install_renderer,
+                                     initargs=(self.directory, self.data_file, self.features_dir, self.forest_dir)) as pool:
+                list(pool.map(_render_in_worker, missing.keys(), missing.values()))
+            self._evict(keep=set(keys))
+        return [(key, self.path(key)) for key in keys]
+
+    def _entries(self):
+        """Stored charts as (mtime, size, path), oldest first"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(CHART_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def _evict(self, keep=()):
+        keep = {keep} if isinstance(keep, str) else set(keep)
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if os.path.basename(path)[:-len(CHART_SUFFIX)] in keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+# Renderer installed in each worker process by the pool initializer
+_worker_renderer = {}
+
+def _install_renderer(directory, data_file, features_dir, forest_dir):
+    _worker_renderer["renderer"] = ChartRenderer(directory, data_file=data_file, features_dir=features_dir,
+                                                 forest_dir=forest_dir)
+
+def _render_in_worker(key, request):
+    renderer = _worker_renderer["renderer"]
+    feature_store, forest = renderer.sources()
+    return renderer._write(key, draw_chart(feature_store, forest, *request))
+
+def main():
+    """Pre-render charts for country sets given as arguments, e.g. Kenya,China "United States" """
+    country_sets = [argument.split(',') for argument in sys.argv[1:]] or [['Kenya', 'China', 'United States']]
+    renderer = ChartRenderer()
+    for (key, path), countries in zip(renderer.render_many([(countries,) for countries in country_sets]), country_sets):
+        print(f"{', '.join(countries)}: /api/charts/{key}.png ({path})")
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,326 @@ Processes CO2 emissions, temperature, and sea level data
 import csv
 import json
 import os
+import sys
 import numpy as np
+from array import array
+from collections import OrderedDict
 from datetime import datetime
+from functools import wraps
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_processor import is_aggregate, StatisticsCatalog
+
+# Temperature anomaly multipliers for different regions
+REGIONAL_TEMPERATURE_MULTIPLIERS = {
+    "Arctic": 2.0,      # Arctic amplification effect
+    "North America": 1.1,
+    "Europe": 1.2,
+    "Asia": 1.0,
+    "Africa": 0.9,
+    "South America": 0.8,
+    "Oceania": 1.0,
+    "Antarctica": 1.5
+}
+
+# Sea level rise varies by region due to ocean currents, glacial rebound, etc.
+REGIONAL_SEA_LEVEL_MULTIPLIERS = {
+    "Pacific Islands": 1.5,    # Higher vulnerability
+    "Indian Ocean": 1.3,
+    "Atlantic": 1.1,
+    "Mediterranean": 1.2,
+    "Caribbean": 1.4,
+    "Arctic": 0.8,             # Less rise due to land rebound
+    "Antarctic": 0.9,
+    "Pacific": 1.0             # Continental Pacific coasts
+}
+
+# Region membership table keyed by iso_code (country, region, coastal_region)
+REGION_MEMBERSHIP_FILE = 'region_membership.csv'
+
+# Local mirrors of the NOAA global temperature and NASA sea level datasets
+TEMPERATURE_FILE = 'noaa_global_temperature_anomaly.csv'
+SEA_LEVEL_FILE = 'nasa_gmsl.txt'
+SERIES_FILES = {"temperature": TEMPERATURE_FILE, "sea_level": SEA_LEVEL_FILE}
+
+# Binary snapshots of parsed series live under <data_path>/cache
+SNAPSHOT_DIR = 'cache'
+
+# NASA GMSL columns (0-based): year+fraction, and the smoothed GIA-applied GMSL
+# variation with annual and semi-annual signals removed
+GMSL_TIME_COLUMN = 2
+GMSL_VALUE_COLUMN = 11
+GMSL_FILL_VALUE = 99900.0
+
+# Strong El Niño years bumped in the synthetic temperature series
+EL_NINO_YEARS = [1998, 2010, 2016, 2020]
+
+def _vulnerability_level(multiplier):
+    return "High" if multiplier > 1.3 else "Medium" if multiplier > 1.0 else "Low"
+
+def _grouped_sums(codes, values, n_groups):
+    """Per-group, per-year sums and counts of a country x year matrix (NaN cells and code -1 skipped)"""
+    n_years = values.shape[1]
+    valid = (codes[:, None] >= 0) & ~np.isnan(values)
+    groups = (codes[:, None] * n_years + np.arange(n_years)[None, :])[valid]
+    sums = np.bincount(groups, weights=values[valid], minlength=n_groups * n_years)
+    counts = np.bincount(groups, minlength=n_groups * n_years)
+    return sums.reshape(n_groups, n_years), counts.reshape(n_groups, n_years)
+
+def _rounded_or_none(values, counts, digits):
+    return [round(value, digits) if count else None for value, count in zip(values.tolist(), counts.tolist())]
+
+def parse_noaa_temperature_csv(path):
+    """
+    Stream a NOAA "Climate at a Glance" global time series CSV.
+    
+    Metadata lines ("Units: ...", "Base Period: ...", "Missing: -999") precede
+    the data; dates are YYYY for annual files or YYYYMM for monthly ones.
+    Returns (times as fractional years at the period midpoint, values, metadata).
+    """
+    times = array('d')
+    values = array('d')
+    metadata = {}
+    missing = None
+    
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            date, _, rest = line.partition(',')
+            if not date[:1].isdigit():
+                key, separator, value = line.partition(':')
+                if separator:
+                    metadata[key.strip().lower()] = value.strip()
+                    if key.strip().lower() == 'missing':
+                        missing = float(value)
+                continue
+            
+            value = float(rest.split(',')[0])
+            if missing is not None and value == missing:
+                continue
+            if len(date) == 6:
+                times.append(int(date[:4]) + (int(date[4:]) - 0.5) / 12)
+            else:
+                times.append(int(date) + 0.5)
+            values.append(value)
+    
+    return np.frombuffer(times, dtype=np.float64), np.frombuffer(values, dtype=np.float64), metadata
+
+def parse_nasa_gmsl_text(path, time_column=GMSL_TIME_COLUMN, value_column=GMSL_VALUE_COLUMN):
+    """
+    Stream a NASA GSFC global mean sea level text file.
+    
+    Header lines start with HDR (or #); data lines are whitespace separated
+    with the year+fraction and GMSL variation (mm) in the given columns.
+    """
+    times = array('d')
+    values = array('d')
+    metadata = {}
+    
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.startswith(('HDR', '#')):
+                metadata.setdefault('header', []).append(line[3:].strip() if line.startswith('HDR') else line[1:].strip())
+                continue
+            fields = line.split()
+            if len(fields) <= max(time_column, value_column):
+                continue
+            value = float(fields[value_column])
+            if value >= GMSL_FILL_VALUE:
+                continue
+            times.append(float(fields[time_column]))
+            values.append(value)
+    
+    return np.frombuffer(times, dtype=np.float64), np.frombuffer(values, dtype=np.float64), metadata
+
+# Periods per year for the UserPreferences.data_granularity options
+GRANULARITIES = {"annual": 1, "quarterly": 4, "monthly": 12}
+
+def resample_series(times, values, periods_per_year, method="auto"):
+    """
+    Resample an irregular series onto a regular grid of periods_per_year bins.
+    
+    Bins holding source samples take their mean (downsampling); empty bins are
+    linearly interpolated between neighbouring samples (upsampling), unless
+    method is "aggregate" (empty bins stay NaN) or "interpolate" (every bin is
+    interpolated at its midpoint). Returns bin midpoints, values and the mask
+    of interpolated bins.
+    """
+    if method not in ("auto", "aggregate", "interpolate"):
+        raise ValueError(f"Unknown resampling method: {method}")
+    
+    start = int(np.floor(times.min()))
+    end = int(np.floor(times.max()))
+    n_periods = (end - start + 1) * periods_per_year
+    centers = start + (np.arange(n_periods) + 0.5) / periods_per_year
+    
+    bins = np.minimum(np.floor((times - start) * periods_per_year).astype(np.int64), n_periods - 1)
+    sums = np.bincount(bins, weights=values, minlength=n_periods)
+    counts = np.bincount(bins, minlength=n_periods)
+    interpolated = np.interp(centers, times, values, left=np.nan, right=np.nan)
+    
+    if method == "interpolate":
+        return centers, interpolated, np.ones(n_periods, dtype=bool)
+    aggregated = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    if method == "aggregate":
+        return centers, aggregated, np.zeros(n_periods, dtype=bool)
+    return centers, np.where(counts > 0, aggregated, interpolated), counts == 0
+
+def period_labels(start_year, n_periods, periods_per_year):
+    """Labels such as 1993, 1993-Q1 or 1993-01 for a regular period grid"""
+    labels = []
+    for index in range(n_periods):
+        year, period = divmod(index, periods_per_year)
+        year += start_year
+        if periods_per_year == 1:
+            labels.append(str(year))
+        elif periods_per_year == 4:
+            labels.append(f"{year}-Q{period + 1}")
+        else:
+            labels.append(f"{year}-{period + 1:02d}")
+    return labels
+
+def annual_means(times, values):
+    """Average a sub-annual series into calendar years with one grouped reduction"""
+    years = np.floor(times).astype(np.int64)
+    unique_years, inverse = np.unique(years, return_inverse=True)
+    sums = np.bincount(inverse, weights=values)
+    counts = np.bincount(inverse)
+    return unique_years, sums / counts
+
+class ProductCache:
+    """
+    Memoizes derived data products per version of the input datasets they depend on.
+    
+    Each product declares the datasets it is derived from; a product is recomputed
+    only when one of those dataset versions changes, so e.g. a new CO2 release
+    invalidates the regional products but not the global temperature series.
+    """
+    
+    def __init__(self, version_of):
+        self._version_of = version_of
+        self._entries = {}
+        self._stats = {}
+    
+    def get(self, key, datasets, compute):
+        """Return the cached product for key, computing it if any dependency changed"""
+        versions = tuple(self._version_of(dataset) for dataset in datasets)
+        stats = self._stats.setdefault(key, {
+            "depends_on": list(datasets), "hits": 0, "misses": 0, "invalidations": 0
+        })
+        
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == versions:
+                stats["hits"] += 1
+                return entry[1]
+            stats["invalidations"] += 1
+            del self._entries[key]
+        
+        stats["misses"] += 1
+        value = compute()
+        # Missing inputs (None) are not cached so a later data drop is picked up
+        if value is not None:
+            self._entries[key] = (versions, value)
+        return value
+    
+    def invalidate(self, dataset=None):
+        """Drop every product depending on dataset (all products when None)"""
+        for key in list(self._entries):
+            if dataset is None or dataset in self._stats[key]["depends_on"]:
+                del self._entries[key]
+                self._stats[key]["invalidations"] += 1
+    
+    def stats(self):
+        products = {
+            self._key_name(key): dict(stats, cached=key in self._entries)
+            for key, stats in self._stats.items()
+        }
+        return {
+            "hits": sum(stats["hits"] for stats in self._stats.values()),
+            "misses": sum(stats["misses"] for stats in self._stats.values()),
+            "cached_products": len(self._entries),
+            "products": products
+        }
+    
+    @staticmethod
+    def _key_name(key):
+        return key if isinstance(key, str) else ":".join(str(part) for part in key)
+
+def memoized(*datasets):
+    """Cache a ClimateDataProcessor method's result until one of its datasets changes"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            key = (method.__name__,) + args if args else method.__name__
+            return self._products.get(key, datasets, lambda: method(self, *args))
+        return wrapper
+    return decorator
 
 class ClimateDataProcessor:
-    def __init__(self):
+    # Version tag for the series compiled into this module
+    BUILTIN_DATA_VERSION = "builtin-2023"
+    
+    def __init__(self, data_path=None, bundle_cache_size=128):
         self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.data_path = os.path.join(self.base_path, 'data')
-        
+        self.data_path = data_path or os.path.join(self.base_path, 'data')
+        # Reference table shipped with the repository, independent of the dataset mirror
+        self.region_file = os.path.join(self.base_path, 'data', REGION_MEMBERSHIP_FILE)
+        self._products = ProductCache(self.dataset_version)
+        self.bundle_cache_size = bundle_cache_size
+        self._bundles = OrderedDict()
+        self._bundle_stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def dataset_version(self, dataset):
+        """Current version of an input dataset; cached products are keyed by these"""
+        if dataset == "co2":
+            try:
+                stat = os.stat(os.path.join(self.data_path, 'owid-co2-data.csv'))
+            except OSError:
+                return None
+            return (stat.st_mtime_ns, stat.st_size)
+        if dataset in ("temperature", "sea_level"):
+            try:
+                stat = os.stat(os.path.join(self.data_path, SERIES_FILES[dataset]))
+            except OSError:
+                return self.BUILTIN_DATA_VERSION
+            return (stat.st_mtime_ns, stat.st_size)
+        if dataset == "regions":
+            try:
+                stat = os.stat(self.region_file)
+            except OSError:
+                return None
+            return (stat.st_mtime_ns, stat.st_size)
+        raise ValueError(f"Unknown dataset: {dataset}")
+    
+    def cache_stats(self):
+        """Hit/miss/invalidation counters for the memoized data products"""
+        stats = self._products.stats()
+        stats["country_bundles"] = dict(self._bundle_stats, size=len(self._bundles),
+                                        maxsize=self.bundle_cache_size)
+        return stats
+    
+    def invalidate_cache(self, dataset=None):
+        """Force recomputation of products derived from dataset (or all products)"""
+        self._products.invalidate(dataset)
+        self._bundles.clear()
+    
     def load_co2_data(self):
         """Load CO2 emissions data from CSV file"""
+        ingested = self._ingest_co2_data()
+        return ingested["data"] if ingested else None
+    
+    def get_statistics_catalog(self):
+        """Per-column and per-country statistics computed while the CO2 data was ingested"""
+        ingested = self._ingest_co2_data()
+        return ingested["statistics"] if ingested else None
+    
+    @memoized("co2")
+    def _ingest_co2_data(self):
+        """Parse the CO2 CSV once, collecting the statistics catalog in the same pass"""
         data_file = os.path.join(self.data_path, 'owid-co2-data.csv')
         
         if not os.path.exists(data_file):
@@ -24,6 +334,7 @@ class ClimateDataProcessor:
             return None
         
         countries_data = {}
+        catalog = StatisticsCatalog(("co2", "population", "energy", "co2_per_capita", "co2_per_gdp"))
         
         try:
             with open(data_file, 'r', encoding='utf-8') as file:
@@ -42,7 +353,8 @@ class ClimateDataProcessor:
                         continue
                     
                     # Skip aggregated regions and focus on major countries
-                    if country in ['World', 'Asia', 'Europe', 'North America', 'South America', 'Africa', 'Oceania']:
+                    iso_code = row.get('iso_code')
+                    if is_aggregate(country, iso_code):
                         continue
                     
                     # Extract relevant data
@@ -62,13 +374,23 @@ class ClimateDataProcessor:
                     except (ValueError, TypeError):
                         continue
                     
+                    # The catalog describes the whole dataset, rows without emissions included
+                    catalog.add(country, year, {
+                        "co2": co2_emissions,
+                        "population": population,
+                        "energy": energy_consumption,
+                        "co2_per_capita": co2_per_capita,
+                        "co2_per_gdp": co2_per_gdp
+                    })
+                    
                     # Only include rows with meaningful CO2 data
                     if co2_emissions is None or co2_emissions <= 0:
                         continue
                     
                     if country not in countries_data:
                         countries_data[country] = {
-                            "historical": []
+                            "historical": [],
+                            "iso_code": iso_code or None
                         }
                     
                     data_point = {
@@ -86,42 +408,199 @@ class ClimateDataProcessor:
                 for country in countries_data:
                     countries_data[country]["historical"].sort(key=lambda x: x["year"])
                 
-                return countries_data
+                return {"data": countries_data, "statistics": catalog.finish()}
                 
         except Exception as e:
             print(f"Error loading CO2 data: {e}")
             return None
     
-    def generate_temperature_data(self):
-        """Generate synthetic temperature anomaly data"""
-        years = list(range(1990, 2024))  # 1990 to 2023
-        base_temp = 0.0
+    @memoized("regions")
+    def load_region_membership(self):
+        """Load the region membership table, indexed by iso_code and by country name"""
+        by_iso = {}
+        by_country = {}
         
-        temperature_data = []
-        for i, year in enumerate(years):
-            # Simulate accelerating warming trend
-            trend = 0.02 * i  # 0.02°C per year trend
-            noise = random.uniform(-0.1, 0.1)
-            
-            # Add some realistic variations (El Niño, etc.)
-            if year in [1998, 2010, 2016, 2020]:
-                trend += 0.15  # Strong El Niño years
-            
-            temperature = base_temp + trend + noise
-            temperature_data.append({
-                'year': year,
-                'value': round(temperature, 2),
-                'type': 'global'
-            })
+        if not os.path.exists(self.region_file):
+            print(f"Region membership file not found: {self.region_file}")
+            return {"by_iso": by_iso, "by_country": by_country}
+        
+        with open(self.region_file, 'r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                entry = {
+                    "country": row["country"],
+                    "region": row.get("region") or None,
+                    "coastal_region": row.get("coastal_region") or None
+                }
+                by_iso[row["iso_code"]] = entry
+                by_country[row["country"]] = entry
+        
+        return {"by_iso": by_iso, "by_country": by_country}
+    
+    def _compile_region_index(self, co2_data):
+        """
+        Compile region membership for the countries of co2_data into integer group codes.
+        
+        Countries are matched on iso_code (falling back to the country name for
+        files without the column); -1 marks a country without a region.
+        """
+        membership = self.load_region_membership()
+        countries = list(co2_data)
+        region_names = sorted(REGIONAL_TEMPERATURE_MULTIPLIERS)
+        coastal_names = sorted(REGIONAL_SEA_LEVEL_MULTIPLIERS)
+        region_lookup = {name: code for code, name in enumerate(region_names)}
+        coastal_lookup = {name: code for code, name in enumerate(coastal_names)}
+        
+        region_codes = np.full(len(countries), -1, dtype=np.int64)
+        coastal_codes = np.full(len(countries), -1, dtype=np.int64)
+        for i, country in enumerate(countries):
+            iso_code = co2_data[country].get("iso_code")
+            entry = membership["by_iso"].get(iso_code) if iso_code else membership["by_country"].get(country)
+            if entry is None:
+                continue
+            region_codes[i] = region_lookup.get(entry["region"], -1)
+            coastal_codes[i] = coastal_lookup.get(entry["coastal_region"], -1)
+        
+        return {
+            "countries": countries,
+            "region_names": region_names,
+            "coastal_names": coastal_names,
+            "region_codes": region_codes,
+            "coastal_codes": coastal_codes,
+            "region_multipliers": np.array([REGIONAL_TEMPERATURE_MULTIPLIERS[name] for name in region_names]),
+            "coastal_multipliers": np.array([REGIONAL_SEA_LEVEL_MULTIPLIERS[name] for name in coastal_names])
+        }
+    
+    @memoized("co2", "regions")
+    def _region_index(self):
+        """Region group codes for the current CO2 snapshot, compiled once per ingest"""
+        co2_data = self.load_co2_data()
+        if co2_data is None:
+            return None
+        return self._compile_region_index(co2_data)
+    
+    def _synthetic_temperature_realizations(self, n_realizations, seed, start_year=1990, end_year=2023):
+        """Draw n_realizations noisy warming series as one (realizations x years) array"""
+        years = np.arange(start_year, end_year + 1)
+        
+        # Simulate accelerating warming trend: 0.02°C per year
+        trend = 0.02 * np.arange(len(years))
+        # Add some realistic variations (El Niño, etc.)
+        trend = trend + np.where(np.isin(years, EL_NINO_YEARS), 0.15, 0.0)
+        
+        rng = np.random.default_rng(seed)
+        noise = rng.uniform(-0.1, 0.1, size=(n_realizations, len(years)))
+        return years, trend[None, :] + noise
+    
+    def generate_temperature_data(self, seed=None):
+        """Generate synthetic temperature anomaly data (one realization)"""
+        years, realizations = self._synthetic_temperature_realizations(1, seed)
+        
+        return [
+            {'year': year, 'value': round(value, 2), 'type': 'global'}
+            for year, value in zip(years.tolist(), realizations[0].tolist())
+        ]
+    
+    def generate_temperature_ensemble(self, n_realizations=1000, seed=42, percentiles=(5, 50, 95),
+                                      start_year=1990, end_year=2023):
+        """
+        Generate a reproducible Monte Carlo ensemble of synthetic temperature series.
+        
+        All realizations are drawn in a single NumPy call from a seeded generator,
+        keeping the linear trend and El Niño bumps of generate_temperature_data, and
+        reduced to the ensemble mean and percentile bands per year.
+        """
+        years, realizations = self._synthetic_temperature_realizations(
+            n_realizations, seed, start_year, end_year
+        )
+        bands = np.percentile(realizations, percentiles, axis=0)
+        
+        return {
+            "years": years.tolist(),
+            "mean": np.round(realizations.mean(axis=0), 3).tolist(),
+            "percentiles": {
+                f"p{percentile:g}": np.round(band, 3).tolist()
+                for percentile, band in zip(percentiles, bands)
+            },
+            "n_realizations": n_realizations,
+            "seed": seed,
+            "unit": "°C"
+        }
+    
+    def _series_snapshot(self, dataset):
+        """Parsed high-resolution series of a local dataset mirror, or None without one"""
+        return self._products.get(("series_snapshot", dataset), (dataset,),
+                                  lambda: self._read_series_snapshot(dataset))
+    
+    def _read_series_snapshot(self, dataset):
+        """
+        Load a parsed series from its binary .npz snapshot, parsing the source on a miss.
+        
+        Snapshots are keyed by the source file's mtime and size, so a new mirror
+        is parsed once and every later process start reads the arrays directly.
+        """
+        source = os.path.join(self.data_path, SERIES_FILES[dataset])
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        
+        snapshot_dir = os.path.join(self.data_path, SNAPSHOT_DIR)
+        prefix = f"{SERIES_FILES[dataset]}-"
+        snapshot_file = os.path.join(snapshot_dir, f"{prefix}{stat.st_mtime_ns}-{stat.st_size}.npz")
+        
+        if os.path.exists(snapshot_file):
+            with np.load(snapshot_file) as snapshot:
+                return {
+                    "time": snapshot["time"],
+                    "value": snapshot["value"],
+                    "metadata": json.loads(str(snapshot["metadata"]))
+                }
+        
+        print(f"Parsing {dataset} data from {source}...")
+        if dataset == "temperature":
+            times, values, metadata = parse_noaa_temperature_csv(source)
+        else:
+            times, values, metadata = parse_nasa_gmsl_text(source)
+        order = np.argsort(times, kind='stable')
+        times, values = times[order], values[order]
+        
+        try:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            for name in os.listdir(snapshot_dir):
+                if name.startswith(prefix) and name.endswith('.npz'):
+                    os.remove(os.path.join(snapshot_dir, name))
+            temp_file = snapshot_file + '.tmp'
+            with open(temp_file, 'wb') as file:
+                np.savez(file, time=times, value=values, metadata=np.array(json.dumps(metadata)))
+            os.replace(temp_file, snapshot_file)
+        except OSError as e:
+            print(f"Could not write {dataset} snapshot: {e}")
         
-        return temperature_data
+        return {"time": times, "value": values, "metadata": metadata}
     
+    @memoized("sea_level")
     def load_sea_level_data(self):
-        """Load sea level rise data"""
-        # This would typically load from satellite altimetry data
-        # For now, we'll create synthetic sea level data
+        """Load sea level rise data (local NASA GMSL mirror, else the built-in series)"""
         print("Loading sea level data...")
         
+        snapshot = self._series_snapshot("sea_level")
+        if snapshot is not None and len(snapshot["time"]):
+            years, levels = annual_means(snapshot["time"], snapshot["value"])
+            baseline_year = 1993 if 1993 in years else int(years[0])
+            rise = levels - levels[years == baseline_year][0]
+            since_baseline = years >= baseline_year
+            rate = np.polyfit(years[since_baseline], rise[since_baseline], 1)[0] if since_baseline.sum() > 1 else 0.0
+            
+            return {
+                "global_mean_sea_level_rise": dict(zip(years.tolist(), np.round(rise, 1).tolist())),
+                "baseline_year": baseline_year,
+                "unit": "mm",
+                "rate_of_rise": f"{rate:.1f} mm/year (average since {baseline_year})",
+                "source": "NASA GSFC global mean sea level (local mirror)"
+            }
+        
+        # Without a local mirror, fall back to synthetic sea level data
+        
         # Simulated global mean sea level rise (relative to 1993 baseline)
         # Based on satellite observations and tide gauge data trends
         base_sea_level_rise = {
@@ -138,124 +617,317 @@ class ClimateDataProcessor:
             "global_mean_sea_level_rise": base_sea_level_rise,
             "baseline_year": 1993,
             "unit": "mm",
-            "rate_of_rise": "3.4 mm/year (average since 1993)"
+            "rate_of_rise": "3.4 mm/year (average since 1993)",
+            "source": "Simulated Sea Level Data (based on NASA/NOAA trends)"
         }
     
-    def generate_regional_temperature_data(self, co2_data):
-        """Generate regional temperature data based on CO2 emissions patterns"""
-        regional_temp_data = {}
+    @memoized("temperature")
+    def load_temperature_data(self):
+        """Load global temperature anomaly data (local NOAA mirror, else the built-in series)"""
+        snapshot = self._series_snapshot("temperature")
+        if snapshot is not None and len(snapshot["time"]):
+            years, anomalies = annual_means(snapshot["time"], snapshot["value"])
+            base_period = snapshot["metadata"].get("base period", "1901-2000")
+            
+            return {
+                "global_temperature_anomaly": dict(zip(years.tolist(), np.round(anomalies, 2).tolist())),
+                "baseline": f"{base_period} average",
+                "unit": "°C",
+                "source": "NOAA global temperature anomalies (local mirror)"
+            }
         
-        # Temperature anomaly multipliers for different regions
-        regional_multipliers = {
-            "Arctic": 2.0,      # Arctic amplification effect
-            "North America": 1.1,
-            "Europe": 1.2,
-            "Asia": 1.0,
-            "Africa": 0.9,
-            "South America": 0.8,
-            "Oceania": 1.0,
-            "Antarctica": 1.5
+        # Annual global surface temperature anomalies (°C, relative to the
+        # 1901-2000 average), rounded from the NOAA global time series
+        global_temperature_anomaly = {
+            1990: 0.45, 1991: 0.41, 1992: 0.23, 1993: 0.24, 1994: 0.31,
+            1995: 0.45, 1996: 0.33, 1997: 0.47, 1998: 0.61, 1999: 0.39,
+            2000: 0.39, 2001: 0.54, 2002: 0.60, 2003: 0.60, 2004: 0.53,
+            2005: 0.67, 2006: 0.62, 2007: 0.64, 2008: 0.52, 2009: 0.64,
+            2010: 0.70, 2011: 0.57, 2012: 0.62, 2013: 0.67, 2014: 0.74,
+            2015: 0.90, 2016: 0.99, 2017: 0.91, 2018: 0.83, 2019: 0.95,
+            2020: 0.98, 2021: 0.84, 2022: 0.86, 2023: 1.18
         }
         
-        # Assign regions to countries (simplified mapping)
-        country_to_region = {
-            "United States": "North America", "Canada": "North America", "Mexico": "North America",
-            "China": "Asia", "India": "Asia", "Japan": "Asia", "South Korea": "Asia",
-            "Russia": "Arctic", "Norway": "Arctic", "Sweden": "Arctic", "Finland": "Arctic",
-            "Germany": "Europe", "United Kingdom": "Europe", "France": "Europe", "Italy": "Europe",
-            "Brazil": "South America", "Argentina": "South America",
-            "Australia": "Oceania", "New Zealand": "Oceania",
-            "South Africa": "Africa", "Nigeria": "Africa", "Kenya": "Africa",
-            "Saudi Arabia": "Asia", "Iran": "Asia", "Turkey": "Asia"
+        return {
+            "global_temperature_anomaly": global_temperature_anomaly,
+            "baseline": "1901-2000 average",
+            "unit": "°C",
+            "source": "Simulated Temperature Data (based on NOAA trends)"
         }
+    
+    def _global_series(self, dataset):
+        """Return a global series as sorted (years, values) arrays"""
+        return self._products.get(("global_series", dataset), (dataset,),
+                                  lambda: self._build_global_series(dataset))
+    
+    def _build_global_series(self, dataset):
+        if dataset == "temperature":
+            series = self.load_temperature_data()["global_temperature_anomaly"]
+        elif dataset == "sea_level":
+            series = self.load_sea_level_data()["global_mean_sea_level_rise"]
+        else:
+            raise ValueError(f"Unknown global series: {dataset}")
         
-        global_temp = self.load_temperature_data()
+        years = np.fromiter(series.keys(), dtype=np.int64, count=len(series))
+        values = np.fromiter(series.values(), dtype=np.float64, count=len(series))
+        order = np.argsort(years)
+        return years[order], values[order]
+    
+    def _highest_resolution_series(self, dataset):
+        """
+        The finest stored series for a dataset as (fractional year times, values).
         
-        for country, data in co2_data.items():
-            if country in country_to_region:
-                region = country_to_region[country]
-                multiplier = regional_multipliers.get(region, 1.0)
-                
-                country_temp_data = []
-                for point in data["historical"]:
-                    year = point["year"]
-                    if year in global_temp["global_temperature_anomaly"]:
-                        base_anomaly = global_temp["global_temperature_anomaly"][year]
-                        regional_anomaly = base_anomaly * multiplier
-                        
-                        country_temp_data.append({
-                            "year": year,
-                            "temperature_anomaly": round(regional_anomaly, 2),
-                            "region": region
-                        })
-                
-                if country_temp_data:
-                    regional_temp_data[country] = {
-                        "historical": country_temp_data,
-                        "region": region,
-                        "average_multiplier": multiplier
-                    }
+        Local mirrors keep their native (monthly / ~10-day) resolution; sea level
+        is rebased to the same baseline year as load_sea_level_data(). The
+        built-in annual tables are placed at mid-year.
+        """
+        snapshot = self._series_snapshot(dataset)
+        if snapshot is not None and len(snapshot["time"]):
+            times, values = snapshot["time"], snapshot["value"]
+            if dataset == "sea_level":
+                baseline_year = self.load_sea_level_data()["baseline_year"]
+                years, levels = annual_means(times, values)
+                values = values - levels[years == baseline_year][0]
+            return times, values
         
-        return regional_temp_data
+        years, values = self._global_series(dataset)
+        return years + 0.5, values
     
-    def generate_regional_sea_level_data(self, co2_data):
-        """Generate regional sea level data based on geographic factors"""
-        regional_sea_data = {}
+    def get_resampled_series(self, dataset, granularity="annual", method="auto"):
+        """
+        Global temperature or sea level series at annual, quarterly or monthly granularity.
+        
+        Views are built from the highest-resolution stored data and cached per
+        (dataset, granularity, method) until the dataset changes.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        return self._products.get(("resampled", dataset, granularity, method), (dataset,),
+                                  lambda: self._resample(dataset, granularity, method))
+    
+    def _resample(self, dataset, granularity, method):
+        times, values = self._highest_resolution_series(dataset)
+        if not len(times):
+            return None
+        periods_per_year = GRANULARITIES[granularity]
+        centers, resampled, interpolated = resample_series(times, values, periods_per_year, method)
         
-        # Sea level rise varies by region due to ocean currents, glacial rebound, etc.
-        regional_sea_multipliers = {
-            "Pacific Islands": 1.5,    # Higher vulnerability
-            "Indian Ocean": 1.3,
-            "Atlantic": 1.1,
-            "Mediterranean": 1.2,
-            "Caribbean": 1.4,
-            "Arctic": 0.8,             # Less rise due to land rebound
-            "Antarctic": 0.9
+        return {
+            "dataset": dataset,
+            "granularity": granularity,
+            "periods": period_labels(int(np.floor(times.min())), len(centers), periods_per_year),
+            "time": centers,
+            "values": resampled,
+            "interpolated": interpolated
         }
+    
+    def get_regional_resampled_series(self, dataset, granularity="annual", countries=None):
+        """
+        Per-country regional series at the requested granularity.
         
-        # Assign coastal regions to countries
-        country_to_coastal_region = {
-            "United States": "Atlantic", "Canada": "Atlantic", "Mexico": "Caribbean",
-            "Japan": "Pacific Islands", "Australia": "Pacific Islands", "Indonesia": "Pacific Islands",
-            "India": "Indian Ocean", "South Africa": "Indian Ocean",
-            "United Kingdom": "Atlantic", "France": "Atlantic", "Italy": "Mediterranean",
-            "Brazil": "Atlantic", "Argentina": "Atlantic",
-            "China": "Pacific Islands", "South Korea": "Pacific Islands"
+        All countries are derived at once as multipliers x resampled global series
+        (one broadcast over the country x period grid) and cached per granularity,
+        so switching granularity only slices a cached matrix.
+        """
+        product = self._products.get(("regional_resampled", dataset, granularity),
+                                     ("co2", dataset, "regions"),
+                                     lambda: self._regional_resample(dataset, granularity))
+        if product is None:
+            return None
+        
+        rows = product["rows"]
+        selected = product["countries"] if countries is None else [c for c in countries if c in rows]
+        return {
+            "dataset": dataset,
+            "granularity": granularity,
+            "periods": product["periods"],
+            "countries": {
+                country: [None if np.isnan(value) else round(value, 3) for value in product["values"][rows[country]].tolist()]
+                for country in selected
+            }
         }
+    
+    def _regional_resample(self, dataset, granularity):
+        global_series = self.get_resampled_series(dataset, granularity)
+        index = self._region_index()
+        if global_series is None or index is None:
+            return None
         
-        global_sea = self.load_sea_level_data()
+        codes = index["region_codes"] if dataset == "temperature" else index["coastal_codes"]
+        multipliers = index["region_multipliers"] if dataset == "temperature" else index["coastal_multipliers"]
+        members = np.flatnonzero(codes >= 0)
+        countries = [index["countries"][row] for row in members]
         
-        for country, data in co2_data.items():
-            if country in country_to_coastal_region:
-                coastal_region = country_to_coastal_region[country]
-                multiplier = regional_sea_multipliers.get(coastal_region, 1.0)
-                
-                country_sea_data = []
-                for point in data["historical"]:
-                    year = point["year"]
-                    if year in global_sea["global_mean_sea_level_rise"]:
-                        base_rise = global_sea["global_mean_sea_level_rise"][year]
-                        regional_rise = base_rise * multiplier
-                        
-                        country_sea_data.append({
-                            "year": year,
-                            "sea_level_rise": round(regional_rise, 1),
-                            "coastal_region": coastal_region,
-                            "vulnerability_level": "High" if multiplier > 1.3 else "Medium" if multiplier > 1.0 else "Low"
-                        })
-                
-                if country_sea_data:
-                    regional_sea_data[country] = {
-                        "historical": country_sea_data,
+        return {
+            "periods": global_series["periods"],
+            "countries": countries,
+            "rows": {country: row for row, country in enumerate(countries)},
+            "values": multipliers[codes[members]][:, None] * global_series["values"][None, :]
+        }
+    
+    @memoized("temperature", "sea_level")
+    def get_global_climate_series(self):
+        """Global temperature anomaly and sea level rise joined on year (None where a series has no value)"""
+        temperature_years, temperature_values = self._global_series("temperature")
+        sea_years, sea_values = self._global_series("sea_level")
+        years = np.union1d(temperature_years, sea_years)
+        
+        temperature = np.full(len(years), np.nan)
+        temperature[np.searchsorted(years, temperature_years)] = temperature_values
+        sea_level = np.full(len(years), np.nan)
+        sea_level[np.searchsorted(years, sea_years)] = sea_values
+        
+        return {
+            "years": years.tolist(),
+            "temperature_anomaly": [None if np.isnan(value) else value for value in temperature.tolist()],
+            "sea_level_rise": [None if np.isnan(value) else value for value in sea_level.tolist()]
+        }
+    
+    def _country_year_grid(self, co2_data, countries, with_values=False):
+        """
+        Build the sorted year axis and a country x year mask of observed CO2 years.
+        
+        With with_values=True the CO2 matrix (NaN where missing) is returned too.
+        """
+        year_lists = [
+            np.fromiter((point["year"] for point in co2_data[country]["historical"]), dtype=np.int64)
+            for country in countries
+        ]
+        if not year_lists:
+            years, present = np.empty(0, dtype=np.int64), np.zeros((0, 0), dtype=bool)
+            return (years, present, np.zeros((0, 0))) if with_values else (years, present)
+        
+        all_years = np.concatenate(year_lists)
+        years = np.unique(all_years)
+        present = np.zeros((len(countries), len(years)), dtype=bool)
+        rows = np.repeat(np.arange(len(countries)), [len(country_years) for country_years in year_lists])
+        columns = np.searchsorted(years, all_years)
+        present[rows, columns] = True
+        if not with_values:
+            return years, present
+        
+        values = np.full(present.shape, np.nan)
+        values[rows, columns] = np.fromiter(
+            (point["co2"] for country in countries for point in co2_data[country]["historical"]),
+            dtype=np.float64, count=len(all_years)
+        )
+        return years, present, values
+    
+    def _align_global_series(self, dataset, years):
+        """Align a global series to a year axis; returns the values (NaN if uncovered) and the coverage mask"""
+        global_years, global_values = self._global_series(dataset)
+        if not len(global_years):
+            return np.full(len(years), np.nan), np.zeros(len(years), dtype=bool)
+        
+        index = np.clip(np.searchsorted(global_years, years), 0, len(global_years) - 1)
+        covered = global_years[index] == years
+        return np.where(covered, global_values[index], np.nan), covered
+    
+    def _regional_grid(self, co2_data, countries, dataset, multipliers):
+        """
+        Scale a global series by per-country multipliers over the country x year grid.
+        
+        Returns the year axis, the scaled values and the mask of cells where the
+        country has CO2 data and the global series covers the year.
+        """
+        years, present = self._country_year_grid(co2_data, countries)
+        base, covered = self._align_global_series(dataset, years)
+        
+        values = multipliers[:, None] * base[None, :]
+        return years, values, present & covered[None, :]
+    
+    def generate_regional_temperature_data(self, co2_data=None):
+        """Generate regional temperature data based on CO2 emissions patterns"""
+        if co2_data is None:
+            return self._products.get("regional_temperature", ("co2", "temperature", "regions"),
+                                      lambda: self._regional_temperature(self.load_co2_data(), self._region_index()))
+        return self._regional_temperature(co2_data)
+    
+    def _regional_temperature(self, co2_data, index=None):
+        if co2_data is None:
+            return None
+        regional_temp_data = {}
+        
+        index = index or self._compile_region_index(co2_data)
+        rows = np.flatnonzero(index["region_codes"] >= 0)
+        codes = index["region_codes"][rows]
+        countries = [index["countries"][row] for row in rows]
+        regions = [index["region_names"][code] for code in codes]
+        multipliers = index["region_multipliers"][codes]
+        
+        years, anomalies, mask = self._regional_grid(co2_data, countries, "temperature", multipliers)
+        
+        for i, country in enumerate(countries):
+            columns = np.flatnonzero(mask[i])
+            if not len(columns):
+                continue
+            
+            region = regions[i]
+            regional_temp_data[country] = {
+                "historical": [
+                    {"year": year, "temperature_anomaly": round(anomaly, 2), "region": region}
+                    for year, anomaly in zip(years[columns].tolist(), anomalies[i, columns].tolist())
+                ],
+                "region": region,
+                "average_multiplier": float(multipliers[i])
+            }
+        
+        return regional_temp_data
+    
+    def generate_regional_sea_level_data(self, co2_data=None):
+        """Generate regional sea level data based on geographic factors"""
+        if co2_data is None:
+            return self._products.get("regional_sea_level", ("co2", "sea_level", "regions"),
+                                      lambda: self._regional_sea_level(self.load_co2_data(), self._region_index()))
+        return self._regional_sea_level(co2_data)
+    
+    def _regional_sea_level(self, co2_data, index=None):
+        if co2_data is None:
+            return None
+        regional_sea_data = {}
+        
+        index = index or self._compile_region_index(co2_data)
+        rows = np.flatnonzero(index["coastal_codes"] >= 0)
+        codes = index["coastal_codes"][rows]
+        countries = [index["countries"][row] for row in rows]
+        coastal_regions = [index["coastal_names"][code] for code in codes]
+        multipliers = index["coastal_multipliers"][codes]
+        
+        years, rises, mask = self._regional_grid(co2_data, countries, "sea_level", multipliers)
+        
+        for i, country in enumerate(countries):
+            columns = np.flatnonzero(mask[i])
+            if not len(columns):
+                continue
+            
+            coastal_region = coastal_regions[i]
+            multiplier = float(multipliers[i])
+            vulnerability_level = _vulnerability_level(multiplier)
+            regional_sea_data[country] = {
+                "historical": [
+                    {
+                        "year": year,
+                        "sea_level_rise": round(rise, 1),
                         "coastal_region": coastal_region,
-                        "vulnerability_level": "High" if multiplier > 1.3 else "Medium" if multiplier > 1.0 else "Low",
-                        "sea_level_multiplier": multiplier
+                        "vulnerability_level": vulnerability_level
                     }
+                    for year, rise in zip(years[columns].tolist(), rises[i, columns].tolist())
+                ],
+                "coastal_region": coastal_region,
+                "vulnerability_level": vulnerability_level,
+                "sea_level_multiplier": multiplier
+            }
         
         return regional_sea_data
     
+    @memoized("co2", "temperature", "sea_level", "regions")
     def get_comprehensive_climate_data(self):
-        """Get comprehensive climate data including CO2, temperature, and sea level data"""
+        """
+        Get comprehensive climate data including CO2, temperature, and sea level data.
+        
+        The payload is computed once per data release and shared between callers,
+        so treat it as read-only.
+        """
         print("Loading comprehensive climate data...")
         
         # Load CO2 data
@@ -264,8 +936,8 @@ class ClimateDataProcessor:
             return None
         
         # Generate temperature and sea level data
-        temp_data = self.generate_regional_temperature_data(co2_data)
-        sea_level_data = self.generate_regional_sea_level_data(co2_data)
+        temp_data = self.generate_regional_temperature_data()
+        sea_level_data = self.generate_regional_sea_level_data()
         global_temp = self.load_temperature_data()
         global_sea = self.load_sea_level_data()
         
@@ -282,22 +954,129 @@ class ClimateDataProcessor:
                 "last_updated": datetime.now().isoformat(),
                 "data_sources": [
                     "OWID CO2 Dataset",
-                    "Simulated Temperature Data (based on NOAA trends)",
-                    "Simulated Sea Level Data (based on NASA/NOAA trends)"
+                    global_temp["source"],
+                    global_sea["source"]
                 ],
                 "coverage": {
                     "countries": len(co2_data),
                     "temperature_regions": len(temp_data),
                     "coastal_regions": len(sea_level_data),
-                    "year_range": self._get_year_range(co2_data)
+                    "year_range": self._get_year_range()
                 }
             }
         }
         
         return comprehensive_data
     
-    def _get_year_range(self, data):
-        """Get the year range from the data"""
+    @memoized("co2", "temperature", "sea_level", "regions")
+    def get_region_rollups(self):
+        """
+        Precompute region-level aggregates for every year of the CO2 snapshot.
+        
+        CO2 totals per region and year plus mean regional temperature anomaly and
+        mean coastal sea level rise are reduced with np.bincount over the region
+        group codes, so region dashboards become dictionary lookups.
+        """
+        co2_data = self.load_co2_data()
+        if not co2_data:
+            return None
+        
+        index = self._region_index()
+        countries = index["countries"]
+        region_codes = index["region_codes"]
+        coastal_codes = index["coastal_codes"]
+        years, present, co2 = self._country_year_grid(co2_data, countries, with_values=True)
+        
+        temperature_base, temperature_covered = self._align_global_series("temperature", years)
+        temperature = index["region_multipliers"][np.maximum(region_codes, 0)][:, None] * temperature_base[None, :]
+        temperature[~(present & temperature_covered[None, :])] = np.nan
+        
+        sea_base, sea_covered = self._align_global_series("sea_level", years)
+        sea_level = index["coastal_multipliers"][np.maximum(coastal_codes, 0)][:, None] * sea_base[None, :]
+        sea_level[~(present & sea_covered[None, :])] = np.nan
+        
+        n_regions = len(index["region_names"])
+        co2_totals, reporting = _grouped_sums(region_codes, co2, n_regions)
+        temperature_sums, temperature_counts = _grouped_sums(region_codes, temperature, n_regions)
+        n_coastal = len(index["coastal_names"])
+        sea_sums, sea_counts = _grouped_sums(coastal_codes, sea_level, n_coastal)
+        
+        rollups = {"years": years.tolist(), "regions": {}, "coastal_regions": {}}
+        for code, region in enumerate(index["region_names"]):
+            members = [countries[row] for row in np.flatnonzero(region_codes == code)]
+            if members:
+                rollups["regions"][region] = {
+                    "countries": members,
+                    "co2": _rounded_or_none(co2_totals[code], reporting[code], 3),
+                    "reporting_countries": reporting[code].tolist(),
+                    "temperature_anomaly": _rounded_or_none(
+                        temperature_sums[code] / np.maximum(temperature_counts[code], 1), temperature_counts[code], 2
+                    )
+                }
+        for code, coastal_region in enumerate(index["coastal_names"]):
+            members = [countries[row] for row in np.flatnonzero(coastal_codes == code)]
+            if members:
+                rollups["coastal_regions"][coastal_region] = {
+                    "countries": members,
+                    "sea_level_rise": _rounded_or_none(
+                        sea_sums[code] / np.maximum(sea_counts[code], 1), sea_counts[code], 1
+                    ),
+                    "vulnerability_level": _vulnerability_level(index["coastal_multipliers"][code])
+                }
+        
+        return rollups
+    
+    def get_region_rollup(self, region):
+        """Look up the precomputed aggregates for a region or coastal region"""
+        rollups = self.get_region_rollups()
+        if not rollups:
+            return None
+        return rollups["regions"].get(region) or rollups["coastal_regions"].get(region)
+    
+    def get_country_bundle(self, country):
+        """
+        Get CO2 history, regional temperature and coastal sea level series for one country.
+        
+        Only the requested country is derived, and bundles are kept in an LRU cache
+        bounded by bundle_cache_size, so country detail pages cost O(one country)
+        instead of materializing the comprehensive payload.
+        """
+        versions = tuple(self.dataset_version(dataset) for dataset in ("co2", "temperature", "sea_level", "regions"))
+        
+        cached = self._bundles.get(country)
+        if cached is not None and cached[0] == versions:
+            self._bundles.move_to_end(country)
+            self._bundle_stats["hits"] += 1
+            return cached[1]
+        
+        self._bundle_stats["misses"] += 1
+        co2_data = self.load_co2_data()
+        if not co2_data or country not in co2_data:
+            return None
+        
+        country_co2 = {country: co2_data[country]}
+        bundle = {
+            "country": country,
+            "co2": co2_data[country],
+            "temperature": self._regional_temperature(country_co2).get(country),
+            "sea_level": self._regional_sea_level(country_co2).get(country)
+        }
+        
+        self._bundles[country] = (versions, bundle)
+        self._bundles.move_to_end(country)
+        while len(self._bundles) > self.bundle_cache_size:
+            self._bundles.popitem(last=False)
+            self._bundle_stats["evictions"] += 1
+        
+        return bundle
+    
+    def _get_year_range(self, data=None):
+        """Get the year range from the data (from the ingest catalog for the loaded CO2 data)"""
+        if data is None or data is self.load_co2_data():
+            statistics = self.get_statistics_catalog()
+            year_range = statistics["columns"]["co2"]["year_range"] if statistics else None
+            return year_range or [1990, 2023]
+        
         all_years = set()
         for country_data in data.values():
             for point in country_data["historical"]:
@@ -329,18 +1108,30 @@ class ClimateDataProcessor:
         if not data:
             return None
         
+        temperature_years, temperature_values = self._global_series("temperature")
+        sea_years, sea_values = self._global_series("sea_level")
+        temperature_baseline = self.load_temperature_data().get("baseline", "baseline")
+        baseline_year = self.load_sea_level_data().get("baseline_year", int(sea_years[0]))
+        most_vulnerable = max(REGIONAL_SEA_LEVEL_MULTIPLIERS, key=REGIONAL_SEA_LEVEL_MULTIPLIERS.get)
+        arctic_multiplier = REGIONAL_TEMPERATURE_MULTIPLIERS["Arctic"]
+        year_range = self._get_year_range()
+        
         summary = {
             "total_countries": len(data.get("co2_data", {})),
             "temperature_coverage": len(data.get("temperature_data", {})),
             "sea_level_coverage": len(data.get("sea_level_data", {})),
-            "global_temperature_trend": "warming",
-            "global_sea_level_trend": "rising",
+            "year_range": year_range,
+            "global_temperature_trend": "warming" if temperature_values[-1] > temperature_values[0] else "cooling",
+            "global_sea_level_trend": "rising" if sea_values[-1] > sea_values[0] else "falling",
             "key_findings": [
-                "Global temperature has risen by approximately 1.1°C since pre-industrial times",
-                "Global sea level has risen by approximately 95mm since 1993",
-                "CO2 emissions continue to drive climate change across all regions",
-                "Arctic regions are warming at twice the global average rate",
-                "Small island nations face the highest sea level rise vulnerability"
+                f"Global temperature anomaly reached {temperature_values[-1]:.2f}°C in {temperature_years[-1]} "
+                f"(relative to the {temperature_baseline})",
+                f"Global sea level has risen by approximately {sea_values[-1]:.1f}mm since {baseline_year}",
+                f"CO2 emissions data covers {len(data.get('co2_data', {}))} countries "
+                f"from {year_range[0]} to {year_range[1]}",
+                f"Arctic regions are warming at {arctic_multiplier:g}x the global average rate",
+                f"{most_vulnerable} coasts face the highest sea level rise vulnerability "
+                f"({REGIONAL_SEA_LEVEL_MULTIPLIERS[most_vulnerable]:g}x the global mean)"
             ]
         }
         
@@ -5,10 +5,134 @@ Data processor to load and serve real CO2 data from CSV without external depende
 import csv
 import json
 import os
+import threading
 
-def load_co2_data():
-    """Load CO2 data from CSV file using built-in csv module"""
-    data_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'owid-co2-data.csv')
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'owid-co2-data.csv')
+
+# Aggregated regions excluded from the per-country views
+AGGREGATE_REGIONS = ['World', 'Asia', 'Europe', 'North America', 'South America', 'Africa', 'Oceania']
+
+# OWID_* codes that denote actual countries rather than aggregates
+OWID_COUNTRY_CODES = {'OWID_KOS', 'OWID_CYN'}
+
+# Response formats held in the snapshot: 'simple' mirrors get_major_countries_data()
+# (simple_server), 'web' mirrors the unfiltered pandas view served by web_server
+RESPONSE_FORMATS = ('simple', 'web')
+
+# Upper bound on buffers handed to a single sendmsg() call
+IOV_MAX = 1024
+
+def is_aggregate(country, iso_code=None):
+    """
+    Whether a dataset row is an aggregate (World, continents, income groups, GCP regions...).
+    
+    OWID leaves iso_code empty for aggregates (or uses an OWID_* code such as
+    OWID_WRL / OWID_EU27), so the code is authoritative when the column exists;
+    files without an iso_code column fall back to the AGGREGATE_REGIONS names.
+    """
+    if iso_code is None:
+        return country in AGGREGATE_REGIONS
+    if not iso_code:
+        return True
+    return iso_code.startswith('OWID_') and iso_code not in OWID_COUNTRY_CODES
+
+class StatisticsCatalog:
+    """
+    Per-column and per-country statistics accumulated row by row during ingest.
+    
+    Tracks count, nulls, min, max, sum, year coverage and the latest value for
+    every column, both dataset-wide and per country, so summary and coverage
+    questions are answered from the finished catalog without rescanning data.
+    """
+    
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.rows = 0
+        self.years = set()
+        self._global = {column: self._new_stats() for column in self.columns}
+        self._countries = {}
+    
+    @staticmethod
+    def _new_stats():
+        # count, nulls, min, max, sum, first_year, last_year, latest_year, latest_value
+        return [0, 0, None, None, 0.0, None, None, None, None]
+    
+    @staticmethod
+    def _update(stats, year, value):
+        if value is None:
+            stats[1] += 1
+            return
+        stats[0] += 1
+        stats[4] += value
+        if stats[2] is None or value < stats[2]:
+            stats[2] = value
+        if stats[3] is None or value > stats[3]:
+            stats[3] = value
+        if stats[5] is None or year < stats[5]:
+            stats[5] = year
+        if stats[6] is None or year > stats[6]:
+            stats[6] = year
+        if stats[7] is None or year >= stats[7]:
+            stats[7] = year
+            stats[8] = value
+    
+    def add(self, country, year, values):
+        """Record one ingested row; values maps column -> float or None"""
+        self.rows += 1
+        self.years.add(year)
+        country_stats = self._countries.get(country)
+        if country_stats is None:
+            country_stats = self._countries[country] = {
+                "years": set(),
+                "columns": {column: self._new_stats() for column in self.columns}
+            }
+        country_stats["years"].add(year)
+        
+        for column in self.columns:
+            value = values.get(column)
+            self._update(self._global[column], year, value)
+            self._update(country_stats["columns"][column], year, value)
+    
+    @staticmethod
+    def _summarize(stats):
+        count, nulls, minimum, maximum, total, first_year, last_year, latest_year, latest_value = stats
+        observed = count + nulls
+        return {
+            "count": count,
+            "null_rate": round(nulls / observed, 4) if observed else None,
+            "min": minimum,
+            "max": maximum,
+            "mean": total / count if count else None,
+            "year_range": [first_year, last_year] if count else None,
+            "latest": {"year": latest_year, "value": latest_value} if count else None
+        }
+    
+    def finish(self):
+        """Freeze the accumulated statistics into a JSON-serializable catalog"""
+        return {
+            "rows": self.rows,
+            "countries": len(self._countries),
+            "year_range": [min(self.years), max(self.years)] if self.years else None,
+            "columns": {column: self._summarize(stats) for column, stats in self._global.items()},
+            "by_country": {
+                country: {
+                    "year_range": [min(stats["years"]), max(stats["years"])],
+                    "years": len(stats["years"]),
+                    "columns": {column: self._summarize(column_stats)
+                                for column, column_stats in stats["columns"].items()}
+                }
+                for country, stats in sorted(self._countries.items())
+            }
+        }
+
+def load_co2_data(data_file=None, catalog=None):
+    """
+    Load CO2 data from CSV file using built-in csv module.
+    
+    When a StatisticsCatalog is passed, every parsed country row is recorded in
+    it during the same pass, before rows without CO2 emissions are dropped.
+    """
+    data_file = data_file or DATA_FILE
     
     if not os.path.exists(data_file):
         print(f"Data file not found: {data_file}")
@@ -33,7 +157,7 @@ def load_co2_data():
                     continue
                 
                 # Skip aggregated regions and focus on major countries
-                if country in ['World', 'Asia', 'Europe', 'North America', 'South America', 'Africa', 'Oceania']:
+                if is_aggregate(country, row.get('iso_code')):
                     continue
                 
                 # Extract relevant data
@@ -49,6 +173,14 @@ def load_co2_data():
                 except (ValueError, TypeError):
                     continue
                 
+                # The catalog describes the whole dataset, rows without emissions included
+                if catalog is not None:
+                    catalog.add(country, year, {
+                        "co2": co2_emissions,
+                        "population": population,
+                        "energy": energy_consumption
+                    })
+                
                 # Only include rows with meaningful CO2 data
                 if co2_emissions is None or co2_emissions <= 0:
                     continue
@@ -77,12 +209,8 @@ def load_co2_data():
         print(f"Error loading data: {e}")
         return None
 
-def get_major_countries_data():
-    """Get data for all countries with CO2 data"""
-    all_data = load_co2_data()
-    if not all_data:
-        return None
-    
+def _filter_major_countries(all_data):
+    """Keep countries with at least 5 years of data and collect their year range"""
     # Return all countries that have data
     available_countries = []
     filtered_data = {}
@@ -110,6 +238,213 @@ def get_major_countries_data():
         "data": filtered_data
     }
 
+def get_major_countries_data():
+    """Get data for all countries with CO2 data"""
+    all_data = load_co2_data()
+    if not all_data:
+        return None
+    
+    return _filter_major_countries(all_data)
+
+def _to_float(value):
+    """Parse a CSV cell, treating blanks and malformed values as missing"""
+    try:
+        return float(value) if value else None
+    except (ValueError, TypeError):
+        return None
+
+def _read_web_view(data_file):
+    """Read the unfiltered per-country view served by web_server (all rows with CO2 data)"""
+    web_data = {}
+    web_years = {}
+    
+    with open(data_file, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            country = row.get('country', '')
+            try:
+                year = int(row.get('year', ''))
+            except (ValueError, TypeError):
+                continue
+            if not country:
+                continue
+            
+            web_years.setdefault(country, set()).add(year)
+            web_data.setdefault(country, {"historical": []})
+            
+            co2_emissions = _to_float(row.get('co2', ''))
+            if co2_emissions is None:
+                continue
+            
+            population = _to_float(row.get('population', ''))
+            energy_consumption = _to_float(row.get('primary_energy_consumption', ''))
+            web_data[country]["historical"].append({
+                "year": year,
+                "co2": co2_emissions,
+                "population": population if population is not None else 0,
+                "energy": energy_consumption if energy_consumption is not None else 0
+            })
+    
+    for country in web_data:
+        web_data[country]["historical"].sort(key=lambda x: x["year"])
+    
+    return web_data, web_years
+
+def _encode(value):
+    """Compact UTF-8 JSON encoding used for every snapshot fragment"""
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+def _check_format(fmt):
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown response format: {fmt} (expected one of {', '.join(RESPONSE_FORMATS)})")
+
+class DatasetSnapshot:
+    """
+    Immutable view of the CO2 dataset for one file version.
+    
+    Every country is encoded once per response format when the snapshot is built,
+    so API responses for any subset of countries are assembled by joining the
+    pre-encoded byte fragments instead of re-running json.dumps per request.
+    """
+    
+    def __init__(self, version, views, statistics=None):
+        self.version = version
+        self.statistics = statistics
+        self._statistics_json = _encode(statistics)
+        self._country_statistics_json = {
+            country: _encode(entry) for country, entry in (statistics or {}).get("by_country", {}).items()
+        }
+        self.views = {}
+        self.countries = {}
+        self.country_years = {}
+        self.name_fragments = {}
+        self.data_fragments = {}
+        self._full_response = {}
+        
+        for fmt, (data, country_years) in views.items():
+            _check_format(fmt)
+            countries = sorted(data)
+            self.views[fmt] = data
+            self.countries[fmt] = countries
+            self.country_years[fmt] = country_years
+            self.name_fragments[fmt] = {country: _encode(country) for country in countries}
+            self.data_fragments[fmt] = {
+                country: _encode(country) + b':' + _encode(data[country])
+                for country in countries
+            }
+            self._full_response[fmt] = self._assemble(fmt, countries)
+    
+    def statistics_chunks(self, country=None):
+        """Pre-encoded statistics catalog, or one country's entry"""
+        if country is None:
+            return [self._statistics_json]
+        entry = self._country_statistics_json.get(country)
+        return [entry] if entry is not None else None
+    
+    def has_countries(self, fmt='simple'):
+        _check_format(fmt)
+        return bool(self.countries[fmt])
+    
+    def select(self, fmt, countries=None):
+        """Resolve a requested country list to the sorted countries present in the snapshot"""
+        _check_format(fmt)
+        if countries is None:
+            return self.countries[fmt]
+        available = self.data_fragments[fmt]
+        return sorted({country for country in countries if country in available})
+    
+    def response_chunks(self, fmt='simple', countries=None):
+        """Byte chunks of the JSON response body for the given countries (all by default)"""
+        _check_format(fmt)
+        if countries is None:
+            return self._full_response[fmt]
+        return self._assemble(fmt, self.select(fmt, countries))
+    
+    def _assemble(self, fmt, countries):
+        names = self.name_fragments[fmt]
+        fragments = self.data_fragments[fmt]
+        country_years = self.country_years[fmt]
+        
+        years = set()
+        for country in countries:
+            years.update(country_years[country])
+        
+        chunks = [b'{"countries":[', b','.join(names[country] for country in countries),
+                  b'],"years":', _encode(sorted(years)), b',"data":{']
+        for index, country in enumerate(countries):
+            if index:
+                chunks.append(b',')
+            chunks.append(fragments[country])
+        chunks.append(b'}}')
+        return chunks
+
+def _build_snapshot(data_file, version):
+    """Load every response view of the dataset and pre-encode it"""
+    catalog = StatisticsCatalog(("co2", "population", "energy"))
+    all_data = load_co2_data(data_file, catalog)
+    if all_data is None:
+        return None
+    
+    major = _filter_major_countries(all_data)
+    simple_years = {
+        country: {point["year"] for point in major["data"][country]["historical"]}
+        for country in major["countries"]
+    }
+    web_data, web_years = _read_web_view(data_file)
+    
+    return DatasetSnapshot(version, {
+        'simple': (major["data"], simple_years),
+        'web': (web_data, web_years)
+    }, statistics=catalog.finish())
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def get_dataset_snapshot(data_file=None):
+    """Return the cached snapshot, rebuilding it only when the data file changes"""
+    global _snapshot
+    data_file = data_file or DATA_FILE
+    
+    try:
+        stat = os.stat(data_file)
+    except OSError:
+        print(f"Data file not found: {data_file}")
+        return None
+    version = (data_file, stat.st_mtime_ns, stat.st_size)
+    
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            snapshot = _build_snapshot(data_file, version)
+            if snapshot is None:
+                return None
+            _snapshot = snapshot
+        return _snapshot
+
+def write_chunks(handler, chunks):
+    """
+    Write pre-encoded response chunks to an http.server handler.
+    
+    Uses scatter/gather sendmsg() on the client socket when available so the
+    fragments go out without being joined into one buffer first.
+    """
+    sendmsg = getattr(handler.connection, 'sendmsg', None)
+    if sendmsg is None:
+        handler.wfile.writelines(chunks)
+        return
+    
+    handler.wfile.flush()
+    pending = [memoryview(chunk) for chunk in chunks if chunk]
+    start = 0
+    while start < len(pending):
+        sent = sendmsg(pending[start:start + IOV_MAX])
+        while sent:
+            size = len(pending[start])
+            if sent >= size:
+                sent -= size
+                start += 1
+            else:
+                pending[start] = pending[start][sent:]
+                sent = 0
+
 if __name__ == "__main__":
     # Test the data processor
     data = get_major_countries_data()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Feature Store for Climate Action Hub
+Precomputes interpolated, lagged and growth-rate forecasting features once per dataset version
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: versions are never pruned
+    fcntl = None
+
+from data_processor import DATA_FILE, is_aggregate
+from imputation import IMPUTATION_METHOD, impute_rows
+
+# Feature stores live under <repo>/data/features/<version>
+FEATURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'features')
+
+MATRIX_FILE = 'features.npy'
+MANIFEST_FILE = 'manifest.json'
+
+# Every open FeatureStore holds a shared lock on this file; pruning a version
+# needs the exclusive lock, so versions still being read are never deleted
+READER_LOCK_FILE = 'readers.lock'
+
+# Raw numeric columns read from the OWID CSV; missing values are interpolated
+# per country across years (see imputation.impute_rows)
+BASE_COLUMNS = ['co2', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+
+# Columns that also get previous-year lags and year-on-year growth rates
+LAGGED_COLUMNS = ['co2', 'gdp', 'population', 'primary_energy_consumption']
+
+def feature_columns():
+    """Column order of the feature matrix"""
+    columns = ['year'] + BASE_COLUMNS
+    columns += [f"{column}_lag1" for column in LAGGED_COLUMNS]
+    columns += [f"{column}_growth" for column in LAGGED_COLUMNS]
+    columns += [f"{column}_imputed" for column in BASE_COLUMNS]
+    return columns
+
+def _version_id(version):
+    return hashlib.sha256(repr((version, IMPUTATION_METHOD)).encode('utf-8')).hexdigest()[:16]
+
+def _read_rows(data_file):
+    """Read (country, iso_code, year, values) rows from the CSV, sorted by country and year"""
+    rows = []
+    with open(data_file, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        has_iso_code = 'iso_code' in (reader.fieldnames or [])
+        for row in reader:
+            country = row.get('country', '')
+            try:
+                year = int(row.get('year', ''))
+            except (ValueError, TypeError):
+                continue
+            if not country:
+                continue
+            values = []
+            for column in BASE_COLUMNS:
+                try:
+                    values.append(float(row.get(column) or 'nan'))
+                except ValueError:
+                    values.append(float('nan'))
+            rows.append((country, row.get('iso_code', '') if has_iso_code else None, year, values))
+    rows.sort(key=lambda row: (row[0], row[2]))
+    return rows
+
+def build_feature_matrix(rows):
+    """
+    Feature matrix and per-country row ranges for sorted (country, iso_code, year, values) rows.
+
+    Missing raw values are interpolated over each country's years. Lags and
+    growth rates refer to the previous row of the same country and are NaN on
+    each country's first row.
+    """
+    countries = sorted({row[0] for row in rows})
+    country_codes = {country: code for code, country in enumerate(countries)}
+    codes = np.fromiter((country_codes[row[0]] for row in rows), dtype=int, count=len(rows))
+    years = np.array([row[2] for row in rows], dtype=float)
+    raw = np.array([row[3] for row in rows], dtype=float).reshape(len(rows), len(BASE_COLUMNS))
+
+    imputed, missing = impute_rows(codes, years, raw, len(countries))
+
+    # Previous row of the same country
+    first_row = np.ones(len(rows), dtype=bool)
+    first_row[1:] = codes[1:] != codes[:-1]
+    lag_index = [BASE_COLUMNS.index(column) for column in LAGGED_COLUMNS]
+    lagged = np.full((len(rows), len(lag_index)), np.nan)
+    lagged[1:] = imputed[:-1, lag_index]
+    lagged[first_row] = np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = imputed[:, lag_index] / lagged - 1.0
+
+    matrix = np.column_stack([years, imputed, lagged, growth, missing.astype(float)])
+
+    bounds = np.searchsorted(codes, np.arange(len(countries) + 1))
+    ranges = {country: [int(bounds[i]), int(bounds[i + 1])] for i, country in enumerate(countries)}
+    return matrix, ranges
+
+class FeatureStore:
+    """
+    Read-only, memory-mapped feature matrix for one dataset version.
+
+    Rows are grouped by country and sorted by year; the manifest records the
+    column order and each country's row range.
+    """
+
+    def __init__(self, directory):
+        self._reader_lock = _open_reader_lock(directory)
+        if fcntl is not None:
+            fcntl.flock(self._reader_lock, fcntl.LOCK_SH)
+        with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as file:
+            self.manifest = json.load(file)
+        self.directory = directory
+        self.matrix = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode='r')
+        self.columns = self.manifest["columns"]
+        self.column_index = {column: index for index, column in enumerate(self.columns)}
+        self.countries = list(self.manifest["countries"])
+        self.ranges = {country: entry["rows"] for country, entry in self.manifest["countries"].items()}
+
+        self.row_codes = np.empty(self.matrix.shape[0], dtype=int)
+        for code, country in enumerate(self.countries):
+            start, end = self.ranges[country]
+            self.row_codes[start:end] = code
+
+    @property
+    def version(self):
+        return tuple(self.manifest["version"])
+
+    def is_aggregate(self, country):
+        return self.manifest["countries"][country]["aggregate"]
+
+    def column(self, name, rows=None):
+        """One column (optionally for selected rows)"""
+        values = self.matrix[:, self.column_index[name]]
+        return values if rows is None else values[rows]
+
+    def features(self, names, rows=None):
+        """(rows, len(names)) feature matrix in the requested column order"""
+        indices = [self.column_index[name] for name in names]
+        if rows is None:
+            return self.matrix[:, indices]
+        return self.matrix[rows][:, indices]
+
+    def select(self, countries=None, start_year=None, end_year=None):
+        """Row indices for the given countries (all by default) within a year range"""
+        if countries is None:
+            rows = np.arange(self.matrix.shape[0])
+        else:
+            ranges = [self.ranges[country] for country in countries if country in self.ranges]
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges]) if ranges else np.zeros(0, dtype=int)
+        years = self.column('year', rows)
+        keep = np.ones(rows.size, dtype=bool)
+        if start_year is not None:
+            keep &= years >= start_year
+        if end_year is not None:
+            keep &= years <= end_year
+        return rows[keep]
+
+    def latest_rows(self, countries, end_year=None):
+        """
+        Latest row per country up to end_year.
+
+        Returns the countries that have such a row, in request order, and their row indices.
+        """
+        found, rows = [], []
+        years = self.column('year')
+        for country in countries:
+            if country not in self.ranges:
+                continue
+            start, end = self.ranges[country]
+            if end_year is not None:
+                end = start + int(np.searchsorted(years[start:end], end_year, side='right'))
+            if end > start:
+                found.append(country)
+                rows.append(end - 1)
+        return found, np.array(rows, dtype=int)
+
+def _open_reader_lock(directory):
+    return open(os.path.join(directory, READER_LOCK_FILE), 'a+b')
+
+def prune_feature_stores(data_file, directory=None, keep=None):
+    """
+    Delete feature store versions built from data_file, except keep.
+
+    Versions of other data files, unpublished (.tmp) directories and
+    versions some process still has open are left alone. Returns the
+    deleted directories.
+    """
+    if fcntl is None:
+        return []
+    directory = os.path.abspath(directory or FEATURE_DIR)
+    data_file = os.path.abspath(data_file)
+    deleted = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name == keep or name.endswith('.tmp') or not os.path.isdir(path):
+            continue
+        try:
+            with open(os.path.join(path, MANIFEST_FILE), 'r', encoding='utf-8') as file:
+                built_from = json.load(file)["version"][0]
+            if built_from != data_file:
+                continue
+            with _open_reader_lock(path) as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                shutil.rmtree(path)
+        except (OSError, ValueError, KeyError, IndexError):
+            # Still open somewhere, or removed by another process meanwhile
+            continue
+        deleted.append(path)
+    return deleted
+
+def build_feature_store(data_file, version, directory=None):
+    """Build the feature store for one dataset version and return its directory"""
+    directory = os.path.abspath(directory or FEATURE_DIR)
+    target = os.path.join(directory, _version_id(version))
+    if os.path.exists(os.path.join(target, MANIFEST_FILE)):
+        return target
+
+    print(f"Building feature store from {data_file}...")
+    rows = _read_rows(data_file)
+    matrix, ranges = build_feature_matrix(rows)
+    imputed_cells = matrix[:, -len(BASE_COLUMNS):].sum(axis=0)
+    iso_codes = {}
+    for country, iso_code, _, _ in rows:
+        iso_codes.setdefault(country, iso_code)
+
+    manifest = {
+        "version": list(version),
+        "created": datetime.now().isoformat(),
+        "shape": list(matrix.shape),
+        "dtype": "float64",
+        "columns": feature_columns(),
+        "imputation": {
+            "method": IMPUTATION_METHOD,
+            "cells": {column: int(count) for column, count in zip(BASE_COLUMNS, imputed_cells)}
+        },
+        "countries": {
+            country: {"rows": ranges[country], "aggregate": is_aggregate(country, iso_codes[country])}
+            for country in sorted(ranges)
+        }
+    }
+
+    staging = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(staging, exist_ok=True)
+    stored = np.lib.format.open_memmap(os.path.join(staging, MATRIX_FILE), mode='w+',
+                                       dtype=np.float64, shape=matrix.shape)
+    stored[:] = matrix
+    stored.flush()
+    del stored
+    with open(os.path.join(staging, MANIFEST_FILE), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    _open_reader_lock(staging).close()
+
+    try:
+        os.replace(staging, target)
+    except OSError:
+        # Another process published this version first
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_feature_store(data_file=None, directory=None):
+    """Return the feature store for the current data file, building it when the file changes"""
+    global _store
+    data_file = os.path.abspath(data_file or DATA_FILE)
+    try:
+        stat = os.stat(data_file)
+    except OSError:
+        print(f"Data file not found: {data_file}")
+        return None
+    version = (data_file, stat.st_mtime_ns, stat.st_size)
+
+    with _store_lock:
+        if _store is None or _store.version != version or (
+                directory is not None and os.path.dirname(_store.directory) != os.path.abspath(directory)):
+            target = build_feature_store(data_file, version, directory)
+            _store = FeatureStore(target)
+            # Older versions of this file go once nothing reads them any more
+            prune_feature_stores(data_file, os.path.dirname(target), keep=os.path.basename(target))
+        return _store
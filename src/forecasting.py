@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Batched CO2 Forecasting for Climate Action Hub
+Builds the feature matrix for every country x horizon year at once and predicts in one call
+"""
+
+import weakref
+
+import numpy as np
+
+from forest_export import CompactForest
+
+# Yearly growth assumptions for the features following the year column:
+# GDP 2%, population 1%, energy use 2%, energy per capita 5%
+GROWTH_RATES = (1.02, 1.01, 1.02, 1.05)
+
+def forecast_features(latest, years, growth_rates=GROWTH_RATES):
+    """
+    Feature tensor of shape (countries, years, features) for the horizon years.
+
+    Column 0 of latest is the base year; every other column grows in closed
+    form as value * rate ** (year - base_year).
+    """
+    latest = np.asarray(latest, dtype=float)
+    years = np.asarray(years, dtype=float)
+    rates = np.asarray(growth_rates, dtype=float)
+
+    elapsed = years[None, :] - latest[:, 0, None]
+    X = np.empty((latest.shape[0], years.size, latest.shape[1]))
+    X[:, :, 0] = years[None, :]
+    X[:, :, 1:] = latest[:, None, 1:] * rates[None, None, :] ** elapsed[:, :, None]
+    return X
+
+def predict_rows(model, rows):
+    """model.predict on a 2-D feature matrix, as a NumPy array"""
+    feature_names = getattr(model, 'feature_names_in_', None)
+    if feature_names is not None:
+        # Keep the column names the model was fitted with
+        import pandas as pd
+        rows = pd.DataFrame(rows, columns=feature_names)
+    return np.asarray(model.predict(rows))
+
+def batch_forecast(model, latest, years, growth_rates=GROWTH_RATES):
+    """
+    Predictions of shape (countries, years) from a single model.predict call.
+    """
+    X = forecast_features(latest, years, growth_rates)
+    n_countries, n_years, n_features = X.shape
+    return predict_rows(model, X.reshape(n_countries * n_years, n_features)).reshape(n_countries, n_years)
+
+# Packed copies of fitted forests, reused across interval requests
+_compact_forests = weakref.WeakKeyDictionary()
+
+def _compact_forest(model):
+    if isinstance(model, CompactForest):
+        return model
+    forest = _compact_forests.get(model)
+    if forest is None:
+        forest = _compact_forests[model] = CompactForest.from_model(model)
+    return forest
+
+def forecast_intervals(model, latest, years, confidence_level=0.95, growth_rates=GROWTH_RATES):
+    """
+    Forecasts with prediction intervals from the forest's per-tree distribution.
+
+    Returns (mean, lower, upper), each of shape (countries, years). All trees
+    are evaluated for the whole batch in one vectorized traversal; the mean
+    equals model.predict.
+    """
+    X = forecast_features(latest, years, growth_rates)
+    n_countries, n_years, n_features = X.shape
+    mean, lower, upper = _compact_forest(model).predict_interval(
+        X.reshape(n_countries * n_years, n_features), confidence_level
+    )
+    shape = (n_countries, n_years)
+    return mean.reshape(shape), lower.reshape(shape), upper.reshape(shape)
+
+def forest_forecast(forest, feature_store, countries, horizon, confidence_level=0.95):
+    """
+    /api/forecast-style response from an exported forest and the feature store.
+
+    Forecast years start after the store's latest year; every country carries
+    its mean forecast and the confidence_level band.
+    """
+    features = forest.meta["features"]
+    if not features:
+        raise ValueError("Exported forest does not record its feature columns")
+
+    found, rows = feature_store.latest_rows(countries if countries is not None else feature_store.countries)
+    base_year = int(feature_store.column('year').max())
+    years = np.arange(base_year + 1, base_year + horizon + 1)
+    response = {
+        "method": "random_forest",
+        "confidence_level": confidence_level,
+        "base_year": base_year,
+        "years": years.tolist(),
+        "countries": found,
+        "forecasts": {}
+    }
+    if not found:
+        return response
+
+    mean, lower, upper = forecast_intervals(forest, feature_store.features(features, rows), years, confidence_level)
+    for row, country in enumerate(found):
+        response["forecasts"][country] = {
+            "co2": np.round(mean[row], 3).tolist(),
+            "lower": np.round(lower[row], 3).tolist(),
+            "upper": np.round(upper[row], 3).tolist()
+        }
+    return response
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Compact Random Forest Inference for Climate Action Hub
+Flattens fitted forests into packed NumPy arrays evaluated without scikit-learn
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+# Exported serving forest written by main.py
+FOREST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'models', 'forest')
+
+META_FILE = 'forest.json'
+ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots')
+
+def forest_fingerprint(arrays):
+    """Content hash of packed forest arrays, e.g. for caches of rendered forecasts"""
+    digest = hashlib.sha256()
+    for name in ARRAYS:
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()[:32]
+
+def pack_forest(model, features=None):
+    """
+    Pack a fitted RandomForestRegressor (or any list-of-trees ensemble) into flat arrays.
+
+    Nodes of all trees are concatenated and child indices offset accordingly.
+    Leaves point to themselves with an infinite threshold, so a fixed number
+    of traversal steps (the deepest tree's depth) lands every row on a leaf.
+    """
+    estimators = getattr(model, 'estimators_', None) or [model]
+    trees = [estimator.tree_ for estimator in estimators]
+    if any(tree.n_outputs != 1 for tree in trees):
+        raise ValueError("Only single-output regression forests can be exported")
+
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    arrays = {name: [] for name in ARRAYS if name != 'roots'}
+    for offset, tree in zip(offsets, trees):
+        nodes = np.arange(tree.node_count) + offset
+        leaf = tree.children_left < 0
+        arrays['feature'].append(np.where(leaf, 0, tree.feature).astype(np.int32))
+        arrays['threshold'].append(np.where(leaf, np.inf, tree.threshold).astype(np.float64))
+        arrays['left'].append(np.where(leaf, nodes, tree.children_left + offset).astype(np.int64))
+        arrays['right'].append(np.where(leaf, nodes, tree.children_right + offset).astype(np.int64))
+        arrays['value'].append(tree.value[:, 0, 0].astype(np.float64))
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+        arrays['missing_left'].append(np.where(leaf, 1, missing_left).astype(bool))
+
+    packed = {name: np.concatenate(parts) for name, parts in arrays.items()}
+    packed['roots'] = offsets[:-1].astype(np.int64)
+
+    meta = {
+        "n_trees": len(trees),
+        "n_nodes": int(offsets[-1]),
+        "max_depth": int(max(tree.max_depth for tree in trees)),
+        "n_features": int(getattr(model, 'n_features_in_', trees[0].n_features)),
+        "feature_names": [str(name) for name in getattr(model, 'feature_names_in_', [])],
+        # Feature-store columns the forest was trained on, if known
+        "features": list(features) if features is not None else None,
+        "fingerprint": forest_fingerprint(packed)
+    }
+    return packed, meta
+
+def export_forest(model, directory=None, features=None):
+    """Write the packed forest as .npy arrays plus a JSON header, replacing any previous export"""
+    directory = os.path.abspath(directory or FOREST_DIR)
+    packed, meta = pack_forest(model, features)
+
+    staging = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, values in packed.items():
+        np.save(os.path.join(staging, f"{name}.npy"), values)
+    with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return directory
+
+class CompactForest:
+    """
+    Pure-NumPy forest evaluator.
+
+    All trees are traversed together for the whole batch, one level per step,
+    on a (rows, trees) matrix of node indices. Inputs are compared in float32
+    and tree outputs are summed in tree order, matching scikit-learn exactly.
+    """
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.missing_left = arrays['missing_left']
+        self.roots = arrays['roots']
+        self.feature_names = meta["feature_names"]
+        # Exports written before fingerprints were recorded hash their arrays on load
+        self.fingerprint = meta.get("fingerprint") or forest_fingerprint(arrays)
+
+    @classmethod
+    def from_model(cls, model):
+        packed, meta = pack_forest(model)
+        return cls(packed, meta)
+
+    @classmethod
+    def load(cls, directory=None, mmap=True):
+        """Load an exported forest; arrays are memory-mapped unless mmap is False"""
+        directory = directory or FOREST_DIR
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+            for name in ARRAYS
+        }
+        return cls(arrays, meta)
+
+    def apply(self, X):
+        """Leaf node index per (row, tree)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.meta["n_features"]:
+            raise ValueError(f"Expected {self.meta['n_features']} features, got shape {X.shape}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size)).copy()
+        for _ in range(self.meta["max_depth"]):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def tree_predictions(self, X):
+        """Per-tree predictions, shape (rows, trees)"""
+        return self.value[self.apply(X)]
+
+    @staticmethod
+    def _mean(tree_values):
+        total = np.zeros(tree_values.shape[0])
+        for tree in range(tree_values.shape[1]):
+            total += tree_values[:, tree]
+        return total / tree_values.shape[1]
+
+    def predict(self, X):
+        return self._mean(self.tree_predictions(X))
+
+    def predict_interval(self, X, confidence_level=0.95):
+        """
+        Mean prediction with a central interval from the per-tree distribution.
+
+        One traversal yields every tree's prediction for the whole batch; the
+        bounds are the (1 - confidence_level) / 2 quantiles on either side.
+        """
+        if not 0 < confidence_level < 1:
+            raise ValueError(f"confidence_level must be between 0 and 1, got {confidence_level}")
+        tree_values = self.tree_predictions(X)
+        tail = (1 - confidence_level) / 2
+        lower, upper = np.quantile(tree_values, [tail, 1 - tail], axis=1)
+        return self._mean(tree_values), lower, upper
+
+_serving_forest = None
+_serving_version = None
+_serving_lock = threading.Lock()
+
+def get_serving_forest(directory=None):
+    """Return the exported forest, reloading it when a new export replaces it; None without one"""
+    global _serving_forest, _serving_version
+    directory = directory or FOREST_DIR
+    try:
+        stat = os.stat(os.path.join(directory, META_FILE))
+    except OSError:
+        return None
+    version = (os.path.abspath(directory), stat.st_mtime_ns, stat.st_ino)
+
+    with _serving_lock:
+        if _serving_forest is None or _serving_version != version:
+            _serving_forest = CompactForest.load(directory)
+            _serving_version = version
+        return _serving_forest
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search for Climate Action Hub
+Successive-halving search over forest and trend settings on rolling-origin folds, under a time budget
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+
+from backtesting import DEFAULT_HORIZON, BacktestData, _errors, _install_data, _run_worker_fold
+from serving_config import SERVING_CONFIG, load_serving_config, write_serving_config
+
+# Grids searched per model family; forests are sampled from theirs
+SEARCH_SPACE = {
+    "random_forest": {
+        "n_estimators": [25, 50, 100, 200, 400],
+        "max_depth": [None, 8, 12, 20],
+        "min_samples_leaf": [1, 2, 5],
+        "max_features": [1.0, 0.6, "sqrt"]
+    },
+    "trend": {
+        "window": [8, 12, 20, 30],
+        "damping": [0.7, 0.8, 0.9, 0.95, 1.0]
+    }
+}
+
+# Parameters shared by every candidate of a family
+FIXED_PARAMS = {
+    "random_forest": {"random_state": 42},
+    "trend": {}
+}
+
+DEFAULT_BUDGET_SECONDS = 600
+DEFAULT_CANDIDATES = 24
+
+# Each rung keeps the best 1/ETA of a family's candidates and scores them on ETA times as many folds
+ETA = 3
+MIN_FOLDS = 2
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'tuning_results.json')
+
+def sample_candidates(n_candidates=DEFAULT_CANDIDATES, seed=42, space=SEARCH_SPACE, current=None):
+    """
+    Up to n_candidates (model, params) pairs per family.
+
+    Grids larger than n_candidates are sampled without replacement. The
+    currently served parameters are always included, so a search can only
+    replace them with something that scored better.
+    """
+    rng = np.random.default_rng(seed)
+    current = current if current is not None else load_serving_config()
+    candidates = []
+    for family, grid in space.items():
+        combinations = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+        if len(combinations) > n_candidates:
+            combinations = [combinations[i] for i in sorted(rng.choice(len(combinations), n_candidates, replace=False))]
+
+        seen = set()
+        for params in [current.get(family, {})] + combinations:
+            params = {**params, **FIXED_PARAMS[family]}
+            identity = json.dumps(params, sort_keys=True)
+            if identity not in seen:
+                seen.add(identity)
+                candidates.append((family, params))
+    return candidates
+
+def score_folds(folds):
+    """Pooled MAPE/MAE over the folds plus mean fit and forecast times"""
+    abs_error, pct_error = _errors(np.stack([fold["predicted"] for fold in folds]),
+                                   np.stack([fold["actual"] for fold in folds]))
+    abs_error = abs_error[np.isfinite(abs_error)]
+    pct_error = pct_error[np.isfinite(pct_error)]
+    return {
+        "mape": round(float(pct_error.mean()) * 100, 4) if pct_error.size else None,
+        "mae": round(float(abs_error.mean()), 4) if abs_error.size else None,
+        "folds": len(folds),
+        "fit_seconds": round(float(np.mean([fold["fit_seconds"] for fold in folds])), 4),
+        "predict_ms": round(float(np.mean([fold["predict_seconds"] for fold in folds])) * 1000, 3)
+    }
+
+def _rank(trial):
+    return (trial["mape"] if trial["mape"] is not None else np.inf,
+            trial["mae"] if trial["mae"] is not None else np.inf)
+
+def pareto_frontier(trials):
+    """Trials no other trial beats on both forecast latency and MAPE, fastest first"""
+    frontier = []
+    best_mape = np.inf
+    for trial in sorted(trials, key=lambda trial: (trial["predict_ms"], _rank(trial))):
+        if trial["mape"] is not None and trial["mape"] < best_mape:
+            frontier.append(trial)
+            best_mape = trial["mape"]
+    return frontier
+
+def successive_halving(data, cutoffs, candidates, horizon=DEFAULT_HORIZON, budget_seconds=DEFAULT_BUDGET_SECONDS,
+                       eta=ETA, min_folds=MIN_FOLDS, max_workers=None):
+    """
+    Successive halving with rolling-origin folds as the resource.
+
+    Rung 0 scores every candidate on the min_folds most recent cutoffs; each
+    rung keeps the best 1/eta of every family and adds older cutoffs until
+    all are used. Folds run in a process pool and are never recomputed.
+    When the budget runs out pending folds are cancelled, running ones are
+    killed with their worker processes, and only rungs a candidate fully
+    completed count. Returns one trial per (candidate, rung).
+    """
+    deadline = time.perf_counter() + budget_seconds
+    cutoffs = sorted((int(cutoff) for cutoff in cutoffs), reverse=True)
+    alive = list(range(len(candidates)))
+    folds = {}
+    trials = []
+    n_folds = min(min_folds, len(cutoffs))
+    rung = 0
+
+    workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_install_data, initargs=(data,))
+    out_of_time = False
+    try:
+        while True:
+            rung_cutoffs = cutoffs[:n_folds]
+            pending = {
+                pool.submit(_run_worker_fold, candidates[index][0], cutoff, horizon, candidates[index][1]): (index, cutoff)
+                for index in alive for cutoff in rung_cutoffs if (index, cutoff) not in folds
+            }
+            while pending and time.perf_counter() < deadline:
+                done, _ = wait(pending, timeout=deadline - time.perf_counter(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    folds[pending.pop(future)] = future.result()
+            out_of_time = bool(pending)
+
+            scored = []
+            for index in alive:
+                if all((index, cutoff) in folds for cutoff in rung_cutoffs):
+                    family, params = candidates[index]
+                    trial = {"model": family, "params": params, "rung": rung,
+                             **score_folds([folds[index, cutoff] for cutoff in rung_cutoffs])}
+                    trials.append(trial)
+                    scored.append((index, trial))
+
+            if out_of_time or n_folds == len(cutoffs):
+                break
+
+            # Promote the best 1/eta of each family
+            alive = []
+            for family in {candidates[index][0] for index, _ in scored}:
+                ranked = sorted((item for item in scored if candidates[item[0]][0] == family),
+                                key=lambda item: _rank(item[1]))
+                alive.extend(index for index, _ in ranked[:max(1, len(ranked) // eta)])
+            n_folds = min(n_folds * eta, len(cutoffs))
+            rung += 1
+    finally:
+        if out_of_time:
+            # Folds still running when the budget expires are killed, not waited for
+            _terminate_workers(pool)
+        pool.shutdown(wait=True, cancel_futures=True)
+    return trials
+
+def _terminate_workers(pool):
+    """Cancel queued folds and kill the pool's worker processes"""
+    terminate = getattr(pool, 'terminate_workers', None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    # shutdown() forgets the processes, so collect them first
+    processes = list((getattr(pool, '_processes', None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5)
+
+def best_trials(trials):
+    """Per family, the best trial among those evaluated on the most folds"""
+    best = {}
+    for trial in trials:
+        family = trial["model"]
+        if family not in best or (-trial["folds"], _rank(trial)) < (-best[family]["folds"], _rank(best[family])):
+            best[family] = trial
+    return best
+
+def run_search(data, cutoffs, horizon=DEFAULT_HORIZON, budget_seconds=DEFAULT_BUDGET_SECONDS,
+               n_candidates=DEFAULT_CANDIDATES, max_workers=None, eta=ETA, min_folds=MIN_FOLDS,
+               config_file=None, results_file=None):
+    """
+    Search, write the best parameters per family to the serving config and
+    return the full results (trials, best configurations, rung-0 frontier).
+
+    Families without any completed trial keep their current serving parameters.
+    """
+    start = time.perf_counter()
+    current = load_serving_config(config_file)
+    candidates = sample_candidates(n_candidates, current=current)
+    trials = successive_halving(data, cutoffs, candidates, horizon, budget_seconds, eta, min_folds, max_workers)
+    best = best_trials(trials)
+
+    results = {
+        "generated_at": datetime.now().isoformat(),
+        "horizon": horizon,
+        "cutoffs": sorted(int(cutoff) for cutoff in cutoffs),
+        "budget_seconds": budget_seconds,
+        "wall_clock_seconds": round(time.perf_counter() - start, 4),
+        "candidates": len(candidates),
+        "models": {
+            family: best.get(family, {"params": params, "folds": 0})
+            for family, params in current.items()
+        },
+        # Rung 0 is the only rung every candidate was scored on with the same folds
+        "frontier": pareto_frontier([trial for trial in trials if trial["rung"] == 0]),
+        "trials": trials
+    }
+
+    write_serving_config({key: value for key, value in results.items() if key != "trials"}, config_file)
+    if results_file:
+        with open(results_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+def main():
+    from feature_store import get_feature_store
+    from main import features, target
+
+    parser = argparse.ArgumentParser(description="Tune the forecasting models under a wall-clock budget")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS, help="search budget in seconds")
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES, help="candidates per model family")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    data = BacktestData.from_feature_store(get_feature_store(), features, target)
+    last_year = int(data.years.max())
+    cutoffs = range(last_year - 20, last_year - DEFAULT_HORIZON + 1)
+
+    results = run_search(data, cutoffs, budget_seconds=args.budget, n_candidates=args.candidates,
+                         max_workers=args.workers, results_file=RESULTS_FILE)
+
+    print(f"\n{'Model':<16}{'MAPE %':>10}{'Folds':>8}{'Predict ms':>12}  Parameters")
+    for family, trial in results["models"].items():
+        print(f"{family:<16}{str(trial.get('mape')):>10}{trial['folds']:>8}{str(trial.get('predict_ms')):>12}  {trial['params']}")
+    print("\nAccuracy/latency frontier (rung 0):")
+    for trial in results["frontier"]:
+        print(f"  {trial['model']:<16}{trial['mape']:>10}%{trial['predict_ms']:>10} ms  {trial['params']}")
+    print(f"\n{len(results['trials'])} trials in {results['wall_clock_seconds']}s; "
+          f"serving config written to {SERVING_CONFIG}, results to {RESULTS_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Gap Imputation for Climate Action Hub
+Fills missing values by per-country linear interpolation over the country x year grid
+"""
+
+import numpy as np
+
+# Recorded in feature store versions so stores built with another method are rebuilt
+IMPUTATION_METHOD = "linear-interpolation-v1"
+
+def to_grid(codes, years, values, n_countries=None):
+    """
+    Scatter rows into a (countries, years, columns) grid.
+
+    codes are country indices and years the row years; grid years are the
+    sorted distinct years of all rows. Cells without a row are NaN. Returns
+    (grid, grid years, year index of every row).
+    """
+    codes = np.asarray(codes, dtype=int)
+    values = np.asarray(values, dtype=float).reshape(codes.size, -1)
+    grid_years, year_index = np.unique(np.asarray(years, dtype=float), return_inverse=True)
+    if n_countries is None:
+        n_countries = int(codes.max()) + 1 if codes.size else 0
+
+    grid = np.full((n_countries, grid_years.size, values.shape[1]), np.nan)
+    grid[codes, year_index] = values
+    return grid, grid_years, year_index
+
+def interpolate_grid(grid, years, lower=0.0):
+    """
+    Fill the NaN cells of a (countries, years, columns) grid.
+
+    Along each country's years, gaps are interpolated linearly between the
+    nearest observed years and the ends are extrapolated from the two nearest
+    observed years (one observation is carried as a constant). Values are
+    clipped at lower (pass None to keep them unbounded). Series without any
+    observation take the column mean of all observed cells.
+
+    Returns (filled grid, mask of imputed cells).
+    """
+    n_countries, n_years, n_columns = grid.shape
+    # One series per (country, column), years along the last axis
+    series = np.moveaxis(np.asarray(grid, dtype=float), 1, 2).reshape(-1, n_years)
+    years = np.asarray(years, dtype=float)
+    known = ~np.isnan(series)
+    positions = np.broadcast_to(np.arange(n_years), series.shape)
+
+    # Nearest observed year at or before / at or after each cell (-1 / n_years when none)
+    previous = np.maximum.accumulate(np.where(known, positions, -1), axis=1)
+    following = np.minimum.accumulate(np.where(known, positions, n_years)[:, ::-1], axis=1)[:, ::-1]
+
+    # First two and last two observations of each series, for the ends
+    padded_following = np.concatenate([following, np.full((len(series), 1), n_years)], axis=1)
+    first = following[:, :1]
+    second = np.take_along_axis(padded_following, np.minimum(first + 1, n_years), axis=1)
+    padded_previous = np.concatenate([np.full((len(series), 1), -1), previous], axis=1)
+    last = previous[:, -1:]
+    second_last = np.take_along_axis(padded_previous, np.maximum(last, 0), axis=1)
+
+    before = previous < 0
+    after = following >= n_years
+    left = np.where(before, first, np.where(after, second_last, previous))
+    right = np.where(before, second, np.where(after, last, following))
+    # A single observation is used on both sides
+    left = np.where(left < 0, right, left)
+    right = np.where(right >= n_years, left, right)
+
+    observed = known.any(axis=1)
+    left = np.where(observed[:, None], left, 0)
+    right = np.where(observed[:, None], right, 0)
+    left_values = np.take_along_axis(series, left, axis=1)
+    right_values = np.take_along_axis(series, right, axis=1)
+    span = years[right] - years[left]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(span != 0, (right_values - left_values) / span, 0.0)
+    estimate = left_values + slope * (years[None, :] - years[left])
+
+    cells = np.moveaxis(grid, 2, 0).reshape(n_columns, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        column_means = np.nansum(cells, axis=1) / (~np.isnan(cells)).sum(axis=1)
+    fallback = np.tile(column_means, n_countries)[:, None]
+    estimate = np.where(observed[:, None], estimate, fallback)
+    if lower is not None:
+        estimate = np.maximum(estimate, lower)
+
+    filled = np.where(known, series, estimate)
+    shape = (n_countries, n_columns, n_years)
+    return (np.moveaxis(filled.reshape(shape), 1, 2),
+            np.moveaxis((~known).reshape(shape), 1, 2))
+
+def impute_rows(codes, years, values, n_countries=None, lower=0.0):
+    """
+    Impute missing row values by per-country interpolation over years.
+
+    Rows are (country index, year, values); only NaN values are replaced.
+    Returns (imputed values, mask of imputed values), both shaped like values.
+    """
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.copy(), missing
+
+    grid, grid_years, year_index = to_grid(codes, years, values, n_countries)
+    filled, _ = interpolate_grid(grid, grid_years, lower)
+    return np.where(missing, filled[np.asarray(codes, dtype=int), year_index], values), missing
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Background Job Queue for Climate Action Hub
+SQLite-backed queue of forecast/analysis jobs processed by standalone worker processes
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import uuid
+
+# Queue database shared by every web process on the host
+JOB_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'jobs.db')
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+DEFAULT_WORKERS = 2
+
+# Idle workers check for new jobs at this interval (submissions in-process wake them at once)
+POLL_INTERVAL = 0.5
+
+# A running job is leased to its worker for this many seconds; the worker
+# renews the lease every LEASE_SECONDS / 3 while the handler runs. Jobs whose
+# lease ran out (the worker died) are claimed again.
+LEASE_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    result TEXT,
+    error TEXT,
+    user_id INTEGER,
+    analysis_id INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+COLUMNS = ("id", "kind", "payload", "status", "result", "error", "user_id", "analysis_id",
+           "created_at", "started_at", "finished_at", "worker", "lease_until")
+
+# Columns added after the first schema, for databases created before them
+MIGRATIONS = (("worker", "TEXT"), ("lease_until", "REAL"))
+
+def worker_id():
+    """Identity recorded on claimed jobs: host, process and thread"""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+def _job_dict(row):
+    if row is None:
+        return None
+    job = dict(zip(COLUMNS, row))
+    job["payload"] = json.loads(job["payload"]) if job["payload"] else {}
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+class JobQueue:
+    """
+    Durable job queue in a local SQLite file.
+
+    Every call opens its own short-lived connection, so the queue can be
+    shared between threads and between processes. Claiming a job is a single
+    UPDATE ... RETURNING statement that leases it to one worker, so two
+    workers never run the same job while its lease is being renewed.
+    """
+
+    def __init__(self, path=None):
+        self.path = os.path.abspath(path or JOB_DB)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in MIGRATIONS:
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        finally:
+            connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _execute(self, sql, parameters=()):
+        connection = self._connect()
+        try:
+            return connection.execute(sql, parameters).fetchone()
+        finally:
+            connection.close()
+
+    def submit(self, kind, payload=None, user_id=None, analysis_id=None):
+        """Queue a job and return its ID"""
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, payload, user_id, analysis_id, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload or {}), user_id, analysis_id, time.time())
+        )
+        return job_id
+
+    def get(self, job_id):
+        """Job as a dict (payload and result decoded), or None"""
+        return _job_dict(self._execute(f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)))
+
+    def get_many(self, job_ids):
+        """Jobs with the given IDs (unknown IDs are skipped)"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id IN ({', '.join('?' * len(job_ids))})", job_ids
+            ).fetchall()
+        finally:
+            connection.close()
+        return [_job_dict(row) for row in rows]
+
+    def claim(self, worker=None, lease=LEASE_SECONDS):
+        """
+        Lease the oldest claimable job to worker and return it; None when there is none.
+
+        Claimable jobs are queued ones and running ones whose lease expired.
+        """
+        now = time.time()
+        return _job_dict(self._execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, worker = ?, lease_until = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' "
+            "OR (status = 'running' AND lease_until < ?) ORDER BY created_at LIMIT 1) "
+            f"RETURNING {', '.join(COLUMNS)}",
+            (now, worker or worker_id(), now + lease, now)
+        ))
+
+    def renew(self, job_id, worker, lease=LEASE_SECONDS):
+        """Extend the lease of a running job; False if the worker no longer holds it"""
+        return self._execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND worker = ? RETURNING id",
+            (time.time() + lease, job_id, worker)
+        ) is not None
+
+    def complete(self, job_id, result, worker=None):
+        """Store a result; with worker given, only while that worker holds the job"""
+        return self._finish(job_id, worker, "done", result=json.dumps(result))
+
+    def fail(self, job_id, error, worker=None):
+        return self._finish(job_id, worker, "failed", error=str(error))
+
+    def _finish(self, job_id, worker, status, result=None, error=None):
+        condition = "id = ?" if worker is None else "id = ? AND status = 'running' AND worker = ?"
+        parameters = (job_id,) if worker is None else (job_id, worker)
+        return self._execute(
+            f"UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL "
+            f"WHERE {condition} RETURNING id",
+            (status, result, error, time.time()) + parameters
+        ) is not None
+
+    def counts(self):
+        """Number of jobs per status"""
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        finally:
+            connection.close()
+        return {status: dict(rows).get(status, 0) for status in JOB_STATUSES}
+
+def run_forecast_job(payload):
+    """
+    Forecast job: countries, horizon, method and confidence_level as accepted by /api/forecast.
+
+    method "random_forest" uses the exported forest with prediction intervals;
+    the trend methods use the forecaster fitted on the dataset snapshot.
+    """
+    from trend_forecaster import DEFAULT_HORIZON, MAX_HORIZON
+
+    countries = payload.get("countries") or None
+    horizon = max(1, min(int(payload.get("horizon", DEFAULT_HORIZON)), MAX_HORIZON))
+    method = payload.get("method", "damped")
+
+    if method == "random_forest":
+        from feature_store import get_feature_store
+        from forecasting import forest_forecast
+        from forest_export import get_serving_forest
+
+        confidence_level = float(payload.get("confidence_level", 0.95))
+        forest = get_serving_forest()
+        feature_store = get_feature_store()
+        if forest is None or feature_store is None:
+            raise RuntimeError("Random forest model not exported; run src/main.py first")
+        return forest_forecast(forest, feature_store, countries, horizon, confidence_level)
+
+    from trend_forecaster import get_trend_forecaster
+    forecaster = get_trend_forecaster()
+    if forecaster is None:
+        raise RuntimeError("Forecasts not available")
+    return forecaster.forecast(countries, horizon, method)
+
+def validate_forecast_job(payload):
+    """Raise ValueError unless payload is a forecast job run_forecast_job accepts"""
+    from trend_forecaster import FORECAST_METHODS, MAX_HORIZON
+
+    countries = payload.get("countries", [])
+    if not isinstance(countries, list) or not all(isinstance(country, str) for country in countries):
+        raise ValueError("countries must be a list of country names")
+    method = payload.get("method", "damped")
+    if method != "random_forest" and method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecast method: {method}")
+    horizon = payload.get("horizon", 1)
+    if isinstance(horizon, bool) or not isinstance(horizon, int) or not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be an integer between 1 and {MAX_HORIZON}")
+    confidence_level = payload.get("confidence_level", 0.95)
+    if isinstance(confidence_level, bool) or not isinstance(confidence_level, (int, float)) \
+            or not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+
+# Job kinds the workers know how to run, and the payload checks applied on submission
+JOB_HANDLERS = {
+    "forecast": run_forecast_job
+}
+JOB_VALIDATORS = {
+    "forecast": validate_forecast_job
+}
+
+class JobWorkerPool:
+    """
+    Worker threads draining a JobQueue.
+
+    Handlers get the job payload and return a JSON-serializable result;
+    exceptions mark the job failed. While a handler runs, a heartbeat renews
+    the job's lease. on_complete(job) is called after every finished job with
+    its final status and result.
+
+    Web applications do not run a pool; jobs are processed by the worker
+    processes started with `python src/job_queue.py`.
+    """
+
+    def __init__(self, queue, workers=DEFAULT_WORKERS, handlers=None, on_complete=None,
+                 poll_interval=POLL_INTERVAL, lease=LEASE_SECONDS):
+        self.queue = queue
+        self.workers = workers
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.on_complete = on_complete
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return self
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wake(self):
+        """Let idle workers pick up a just-submitted job without waiting for the next poll"""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _heartbeat(self, job_id, worker, done):
+        while not done.wait(self.lease / 3):
+            if not self.queue.renew(job_id, worker, self.lease):
+                return
+
+    def run_one(self):
+        """Claim and run a single job; returns the finished job, or None if the queue was empty"""
+        worker = worker_id()
+        job = self.queue.claim(worker, self.lease)
+        if job is None:
+            return None
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], worker, done), daemon=True)
+        heartbeat.start()
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            result = handler(job["payload"])
+            done.set()
+            stored = self.queue.complete(job["id"], result, worker)
+            job.update(status="done", result=result)
+        except Exception as e:
+            done.set()
+            traceback.print_exc()
+            stored = self.queue.fail(job["id"], e, worker)
+            job.update(status="failed", error=str(e))
+        heartbeat.join()
+
+        if not stored:
+            # The lease was lost and the job handed to another worker
+            return job
+        if self.on_complete is not None:
+            try:
+                self.on_complete(job)
+            except Exception:
+                traceback.print_exc()
+        return job
+
+    def _work(self):
+        while not self._stop.is_set():
+            if self.run_one() is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+def _worker_process(path, threads):
+    pool = JobWorkerPool(JobQueue(path), workers=threads).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
+
+def main():
+    """Run job workers: one process per worker so forecasts use their own CPU and interpreter lock"""
+    parser = argparse.ArgumentParser(description="Process background jobs from the job queue")
+    parser.add_argument("--database", default=os.environ.get('JOB_DATABASE'), help="job queue file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="worker threads per process")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.database)
+    print(f"Processing jobs from {queue.path} with {args.workers} worker process(es)")
+    processes = [multiprocessing.Process(target=_worker_process, args=(queue.path, args.threads),
+                                         name=f"job-worker-{index}")
+                 for index in range(args.workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
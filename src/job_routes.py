@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Background Job Routes for Climate Action Hub
+Flask blueprint that queues forecast jobs and reports their results as saved analyses
+"""
+
+import json
+import os
+import threading
+
+from flask import Blueprint, jsonify, request, url_for
+from flask_login import current_user, login_required
+
+from job_queue import JOB_HANDLERS, JOB_VALIDATORS, JobQueue
+
+def create_jobs_blueprint(db, SavedAnalysis, UserPreferences):
+    """
+    /api/jobs routes for an application's database and models.
+
+    Jobs are only queued here; they run in the worker processes started with
+    `python src/job_queue.py`, which have no access to the app database. A
+    finished job's result is copied into its saved analysis whenever the job
+    or the analysis is read: pass analyses through the blueprint's
+    sync_analyses before showing them.
+    """
+    jobs = Blueprint('jobs', __name__)
+    queue_holder = {}
+    queue_lock = threading.Lock()
+
+    def get_job_queue():
+        """Job queue (JOB_DATABASE or the default file), opened on first use"""
+        with queue_lock:
+            if 'queue' not in queue_holder:
+                queue_holder['queue'] = JobQueue(os.environ.get('JOB_DATABASE'))
+            return queue_holder['queue']
+
+    def store_job_result(analysis, job):
+        """Copy a finished job's result (or its error) into the analysis it was submitted for"""
+        if job['status'] == 'done':
+            analysis.set_results(job['result'])
+        else:
+            analysis.set_results({'status': 'failed', 'job_id': job['id'], 'error': job.get('error')})
+
+    def sync_analyses(analyses):
+        """Store the results of finished jobs in analyses still marked queued; returns the analyses"""
+        pending = {}
+        for analysis in analyses:
+            results = analysis.get_results()
+            if isinstance(results, dict) and results.get('status') == 'queued' and results.get('job_id'):
+                pending[results['job_id']] = analysis
+        finished = [job for job in get_job_queue().get_many(pending) if job['status'] in ('done', 'failed')]
+        for job in finished:
+            store_job_result(pending[job['id']], job)
+        if finished:
+            db.session.commit()
+        return analyses
+
+    @jobs.route('/api/jobs', methods=['POST'])
+    @login_required
+    def submit_job():
+        """Queue a forecast job; the results land in a new saved analysis"""
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'message': 'Request body must be a JSON object'}), 400
+        kind = data.get('kind', 'forecast')
+        if not isinstance(kind, str) or kind not in JOB_HANDLERS:
+            return jsonify({'success': False, 'message': f'Unknown job kind: {kind}'}), 400
+
+        # Horizon and confidence level default to the user's preferences
+        parameters = data.get('parameters', {})
+        if not isinstance(parameters, dict):
+            return jsonify({'success': False, 'message': 'parameters must be an object'}), 400
+        preferences = UserPreferences.query.filter_by(user_id=current_user.id).first()
+        parameters.setdefault('horizon', preferences.default_forecast_years if preferences else 8)
+        parameters.setdefault('confidence_level', preferences.confidence_level if preferences else 0.95)
+        countries = data.get('countries', [])
+        try:
+            JOB_VALIDATORS[kind](dict(parameters, countries=countries))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+
+        analysis = SavedAnalysis(
+            user_id=current_user.id,
+            title=data.get('title', 'Untitled Analysis'),
+            analysis_type=data.get('analysis_type', 'forecast'),
+            description=data.get('description', ''),
+            countries=json.dumps(countries),
+            parameters=json.dumps(parameters),
+            results=json.dumps({'status': 'queued'}),
+            is_public=data.get('is_public', False)
+        )
+        try:
+            db.session.add(analysis)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            return jsonify({'success': False, 'message': 'Failed to save analysis.'}), 500
+
+        job_id = get_job_queue().submit(kind, dict(parameters, countries=countries),
+                                        user_id=current_user.id, analysis_id=analysis.id)
+        analysis.set_results({'status': 'queued', 'job_id': job_id})
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'analysis_id': analysis.id,
+            'status_url': url_for('jobs.get_job', job_id=job_id)
+        }), 202
+
+    @jobs.route('/api/jobs/<job_id>')
+    @login_required
+    def get_job(job_id):
+        """Status of a background job, with its result once done"""
+        job = get_job_queue().get(job_id)
+        if job is None or job['user_id'] != current_user.id:
+            return jsonify({'success': False, 'message': 'Job not found.'}), 404
+
+        if job['status'] in ('done', 'failed') and job['analysis_id'] is not None:
+            analysis = db.session.get(SavedAnalysis, job['analysis_id'])
+            if analysis is not None:
+                sync_analyses([analysis])
+
+        response = {
+            'job_id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'analysis_id': job['analysis_id'],
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at']
+        }
+        if job['status'] == 'done':
+            response['result'] = job['result']
+        elif job['status'] == 'failed':
+            response['error'] = job['error']
+        return jsonify(response)
+
+    jobs.get_job_queue = get_job_queue
+    jobs.sync_analyses = sync_analyses
+    return jobs
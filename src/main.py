@@ -1,133 +1,160 @@
-import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, r2_score
-
-# Construct the absolute path to the data file
-script_dir = os.path.dirname(os.path.abspath(__file__))
-data_path = os.path.join(script_dir, '..', 'data', 'owid-co2-data.csv')
-
-# Load the dataset
-df = pd.read_csv(data_path)
-
-# --- Data Cleaning and Preprocessing ---
-
-# 1. Select relevant columns
-df = df[['country', 'year', 'co2', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']]
-
-# 2. Rename columns for clarity
-df.rename(columns={
-    'country': 'Country',
-    'year': 'Year',
-    'co2': 'CO2_Emissions',
-    'gdp': 'GDP',
-    'population': 'Population',
-    'primary_energy_consumption': 'Energy_Use',
-    'energy_per_capita': 'Energy_Per_Capita'
-}, inplace=True)
-
-# 3. Handle missing values (e.g., fill with the mean of the column)
-for col in ['GDP', 'Population', 'Energy_Use', 'Energy_Per_Capita', 'CO2_Emissions']:
-    df[col].fillna(df[col].mean(), inplace=True)
-
-# --- Feature Engineering ---
-# For simplicity, we will use the existing features. More complex features could be engineered.
-
-# --- Model Training ---
-
-# 1. Define features (X) and target (y)
-features = ['Year', 'GDP', 'Population', 'Energy_Use', 'Energy_Per_Capita']
-target = 'CO2_Emissions'
+# pandas and scikit-learn are imported where they are used, so
+# modules reading the feature list or hyperparameters from here start fast
+import shutil
 
-X = df[features]
-y = df[target]
-
-# 2. Split data into training and testing sets
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# 3. Initialize and train the models
-# Linear Regression
-lr_model = LinearRegression()
-lr_model.fit(X_train, y_train)
-
-# Random Forest Regressor
-rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-rf_model.fit(X_train, y_train)
-
-# --- Model Evaluation ---
-
-# Make predictions
-lr_preds = lr_model.predict(X_test)
-rf_preds = rf_model.predict(X_test)
-
-# Evaluate models
-print("Linear Regression:")
-print(f"MAE: {mean_absolute_error(y_test, lr_preds)}")
-print(f"R² Score: {r2_score(y_test, lr_preds)}")
-
-print("\nRandom Forest Regressor:")
-print(f"MAE: {mean_absolute_error(y_test, rf_preds)}")
-print(f"R² Score: {r2_score(y_test, rf_preds)}")
+import numpy as np
 
+from feature_store import get_feature_store
+from forecasting import GROWTH_RATES, forecast_intervals
+from forest_export import export_forest
+from model_store import ModelStore, model_key, training_data_fingerprint
+from serving_config import load_serving_config
+from training_scheduler import TrainingScheduler
+
+# Features (X) and target (y) used by both models, read from the feature store
+features = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+target = 'co2'
+
+# Hyperparameters (tuned by hyperparameter_search.py), part of the model cache key
+LR_PARAMS = {}
+RF_PARAMS = load_serving_config()['random_forest']
+
+def train_models(X_train, y_train, store=None):
+    """
+    Fit (or load) the Linear Regression and Random Forest models.
+
+    Models are cached in the model store keyed by the training data, features
+    and hyperparameters, so unchanged reruns load them instead of refitting.
+    """
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor
+
+    store = store or ModelStore()
+    fingerprint = training_data_fingerprint(np.asarray(X_train, dtype=float), np.asarray(y_train, dtype=float))
+
+    def fit(model):
+        model.fit(X_train, y_train)
+        return model
+
+    # Linear Regression
+    lr_model = store.get_or_fit(
+        model_key(fingerprint, features, LR_PARAMS, model_type='LinearRegression'),
+        lambda: fit(LinearRegression(**LR_PARAMS))
+    )
+
+    # Random Forest Regressor
+    rf_model = store.get_or_fit(
+        model_key(fingerprint, features, RF_PARAMS, model_type='RandomForestRegressor'),
+        lambda: fit(RandomForestRegressor(**RF_PARAMS))
+    )
+    return lr_model, rf_model
+
+def train_country_models(feature_store, countries=None, store=None, max_workers=None, worker_memory_limit=None):
+    """
+    Fit one Random Forest per country in parallel.
+
+    Fits run in a process pool sharing the training matrix; models already in
+    the model store are reused and new ones are stored.
+    """
+    rows = feature_store.select(countries)
+    groups = {
+        country: np.flatnonzero((rows >= start) & (rows < end))
+        for country, (start, end) in feature_store.ranges.items()
+        if (countries is None or country in countries) and end > start
+    }
+    scheduler = TrainingScheduler(store=store, max_workers=max_workers, worker_memory_limit=worker_memory_limit)
+    result = scheduler.train(feature_store.features(features, rows), feature_store.column(target, rows),
+                             groups, features, RF_PARAMS)
+    return result["models"]
 
 # --- Forecasting Future Emissions ---
 
-def forecast_emissions(country_name, model, start_year, end_year):
-    country_df = df[df['Country'] == country_name].copy()
-    
-    # Use the latest available data for forecasting
-    latest_data = country_df.iloc[-1]
-    
-    forecast_data = []
-    for year in range(start_year, end_year + 1):
-        # Simple assumption: GDP, Population, etc., grow at a fixed rate (e.g., 2% per year)
-        gdp = latest_data['GDP'] * (1.02 ** (year - latest_data['Year']))
-        population = latest_data['Population'] * (1.01 ** (year - latest_data['Year']))
-        energy_use = latest_data['Energy_Use'] * (1.02 ** (year - latest_data['Year']))
-        energy_per_capita = latest_data['Energy_Per_Capita'] * (1.05 ** (year - latest_data['Year']))
-        
-        prediction = model.predict([[year, gdp, population, energy_use, energy_per_capita]])
-        forecast_data.append({'Year': year, 'Predicted_CO2_Emissions': prediction[0]})
-        
-        # Update latest_data for the next iteration
-        latest_data = {
-            'Year': year,
-            'GDP': gdp,
-            'Population': population,
-            'Energy_Use': energy_use,
-            'Energy_Per_Capita': energy_per_capita
-        }
-        
-    return pd.DataFrame(forecast_data)
-
-# Forecast for specific countries up to 2030
-countries_to_forecast = ['Kenya', 'China', 'United States']
-forecast_results = {}
-
-for country in countries_to_forecast:
-    forecast_results[country] = forecast_emissions(country, rf_model, df['Year'].max() + 1, 2030)
-    print(f'\nForecast for {country}:')
-    print(forecast_results[country])
-
-# --- Visualization ---
-
-plt.figure(figsize=(12, 8))
-
-for country, forecast_df in forecast_results.items():
-    historical_df = df[df['Country'] == country]
-    plt.plot(historical_df['Year'], historical_df['CO2_Emissions'], label=f'Historical CO2 Emissions - {country}')
-    plt.plot(forecast_df['Year'], forecast_df['Predicted_CO2_Emissions'], linestyle='--', label=f'Forecasted CO2 Emissions - {country}')
-
-plt.title('CO2 Emissions Forecast up to 2030')
-plt.xlabel('Year')
-plt.ylabel('CO2 Emissions (in million tonnes)')
-plt.legend()
-plt.grid(True)
-plt.savefig('co2_emissions_forecast.png')
+def forecast_countries(feature_store, countries, model, start_year, end_year, confidence_level=0.95,
+                       growth_rates=GROWTH_RATES):
+    """
+    Forecast every country for start_year..end_year in one batched pass.
+
+    Simple assumption: GDP, Population, etc., grow at fixed yearly rates from
+    each country's latest available row (forecasting.GROWTH_RATES unless
+    growth_rates is given; see scenarios.py for grids of alternatives).
+    Bounds are the confidence_level interval of the per-tree predictions.
+    """
+    import pandas as pd
+
+    found, rows = feature_store.latest_rows(countries)
+    years = np.arange(start_year, end_year + 1)
+    predictions, lower, upper = forecast_intervals(model, feature_store.features(features, rows), years,
+                                                   confidence_level, growth_rates)
+
+    return {
+        country: pd.DataFrame({
+            'Year': years,
+            'Predicted_CO2_Emissions': predictions[row],
+            'Lower_Bound': lower[row],
+            'Upper_Bound': upper[row]
+        })
+        for row, country in enumerate(found)
+    }
+
+def forecast_emissions(feature_store, country_name, model, start_year, end_year, confidence_level=0.95,
+                       growth_rates=GROWTH_RATES):
+    return forecast_countries(feature_store, [country_name], model, start_year, end_year,
+                              confidence_level, growth_rates)[country_name]
+
+def main():
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    # Imputed features are precomputed once per dataset version
+    feature_store = get_feature_store()
+
+    # --- Model Training ---
+
+    X = feature_store.features(features)
+    y = feature_store.column(target)
+
+    # Split data into training and testing sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Initialize and train the models, reusing stored fits when nothing changed
+    lr_model, rf_model = train_models(X_train, y_train)
+
+    # Export the forest as packed arrays for sklearn-free serving
+    print(f"Exported forest to {export_forest(rf_model, features=features)}")
+
+    # --- Model Evaluation ---
+
+    # Make predictions
+    lr_preds = lr_model.predict(X_test)
+    rf_preds = rf_model.predict(X_test)
+
+    # Evaluate models
+    print("Linear Regression:")
+    print(f"MAE: {mean_absolute_error(y_test, lr_preds)}")
+    print(f"R² Score: {r2_score(y_test, lr_preds)}")
+
+    print("\nRandom Forest Regressor:")
+    print(f"MAE: {mean_absolute_error(y_test, rf_preds)}")
+    print(f"R² Score: {r2_score(y_test, rf_preds)}")
+
+    # Forecast for specific countries up to 2030
+    countries_to_forecast = ['Kenya', 'China', 'United States']
+    forecast_results = forecast_countries(feature_store, countries_to_forecast, rf_model,
+                                          int(feature_store.column('year').max()) + 1, 2030)
+
+    for country, forecast_df in forecast_results.items():
+        print(f'\nForecast for {country}:')
+        print(forecast_df)
+
+    # --- Visualization ---
+
+    # Drawn headlessly (Agg) from the exported forest and cached under data/charts,
+    # where the data server and digests reuse it
+    from chart_renderer import ChartRenderer
+    base_year = int(feature_store.column('year').max())
+    key, chart_path = ChartRenderer().render(countries_to_forecast, horizon=2030 - base_year)
+    shutil.copyfile(chart_path, 'co2_emissions_forecast.png')
+    print(f"\nChart saved to co2_emissions_forecast.png (/api/charts/{key}.png)")
 
 # --- Ethical Reflection ---
 # This section would be added as comments in the final script.
@@ -136,4 +163,7 @@ plt.savefig('co2_emissions_forecast.png')
 #    unfair policy recommendations.
 # 2. Policy Implications: Emission forecasts can help governments set realistic targets
 #    and design data-driven climate policies. By identifying the main drivers of emissions,
-#    they can create targeted interventions (e.g., promoting renewable energy).
\ No newline at end of file
+#    they can create targeted interventions (e.g., promoting renewable energy).
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Persistent Model Store for Climate Action Hub
+Keeps fitted forecasting models on disk so reruns reuse them instead of retraining
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Fitted models live under <repo>/data/models by default
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'models')
+
+# Disk budget for stored models; the least recently used files are evicted beyond it
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Loaded models kept in memory so repeated lookups in one process skip the disk
+DEFAULT_MEMORY_MODELS = 8
+
+MODEL_SUFFIX = '.joblib'
+
+# Named pointers to stored models (e.g. the current production forest)
+ALIAS_FILE = 'aliases.json'
+
+def training_data_fingerprint(*arrays):
+    """SHA-256 over the shape, dtype and bytes of the training arrays"""
+    digest = hashlib.sha256()
+    for values in arrays:
+        values = np.ascontiguousarray(values)
+        digest.update(f"{values.dtype.str}{values.shape}".encode('utf-8'))
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def model_key(data_fingerprint, features, params, countries=None, model_type="RandomForestRegressor",
+              parent=None):
+    """
+    Cache key for a fitted model.
+
+    The key changes whenever the training data, the feature list, the
+    hyperparameters or the country selection change. Country order does not
+    matter; feature order does, since it defines the model's input columns.
+    Models updated from an earlier model pass that model's key as parent.
+    """
+    description = {
+        "model": model_type,
+        "data": data_fingerprint,
+        "features": list(features),
+        "params": params,
+        "countries": sorted(countries) if countries is not None else None
+    }
+    if parent is not None:
+        description["parent"] = parent
+    encoded = json.dumps(description, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+class ModelStore:
+    """
+    Size-bounded on-disk LRU of fitted models.
+
+    Models are written atomically with joblib; a file's mtime records its last
+    use, so eviction order survives process restarts and is shared between
+    the Streamlit app and the command line pipeline.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, memory_models=DEFAULT_MEMORY_MODELS):
+        self.directory = os.path.abspath(directory or MODEL_DIR)
+        self.max_bytes = max_bytes
+        self.memory_models = memory_models
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + MODEL_SUFFIX)
+
+    def _remember(self, key, model):
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_models:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the stored model for key, or None"""
+        with self._lock:
+            path = self._path(key)
+            if key in self._memory and os.path.exists(path):
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._touch(path)
+                return self._memory[key]
+            self._memory.pop(key, None)
+
+            import joblib
+            try:
+                model = joblib.load(path)
+            except FileNotFoundError:
+                self._stats["misses"] += 1
+                return None
+            except Exception as e:
+                print(f"Discarding unreadable model {key}: {e}")
+                self._remove(path)
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["disk_hits"] += 1
+            self._touch(path)
+            self._remember(key, model)
+            return model
+
+    def put(self, key, model):
+        """Persist a fitted model under key and evict old models beyond the size budget"""
+        with self._lock:
+            path = self._path(key)
+            import joblib
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp_file = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(model, temp_file)
+                os.replace(temp_file, path)
+            except OSError as e:
+                print(f"Could not store model {key}: {e}")
+            self._remember(key, model)
+            self._evict(keep=key)
+        return model
+
+    def get_or_fit(self, key, fit):
+        """Return the stored model for key, fitting and storing it with fit() on a miss"""
+        model = self.get(key)
+        if model is None:
+            model = self.put(key, fit())
+        return model
+
+    def get_alias(self, name):
+        """Metadata recorded for a named model ({"key": ..., ...}), or None"""
+        try:
+            with open(os.path.join(self.directory, ALIAS_FILE), 'r', encoding='utf-8') as file:
+                return json.load(file).get(name)
+        except (OSError, ValueError):
+            return None
+
+    def set_alias(self, name, key, **metadata):
+        """Point a name at a stored model, with extra JSON-serializable metadata"""
+        with self._lock:
+            path = os.path.join(self.directory, ALIAS_FILE)
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    aliases = json.load(file)
+            except (OSError, ValueError):
+                aliases = {}
+            aliases[name] = {"key": key, **metadata}
+            os.makedirs(self.directory, exist_ok=True)
+            temp_file = f"{path}.{os.getpid()}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as file:
+                json.dump(aliases, file, indent=2)
+            os.replace(temp_file, path)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        """Stored models as (mtime, size, path), oldest first"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(MODEL_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def _evict(self, keep=None):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            key = os.path.basename(path)[:-len(MODEL_SUFFIX)]
+            if key == keep:
+                continue
+            self._remove(path)
+            self._memory.pop(key, None)
+            self._stats["evictions"] += 1
+            total -= size
+
+    def stats(self):
+        """Hit/miss counters plus the current disk footprint"""
+        with self._lock:
+            entries = self._entries()
+            return {
+                **self._stats,
+                "models": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "in_memory": len(self._memory)
+            }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Incremental Model Updates for Climate Action Hub
+Refreshes the production forest with warm-started trees when new data years arrive
+"""
+
+import copy
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from model_store import ModelStore, model_key, training_data_fingerprint
+
+# Model store alias of the forest kept current by nightly refreshes
+PRODUCTION_ALIAS = 'production_forest'
+
+# Share of trees replaced per incremental update
+DEFAULT_REPLACE_FRACTION = 0.2
+
+# Years of recent history the new trees are trained on alongside the new years
+DEFAULT_RECENT_YEARS = 5
+
+# Full refit when the forest's mean relative error on the new years exceeds this...
+ERROR_DRIFT_THRESHOLD = 0.25
+# ...or when a feature's mean moves by more than this many standard deviations
+FEATURE_DRIFT_THRESHOLD = 1.0
+
+def drift_metrics(model, X_trained, X_new, y_new):
+    """
+    How far new data has moved from what the model was trained on.
+
+    new_mape is the model's mean relative error on the new rows; feature_shift
+    is the largest change in a feature's mean, in standard deviations of the
+    trained rows. Column 0 (the year) always moves forward and is skipped.
+    """
+    predicted = model.predict(X_new)
+    new_mae = float(np.mean(np.abs(predicted - y_new)))
+    observed = y_new != 0
+    new_mape = float(np.mean(np.abs(predicted - y_new)[observed] / np.abs(y_new[observed]))) if observed.any() else 0.0
+
+    spread = X_trained[:, 1:].std(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shift = np.abs(X_new[:, 1:].mean(axis=0) - X_trained[:, 1:].mean(axis=0)) / spread
+    shift = np.where(spread > 0, shift, 0.0)
+
+    return {
+        "new_mae": round(new_mae, 4),
+        "new_mape": round(new_mape, 4),
+        "feature_shift": round(float(shift.max()) if shift.size else 0.0, 4)
+    }
+
+def update_forest(model, X_recent, y_recent, seed, replace_fraction=DEFAULT_REPLACE_FRACTION):
+    """
+    Retire the oldest trees and grow the same number on recent data with warm_start.
+
+    The forest keeps its size. Works on a copy, so a cached model is never
+    modified in place.
+    """
+    model = copy.deepcopy(model)
+    n_trees = len(model.estimators_)
+    n_new = max(1, int(round(n_trees * replace_fraction)))
+
+    # A fresh seed per update keeps new trees from repeating earlier bootstraps
+    model.set_params(warm_start=True, n_estimators=n_trees + n_new, random_state=seed)
+    model.fit(X_recent, y_recent)
+
+    model.estimators_ = model.estimators_[n_new:]
+    model.set_params(n_estimators=len(model.estimators_), warm_start=False)
+    return model, n_new
+
+def refresh_production_forest(feature_store, features, target, params, store=None,
+                              replace_fraction=DEFAULT_REPLACE_FRACTION, recent_years=DEFAULT_RECENT_YEARS,
+                              error_threshold=ERROR_DRIFT_THRESHOLD, feature_threshold=FEATURE_DRIFT_THRESHOLD):
+    """
+    Bring the production forest up to the feature store's latest year.
+
+    Without a production forest (or when it was evicted) the forest is fitted
+    from scratch; with no new years it is returned unchanged. Otherwise drift
+    on the new years decides between an incremental update and a full refit.
+    The result is stored in the model store and the alias moved to it.
+    Returns (model, report).
+    """
+    store = store or ModelStore()
+    start = time.perf_counter()
+    years = feature_store.column('year')
+    X = np.asarray(feature_store.features(features), dtype=float)
+    y = np.asarray(feature_store.column(target), dtype=float)
+    latest_year = int(years.max())
+
+    alias = store.get_alias(PRODUCTION_ALIAS)
+    current = store.get(alias["key"]) if alias else None
+    report = {"latest_year": latest_year}
+
+    if current is not None and alias["trained_through"] >= latest_year:
+        report.update(mode="unchanged", seconds=round(time.perf_counter() - start, 4))
+        return current, report
+
+    if current is None:
+        mode = "initial"
+    else:
+        trained_through = alias["trained_through"]
+        new = years > trained_through
+        report["drift"] = drift_metrics(current, X[~new], X[new], y[new])
+        drifted = (report["drift"]["new_mape"] > error_threshold or
+                   report["drift"]["feature_shift"] > feature_threshold)
+        mode = "refit" if drifted else "incremental"
+
+    if mode == "incremental":
+        recent = years > trained_through - recent_years
+        model, n_new = update_forest(current, X[recent], y[recent], seed=latest_year, replace_fraction=replace_fraction)
+        report.update(trees_added=n_new, trees_retired=n_new, training_rows=int(recent.sum()))
+    else:
+        model = RandomForestRegressor(**params).fit(X, y)
+        report.update(training_rows=int(y.size))
+
+    # An incremental model depends on the forest it grew from, not only on the data
+    if mode == "incremental":
+        key = model_key(training_data_fingerprint(X, y), features,
+                        dict(params, replace_fraction=replace_fraction, recent_years=recent_years),
+                        model_type=f"RandomForestRegressor/{mode}", parent=alias["key"])
+    else:
+        key = model_key(training_data_fingerprint(X, y), features, params,
+                        model_type=f"RandomForestRegressor/{mode}")
+    store.put(key, model)
+    store.set_alias(PRODUCTION_ALIAS, key, trained_through=latest_year, mode=mode)
+    report.update(mode=mode, key=key, seconds=round(time.perf_counter() - start, 4))
+    return model, report
+
+def main():
+    from feature_store import get_feature_store
+    from forest_export import export_forest
+    from main import RF_PARAMS, features, target
+
+    model, report = refresh_production_forest(get_feature_store(), features, target, RF_PARAMS)
+    print(f"Production forest {report['mode']} through {report['latest_year']} in {report['seconds']}s")
+    if "drift" in report:
+        print(f"Drift: {report['drift']}")
+    print(f"Exported forest to {export_forest(model, features=features)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+What-If Scenario Grids for Climate Action Hub
+Forecasts every country under a grid of growth assumptions with chunked, batched predicts
+"""
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from forecasting import GROWTH_RATES, predict_rows
+
+# Feature columns following the year, in GROWTH_RATES order
+GROWTH_FEATURES = ('gdp', 'population', 'primary_energy_consumption', 'energy_per_capita')
+
+# Scenarios per request, and values per growth range
+MAX_SCENARIOS = 1000
+MAX_RANGE_STEPS = 50
+
+# Forecast rows (scenarios x countries x years) per request
+MAX_SCENARIO_ROWS = 250_000
+
+# Rows per predict call; bounds the forest's node-index matrix (rows x trees)
+PREDICT_CHUNK_ROWS = 16_384
+
+# Scenario trajectories (all requested countries x years) remembered per engine
+DEFAULT_CACHE_SCENARIOS = 4096
+
+def parse_growth_range(text):
+    """
+    Growth factors from "low:high:steps" (evenly spaced, inclusive) or "a,b,c".
+
+    Factors are yearly multipliers as in GROWTH_RATES (1.02 = +2% per year).
+    A range holds between 1 and MAX_RANGE_STEPS values.
+    """
+    if ':' in text:
+        low, high, steps = text.split(':')
+        steps = int(steps)
+        if not 1 <= steps <= MAX_RANGE_STEPS:
+            raise ValueError(f"Growth range needs between 1 and {MAX_RANGE_STEPS} steps: {text}")
+        return np.linspace(float(low), float(high), steps)
+    values = text.split(',')
+    if len(values) > MAX_RANGE_STEPS:
+        raise ValueError(f"Growth range has {len(values)} values; at most {MAX_RANGE_STEPS} are allowed")
+    return np.array([float(value) for value in values])
+
+def scenario_grid(ranges=None):
+    """
+    Cartesian grid of growth scenarios, shape (scenarios, len(GROWTH_FEATURES)).
+
+    ranges maps features in GROWTH_FEATURES to the growth factors to try;
+    features left out keep their GROWTH_RATES value. Raises ValueError for
+    grids of more than MAX_SCENARIOS scenarios, before the grid is built.
+    """
+    ranges = ranges or {}
+    unknown = set(ranges) - set(GROWTH_FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown growth features: {', '.join(sorted(unknown))}")
+
+    axes = [np.atleast_1d(np.asarray(ranges.get(feature, rate), dtype=float))
+            for feature, rate in zip(GROWTH_FEATURES, GROWTH_RATES)]
+    n_scenarios = 1
+    for axis in axes:
+        n_scenarios *= axis.size
+    if n_scenarios > MAX_SCENARIOS:
+        raise ValueError(f"{n_scenarios} scenarios requested; at most {MAX_SCENARIOS} are allowed")
+    return np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing='ij')], axis=1)
+
+def scenario_features(latest, years, rates):
+    """
+    Feature tensor of shape (scenarios, countries, years, features).
+
+    The scenario generalization of forecasting.forecast_features: every
+    non-year column grows as value * rate ** (year - base_year), broadcast
+    over scenarios, countries and years at once.
+    """
+    latest = np.asarray(latest, dtype=float)
+    years = np.asarray(years, dtype=float)
+    rates = np.atleast_2d(np.asarray(rates, dtype=float))
+
+    elapsed = years[None, :] - latest[:, 0, None]
+    X = np.empty((rates.shape[0], latest.shape[0], years.size, latest.shape[1]))
+    X[..., 0] = years
+    X[..., 1:] = latest[None, :, None, 1:] * rates[:, None, None, :] ** elapsed[None, :, :, None]
+    return X
+
+class ScenarioEngine:
+    """
+    Scenario forecasts for one model, cached per scenario hash.
+
+    A scenario's hash covers the countries' base rows, the forecast years and
+    its growth factors, so cached trajectories are reused exactly when the
+    inputs match. Scenarios missing from the cache are predicted together,
+    in batches of at most chunk_rows rows.
+    """
+
+    def __init__(self, model, cache_scenarios=DEFAULT_CACHE_SCENARIOS, chunk_rows=PREDICT_CHUNK_ROWS):
+        self.model = model
+        self.cache_scenarios = cache_scenarios
+        self.chunk_rows = chunk_rows
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def scenario_hashes(latest, years, rates):
+        base = hashlib.sha256()
+        base.update(f"{latest.shape}".encode('utf-8'))
+        base.update(latest.tobytes())
+        base.update(years.tobytes())
+        hashes = []
+        for row in rates:
+            digest = base.copy()
+            digest.update(row.tobytes())
+            hashes.append(digest.hexdigest()[:32])
+        return hashes
+
+    def run(self, latest, years, rates):
+        """
+        Predictions of shape (scenarios, countries, years) for every row of rates.
+
+        Returns (scenario hashes, predictions).
+        """
+        latest = np.ascontiguousarray(latest, dtype=float)
+        years = np.ascontiguousarray(years, dtype=float)
+        rates = np.ascontiguousarray(np.atleast_2d(rates), dtype=float)
+        hashes = self.scenario_hashes(latest, years, rates)
+        predictions = np.empty((rates.shape[0], latest.shape[0], years.size))
+
+        missing = []
+        with self._lock:
+            for index, key in enumerate(hashes):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(index)
+                else:
+                    self._cache.move_to_end(key)
+                    predictions[index] = cached
+            self._stats["hits"] += len(hashes) - len(missing)
+            self._stats["misses"] += len(missing)
+
+        if missing and latest.shape[0] and years.size:
+            predicted = self._predict(latest, years, rates[missing])
+            predictions[missing] = predicted
+
+            with self._lock:
+                for index, values in zip(missing, predicted):
+                    values.flags.writeable = False
+                    self._cache[hashes[index]] = values
+                while len(self._cache) > self.cache_scenarios:
+                    self._cache.popitem(last=False)
+        return hashes, predictions
+
+    def _predict(self, latest, years, rates):
+        """Predictions for the scenarios in rates, built and predicted chunk by chunk"""
+        predicted = np.empty((rates.shape[0], latest.shape[0], years.size))
+        # Whole scenarios per chunk, at least one
+        per_chunk = max(1, self.chunk_rows // (latest.shape[0] * years.size))
+        for start in range(0, rates.shape[0], per_chunk):
+            X = scenario_features(latest, years, rates[start:start + per_chunk])
+            predicted[start:start + per_chunk] = predict_rows(
+                self.model, X.reshape(-1, X.shape[-1])).reshape(X.shape[:3])
+        return predicted
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "cached": len(self._cache)}
+
+# One engine (and scenario cache) per fitted or exported model
+_engines = weakref.WeakKeyDictionary()
+_engines_lock = threading.Lock()
+
+def get_scenario_engine(model):
+    with _engines_lock:
+        engine = _engines.get(model)
+        if engine is None:
+            engine = _engines[model] = ScenarioEngine(model)
+        return engine
+
+def scenario_forecast(forest, feature_store, countries, horizon, ranges=None):
+    """
+    Scenario grid response from an exported forest and the feature store.
+
+    Every scenario lists its growth factors and a CO2 trajectory per country
+    for the years after the store's latest year.
+    """
+    features = forest.meta["features"]
+    if not features:
+        raise ValueError("Exported forest does not record its feature columns")
+    rates = scenario_grid(ranges)
+
+    found, rows = feature_store.latest_rows(countries if countries is not None else feature_store.countries)
+    base_year = int(feature_store.column('year').max())
+    years = np.arange(base_year + 1, base_year + horizon + 1)
+    n_rows = len(rates) * len(found) * years.size
+    if n_rows > MAX_SCENARIO_ROWS:
+        raise ValueError(f"{n_rows} forecast rows requested (scenarios x countries x years); "
+                         f"at most {MAX_SCENARIO_ROWS} are allowed")
+    hashes, predictions = get_scenario_engine(forest).run(feature_store.features(features, rows), years, rates)
+
+    return {
+        "method": "random_forest",
+        "base_year": base_year,
+        "years": years.tolist(),
+        "countries": found,
+        "growth_features": list(GROWTH_FEATURES),
+        "scenarios": [
+            {
+                "id": key,
+                "growth": dict(zip(GROWTH_FEATURES, np.round(rate, 6).tolist())),
+                "co2": {country: np.round(predictions[index, row], 3).tolist() for row, country in enumerate(found)}
+            }
+            for index, (key, rate) in enumerate(zip(hashes, rates))
+        ]
+    }
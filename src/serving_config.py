@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Serving Configuration for Climate Action Hub
+Hyperparameters of the served forecasting models, as chosen by the tuning command
+"""
+
+import copy
+import json
+import os
+import threading
+
+# Written by hyperparameter_search.py; the defaults below apply without it
+SERVING_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'serving_config.json')
+
+DEFAULT_SERVING_CONFIG = {
+    "random_forest": {"n_estimators": 100, "random_state": 42},
+    "trend": {"window": 20, "damping": 0.9}
+}
+
+_config = None
+_config_version = None
+_config_lock = threading.Lock()
+
+def load_serving_config(path=None):
+    """
+    Model hyperparameters per family ("random_forest", "trend").
+
+    Tuned parameters override the defaults family by family; the file is
+    re-read when it changes. Returns a copy the caller may modify.
+    """
+    global _config, _config_version
+    path = os.path.abspath(path or SERVING_CONFIG)
+    try:
+        stat = os.stat(path)
+        version = (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = (path, None, None)
+
+    with _config_lock:
+        if _config is None or _config_version != version:
+            config = copy.deepcopy(DEFAULT_SERVING_CONFIG)
+            if version[1] is not None:
+                try:
+                    with open(path, 'r', encoding='utf-8') as file:
+                        tuned = json.load(file).get("models", {})
+                    for family in config:
+                        config[family].update(tuned.get(family, {}).get("params", {}))
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable serving config {path}: {e}")
+            _config = config
+            _config_version = version
+        return copy.deepcopy(_config)
+
+def write_serving_config(config, path=None):
+    """Atomically write a tuning result ({"models": {family: {"params": ...}}, ...})"""
+    path = os.path.abspath(path or SERVING_CONFIG)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(config, file, indent=2)
+    os.replace(temp_file, path)
+    return path
@@ -3,29 +3,60 @@
 Simple web server to serve the CO2 emissions dashboard with real CSV data
 """
 import http.server
+import importlib.util
 import socketserver
 import os
 import json
 import sys
+from urllib.parse import urlparse, parse_qs
 
 # Add the src directory to the path so we can import data_processor
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from data_processor import get_major_countries_data
+    from data_processor import get_dataset_snapshot, write_chunks
     REAL_DATA_AVAILABLE = True
 except ImportError:
     REAL_DATA_AVAILABLE = False
 
+# Forecasting needs NumPy; its modules are imported on the first forecast request
+# so the server starts without loading them
+FORECAST_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+_chart_renderer = None
+
+def get_chart_renderer():
+    """Chart cache shared by all requests, created on the first chart request"""
+    global _chart_renderer
+    if _chart_renderer is None:
+        from chart_renderer import ChartRenderer
+        _chart_renderer = ChartRenderer()
+    return _chart_renderer
+
 class CO2DashboardHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         print(f"Request path: {self.path}")
         # Handle specific routes first
         if self.path == '/':
             self.path = '/index.html'
-        elif self.path == '/api/data':
+        elif urlparse(self.path).path == '/api/data':
             self.serve_data()
             return
+        elif urlparse(self.path).path == '/api/stats':
+            self.serve_statistics()
+            return
+        elif urlparse(self.path).path == '/api/forecast':
+            self.serve_forecast()
+            return
+        elif urlparse(self.path).path == '/api/scenarios':
+            self.serve_scenarios()
+            return
+        elif urlparse(self.path).path == '/api/chart':
+            self.serve_chart()
+            return
+        elif urlparse(self.path).path.startswith('/api/charts/'):
+            self.serve_cached_chart()
+            return
         elif self.path.startswith('/login.html'):
             print("Serving login.html template")
             self.serve_template_file('login.html')
@@ -82,14 +113,22 @@ class CO2DashboardHandler(http.server.SimpleHTTPRequestHandler):
         try:
             # Try to load real data first
             if REAL_DATA_AVAILABLE:
-                real_data = get_major_countries_data()
-                if real_data and real_data.get('countries'):
+                snapshot = get_dataset_snapshot()
+                if snapshot and snapshot.has_countries('simple'):
+                    # Filter by countries if specified
+                    query_params = parse_qs(urlparse(self.path).query)
+                    countries = None
+                    if 'countries' in query_params:
+                        countries = query_params['countries'][0].split(',')
+                    
+                    chunks = snapshot.response_chunks('simple', countries)
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(sum(len(chunk) for chunk in chunks)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
-                    self.wfile.write(json.dumps(real_data).encode())
-                    print(f"Served real data for {len(real_data['countries'])} countries")
+                    write_chunks(self, chunks)
+                    print(f"Served real data for {len(snapshot.select('simple', countries))} countries")
                     return
             
             # Fallback to sample data
@@ -99,6 +138,205 @@ class CO2DashboardHandler(http.server.SimpleHTTPRequestHandler):
             print(f"Error serving data: {e}")
             self.serve_sample_data()
     
+    def serve_statistics(self):
+        """Serve the statistics catalog computed when the dataset snapshot was ingested"""
+        snapshot = get_dataset_snapshot() if REAL_DATA_AVAILABLE else None
+        if snapshot is None:
+            self.send_json_error(503, "Dataset not available")
+            return
+        
+        query_params = parse_qs(urlparse(self.path).query)
+        country = query_params['country'][0] if 'country' in query_params else None
+        chunks = snapshot.statistics_chunks(country)
+        if chunks is None:
+            self.send_json_error(404, f"No statistics for country: {country}")
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(sum(len(chunk) for chunk in chunks)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        write_chunks(self, chunks)
+    
+    def serve_forecast(self):
+        """Serve trend forecasts fitted on the dataset snapshot"""
+        if not FORECAST_AVAILABLE:
+            self.send_json_error(503, "Forecasts not available")
+            return
+        from trend_forecaster import get_trend_forecaster, DEFAULT_HORIZON, FORECAST_METHODS
+        
+        query_params = parse_qs(urlparse(self.path).query)
+        countries = None
+        if 'countries' in query_params:
+            countries = query_params['countries'][0].split(',')
+        method = query_params.get('method', ['damped'])[0]
+        try:
+            horizon = int(query_params.get('horizon', [DEFAULT_HORIZON])[0])
+        except ValueError:
+            self.send_json_error(400, "horizon must be an integer")
+            return
+        # Forest forecasts never need the trend forecaster
+        if method == 'random_forest':
+            self.serve_forest_forecast(countries, horizon, query_params)
+            return
+        if method not in FORECAST_METHODS:
+            self.send_json_error(400, f"Unknown forecast method: {method}")
+            return
+        
+        forecaster = get_trend_forecaster()
+        if forecaster is None:
+            self.send_json_error(503, "Forecasts not available")
+            return
+        
+        body = forecaster.forecast_json(countries, horizon, method)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_forest_forecast(self, countries, horizon, query_params):
+        """Random forest forecasts with per-tree prediction intervals at the requested confidence"""
+        from feature_store import get_feature_store
+        from forecasting import forest_forecast
+        from forest_export import get_serving_forest
+        from trend_forecaster import MAX_HORIZON
+        
+        try:
+            confidence_level = float(query_params.get('confidence', [0.95])[0])
+        except ValueError:
+            confidence_level = -1
+        if not 0 < confidence_level < 1:
+            self.send_json_error(400, "confidence must be between 0 and 1")
+            return
+        
+        forest = get_serving_forest()
+        feature_store = get_feature_store()
+        if forest is None or feature_store is None:
+            self.send_json_error(503, "Random forest model not exported; run src/main.py first")
+            return
+        
+        horizon = max(1, min(horizon, MAX_HORIZON))
+        try:
+            response = forest_forecast(forest, feature_store, countries, horizon, confidence_level)
+        except ValueError as e:
+            # e.g. a forest exported without its feature columns
+            self.send_json_error(503, str(e))
+            return
+        body = json.dumps(response, separators=(',', ':')).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_scenarios(self):
+        """Random forest forecasts for a grid of growth scenarios, e.g. ?gdp=1.00:1.04:5&population=1.005,1.01"""
+        if not FORECAST_AVAILABLE:
+            self.send_json_error(503, "Forecasts not available")
+            return
+        from feature_store import get_feature_store
+        from forest_export import get_serving_forest
+        from scenarios import GROWTH_FEATURES, parse_growth_range, scenario_forecast
+        from trend_forecaster import DEFAULT_HORIZON, MAX_HORIZON
+        
+        forest = get_serving_forest()
+        feature_store = get_feature_store() if forest is not None else None
+        if forest is None or feature_store is None:
+            self.send_json_error(503, "Random forest model not exported; run src/main.py first")
+            return
+        
+        query_params = parse_qs(urlparse(self.path).query)
+        countries = None
+        if 'countries' in query_params:
+            countries = query_params['countries'][0].split(',')
+        try:
+            horizon = max(1, min(int(query_params.get('horizon', [DEFAULT_HORIZON])[0]), MAX_HORIZON))
+            ranges = {feature: parse_growth_range(query_params[feature][0])
+                      for feature in GROWTH_FEATURES if feature in query_params}
+            response = scenario_forecast(forest, feature_store, countries, horizon, ranges)
+        except ValueError as e:
+            self.send_json_error(400, str(e))
+            return
+        
+        body = json.dumps(response, separators=(',', ':')).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_chart(self):
+        """
+        History + forecast chart PNG, e.g. ?countries=Kenya,China&horizon=10&width=1200&height=800
+        
+        The ETag is the chart's content address; the image itself is also
+        available at /api/charts/<key>.png for pages and digests that embed it.
+        """
+        if not FORECAST_AVAILABLE:
+            self.send_json_error(503, "Charts not available")
+            return
+        from chart_renderer import DEFAULT_HORIZON, DEFAULT_SIZE
+        
+        query_params = parse_qs(urlparse(self.path).query)
+        try:
+            countries = query_params.get('countries', [''])[0].split(',')
+            horizon = int(query_params.get('horizon', [DEFAULT_HORIZON])[0])
+            size = (int(query_params.get('width', [DEFAULT_SIZE[0]])[0]),
+                    int(query_params.get('height', [DEFAULT_SIZE[1]])[0]))
+            key, path = get_chart_renderer().render(countries, horizon, size)
+        except ValueError as e:
+            self.send_json_error(400, str(e))
+            return
+        except RuntimeError as e:
+            self.send_json_error(503, str(e))
+            return
+        
+        # The same query renders a new chart once the data or model changes, so revalidate often
+        self.send_png(path, key, 'public, max-age=300')
+    
+    def serve_cached_chart(self):
+        """Previously rendered chart by content address; it never changes, so it is cached for good"""
+        key = urlparse(self.path).path[len('/api/charts/'):]
+        if key.endswith('.png'):
+            key = key[:-len('.png')]
+        path = get_chart_renderer().cached(key) if FORECAST_AVAILABLE and key.isalnum() else None
+        if path is None:
+            self.send_json_error(404, "Chart not found")
+            return
+        self.send_png(path, key, 'public, max-age=31536000, immutable')
+    
+    def send_png(self, path, key, cache_control):
+        etag = f'"{key}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            return
+        
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_json_error(self, status, message):
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps({'error': message}).encode())
+    
     def serve_sample_data(self):
         try:
             # Sample data for demonstration
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler for Climate Action Hub
+Measures cold-start import time of every entry point with python -X importtime
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+
+# Entry point name -> (directory it is started from, module imported at startup).
+# The Streamlit app is left out: importing it runs the whole page.
+ENTRY_POINTS = {
+    "auth_app": (ROOT_DIR, "auth_app"),
+    "simple_auth_app": (ROOT_DIR, "simple_auth_app"),
+    "web_server": (SRC_DIR, "web_server"),
+    "simple_server": (SRC_DIR, "simple_server"),
+    "main": (SRC_DIR, "main"),
+}
+
+# Cold-start budget per entry point in milliseconds, interpreter start included.
+# The auth apps create their tables (and demo users) against a fresh database.
+STARTUP_BUDGETS_MS = {
+    "auth_app": 1500,
+    "simple_auth_app": 2000,
+    "web_server": 500,
+    "simple_server": 500,
+    "main": 800,
+}
+
+# Heavy dependencies that must be imported on first use, never at startup
+DEFERRED_MODULES = ("pandas", "sklearn", "matplotlib", "scipy", "joblib")
+
+def parse_importtime(stderr):
+    """
+    Rows of -X importtime output as (module, self_us, cumulative_us, depth).
+
+    Depth 0 marks modules imported directly by the interpreter or the entry
+    point's import statement.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(self_us), int(cumulative_us), depth))
+    return rows
+
+def profile_startup(name, runs=1):
+    """
+    Import an entry point in fresh interpreters and report the fastest run.
+
+    Returns wall-clock milliseconds, the import-time rows of that run and the
+    deferred dependencies it loaded. Databases are created in a temporary
+    directory so profiling never touches real data.
+    """
+    directory, module = ENTRY_POINTS[name]
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(runs):
+            env = dict(os.environ,
+                       DATABASE_URL=f"sqlite:///{os.path.join(tmp, f'users{run}.db')}",
+                       JOB_DATABASE=os.path.join(tmp, f'jobs{run}.db'))
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                       cwd=directory, env=env, capture_output=True, text=True)
+            wall_ms = (time.perf_counter() - start) * 1000
+            if completed.returncode != 0:
+                raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+            if best is None or wall_ms < best["wall_ms"]:
+                imports = parse_importtime(completed.stderr)
+                best = {
+                    "entry_point": name,
+                    "wall_ms": round(wall_ms, 1),
+                    "budget_ms": STARTUP_BUDGETS_MS.get(name),
+                    "imports": imports,
+                    "deferred_loaded": sorted({row[0] for row in imports if row[0] in DEFERRED_MODULES})
+                }
+    return best
+
+def format_report(profile, top=10):
+    """Text report: wall time against budget and the slowest imports by cumulative time"""
+    status = "ok" if within_budget(profile) else "OVER BUDGET"
+    lines = [f"{profile['entry_point']}: {profile['wall_ms']} ms (budget {profile['budget_ms']} ms) {status}"]
+    if profile["deferred_loaded"]:
+        lines.append(f"  loads deferred dependencies at startup: {', '.join(profile['deferred_loaded'])}")
+    slowest = sorted(profile["imports"], key=lambda row: row[2], reverse=True)[:top]
+    for module, self_us, cumulative_us, depth in slowest:
+        lines.append(f"  {cumulative_us / 1000:>9.1f} ms cumulative {self_us / 1000:>8.1f} ms self  {'  ' * depth}{module}")
+    return "\n".join(lines)
+
+def within_budget(profile):
+    budget = profile["budget_ms"]
+    return not profile["deferred_loaded"] and (budget is None or profile["wall_ms"] <= budget)
+
+def main():
+    names = sys.argv[1:] or list(ENTRY_POINTS)
+    profiles = [profile_startup(name, runs=3) for name in names]
+    for profile in profiles:
+        print(format_report(profile))
+        print()
+    return 0 if all(within_budget(profile) for profile in profiles) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
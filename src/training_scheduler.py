@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Parallel Model Training for Climate Action Hub
+Fans per-country / per-region model fits out over a process pool
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from model_store import ModelStore, model_key, training_data_fingerprint
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Training matrix attached by each worker process
+_worker_data = {}
+
+def _attach_training_data(name, x_shape, y_shape, memory_limit):
+    """Pool initializer: map the shared training matrix and apply the memory limit"""
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    block = shared_memory.SharedMemory(name=name)
+    x_size = int(np.prod(x_shape))
+    buffer = np.ndarray((x_size + int(np.prod(y_shape)),), dtype=np.float64, buffer=block.buf)
+    _worker_data["block"] = block
+    _worker_data["X"] = buffer[:x_size].reshape(x_shape)
+    _worker_data["y"] = buffer[x_size:]
+
+def _fit_group(name, rows, model_class, params):
+    """Fit one group's model on its rows of the shared matrix"""
+    start = time.perf_counter()
+    model = model_class(**params)
+    model.fit(_worker_data["X"][rows], _worker_data["y"][rows])
+    return name, model, time.perf_counter() - start
+
+def group_rows(labels):
+    """Row indices per group label, e.g. per country or per region"""
+    labels = np.asarray(labels)
+    names, codes = np.unique(labels, return_inverse=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return {str(name): order[bounds[i]:bounds[i + 1]] for i, name in enumerate(names)}
+
+def print_progress(event):
+    """Default progress reporter"""
+    status = "cached" if event["cached"] else ("failed" if event["error"] else f"{event['seconds']:.2f}s")
+    print(f"[{event['done']}/{event['total']}] {event['name']}: {status}")
+
+class TrainingScheduler:
+    """
+    Fits one model per group in a ProcessPoolExecutor.
+
+    The training matrix is copied once into shared memory; workers map it and
+    slice their group's rows, so tasks only carry row indices. Groups whose
+    model is already in the model store are not refitted, and every new fit is
+    written back to the store.
+    """
+
+    def __init__(self, store=None, max_workers=None, worker_memory_limit=None,
+                 model_class=None, progress=print_progress):
+        if model_class is None:
+            # Imported on first use so importing this module stays cheap
+            from sklearn.ensemble import RandomForestRegressor
+            model_class = RandomForestRegressor
+        self.store = store or ModelStore()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Address space limit per worker in bytes (POSIX only); a fit exceeding
+        # it fails with MemoryError instead of exhausting the machine
+        self.worker_memory_limit = worker_memory_limit
+        self.model_class = model_class
+        self.progress = progress
+
+    def train(self, X, y, groups, features, params):
+        """
+        Fit or load a model for every group.
+
+        groups maps a group name to its row indices in X (see group_rows).
+        Returns {"models", "seconds", "cached", "failed"}.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        result = {"models": {}, "seconds": {}, "cached": [], "failed": {}}
+        total = len(groups)
+
+        pending = {}
+        for name, rows in groups.items():
+            key = model_key(training_data_fingerprint(X[rows], y[rows]), features, params, [name],
+                            model_type=self.model_class.__name__)
+            model = self.store.get(key)
+            if model is None:
+                pending[name] = (key, rows)
+                continue
+            result["models"][name] = model
+            result["cached"].append(name)
+            self._report(result, name, total, cached=True)
+
+        if pending:
+            self._fit_pending(X, y, pending, params, result, total)
+        return result
+
+    def _fit_pending(self, X, y, pending, params, result, total):
+        block = shared_memory.SharedMemory(create=True, size=max(X.nbytes + y.nbytes, 1))
+        try:
+            buffer = np.ndarray((X.size + y.size,), dtype=np.float64, buffer=block.buf)
+            buffer[:X.size] = X.ravel()
+            buffer[X.size:] = y
+
+            workers = min(self.max_workers, len(pending))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_training_data,
+                                     initargs=(block.name, X.shape, y.shape, self.worker_memory_limit)) as pool:
+                futures = {
+                    pool.submit(_fit_group, name, rows, self.model_class, params): name
+                    for name, (key, rows) in pending.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        _, model, seconds = future.result()
+                    except Exception as e:
+                        result["failed"][name] = f"{type(e).__name__}: {e}"
+                        self._report(result, name, total, error=result["failed"][name])
+                        continue
+                    self.store.put(pending[name][0], model)
+                    result["models"][name] = model
+                    result["seconds"][name] = seconds
+                    self._report(result, name, total, seconds=seconds)
+            del buffer
+        finally:
+            block.close()
+            block.unlink()
+
+    def _report(self, result, name, total, cached=False, seconds=None, error=None):
+        if self.progress is None:
+            return
+        done = len(result["models"]) + len(result["failed"])
+        self.progress({"name": name, "done": done, "total": total,
+                       "cached": cached, "seconds": seconds, "error": error})
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Trend Forecaster for Climate Action Hub
+Fits log-linear / damped-trend CO2 models for every country with one batched solve
+"""
+
+import json
+import threading
+
+import numpy as np
+
+from data_processor import get_dataset_snapshot
+from serving_config import load_serving_config
+
+# Years of history each trend is fitted on
+DEFAULT_WINDOW = 20
+
+# Damping factor applied to the trend per forecast year (1.0 = plain log-linear)
+DEFAULT_DAMPING = 0.9
+
+DEFAULT_HORIZON = 10
+MAX_HORIZON = 50
+
+FORECAST_METHODS = ("damped", "log_linear")
+
+class TrendForecaster:
+    """
+    Per-country trend models fitted together on the year x country CO2 matrix.
+
+    Each country gets a weighted least squares fit of log(co2) on the year over
+    the last `window` years, with missing years weighted zero. The 2x2 normal
+    equations of all countries are stacked and solved with one np.linalg.solve;
+    the fitted level is anchored at the last year of the matrix.
+    """
+
+    def __init__(self, countries, years, co2, window=DEFAULT_WINDOW, damping=DEFAULT_DAMPING):
+        self.countries = list(countries)
+        self.index = {country: column for column, country in enumerate(self.countries)}
+        self.damping = damping
+
+        years = np.asarray(years, dtype=float)
+        co2 = np.asarray(co2, dtype=float)
+        self.base_year = int(years.max()) if years.size else 0
+
+        # Latest observation per country, reported alongside its forecast
+        reported = np.isfinite(co2) & (co2 > 0)
+        last_row = co2.shape[0] - 1 - np.argmax(reported[::-1], axis=0) if years.size else np.zeros(len(self.countries), dtype=int)
+        self.last_year = years[last_row].astype(int) if years.size else last_row
+        self.last_value = co2[last_row, np.arange(len(self.countries))] if years.size else np.zeros(len(self.countries))
+
+        recent = years > self.base_year - window
+        t = years[recent] - self.base_year
+        values = co2[recent]
+
+        observed = np.isfinite(values) & (values > 0)
+        weights = observed.astype(float)
+        logs = np.log(np.where(observed, values, 1.0))
+
+        # Normal equations per country for log(co2) = level + slope * t
+        n = weights.sum(axis=0)
+        st = t @ weights
+        stt = (t * t) @ weights
+        sy = (weights * logs).sum(axis=0)
+        sty = t @ (weights * logs)
+
+        normal = np.empty((len(self.countries), 2, 2))
+        normal[:, 0, 0], normal[:, 0, 1], normal[:, 1, 0], normal[:, 1, 1] = n, st, st, stt
+        rhs = np.stack([sy, sty], axis=1)
+
+        # Countries with fewer than two observed years cannot be fitted
+        self.fitted = n >= 2
+        normal[~self.fitted] = np.eye(2)
+        rhs[~self.fitted] = 0.0
+        coefficients = np.linalg.solve(normal, rhs[:, :, None])[:, :, 0]
+        self.level, self.slope = coefficients[:, 0], coefficients[:, 1]
+
+        residuals = weights * (logs - self.level[None, :] - self.slope[None, :] * t[:, None])
+        dof = np.maximum(n - 2, 1)
+        self.sigma = np.sqrt((residuals ** 2).sum(axis=0) / dof)
+        self.observations = n.astype(int)
+
+    def trend_factors(self, horizon, method="damped"):
+        """Multiplier of the slope for forecast years 1..horizon"""
+        steps = np.arange(1, horizon + 1, dtype=float)
+        if method == "log_linear" or self.damping >= 1.0:
+            return steps
+        phi = self.damping
+        return phi * (1 - phi ** steps) / (1 - phi)
+
+    def forecast(self, countries=None, horizon=DEFAULT_HORIZON, method="damped"):
+        """Forecast dict for the requested countries (all fitted countries by default)"""
+        if method not in FORECAST_METHODS:
+            raise ValueError(f"Unknown forecast method: {method}")
+        horizon = max(1, min(int(horizon), MAX_HORIZON))
+
+        if countries is None:
+            selected = [country for country in self.countries if self.fitted[self.index[country]]]
+        else:
+            selected = [country for country in countries
+                        if country in self.index and self.fitted[self.index[country]]]
+        columns = np.array([self.index[country] for country in selected], dtype=int)
+
+        factors = self.trend_factors(horizon, method)
+        predicted = np.exp(self.level[columns, None] + self.slope[columns, None] * factors[None, :])
+
+        return {
+            "method": method,
+            "base_year": self.base_year,
+            "years": list(range(self.base_year + 1, self.base_year + horizon + 1)),
+            "countries": selected,
+            "forecasts": {
+                country: {
+                    "co2": np.round(predicted[row], 3).tolist(),
+                    "last_observed": {"year": int(self.last_year[column]), "co2": float(self.last_value[column])},
+                    "annual_growth": round(float(np.expm1(self.slope[column])), 4),
+                    "fit_years": int(self.observations[column]),
+                    "log_residual_std": round(float(self.sigma[column]), 4)
+                }
+                for row, (country, column) in enumerate(zip(selected, columns.tolist()))
+            }
+        }
+
+    def forecast_json(self, countries=None, horizon=DEFAULT_HORIZON, method="damped"):
+        return json.dumps(self.forecast(countries, horizon, method), separators=(',', ':')).encode('utf-8')
+
+def build_trend_forecaster(snapshot, window=DEFAULT_WINDOW, damping=DEFAULT_DAMPING):
+    """Fit a TrendForecaster on a dataset snapshot's 'web' view (all countries and aggregates)"""
+    data = snapshot.views['web']
+    countries = sorted(data)
+    years = sorted({point["year"] for country in countries for point in data[country]["historical"]})
+    row_of = {year: row for row, year in enumerate(years)}
+
+    co2 = np.full((len(years), len(countries)), np.nan)
+    for column, country in enumerate(countries):
+        for point in data[country]["historical"]:
+            co2[row_of[point["year"]], column] = point["co2"]
+
+    return TrendForecaster(countries, years, co2, window, damping)
+
+_forecaster = None
+_forecaster_version = None
+_forecaster_lock = threading.Lock()
+
+def get_trend_forecaster(data_file=None):
+    """
+    Return the forecaster fitted on the current dataset snapshot with the
+    served trend parameters, refitting when either changes
+    """
+    global _forecaster, _forecaster_version
+    snapshot = get_dataset_snapshot(data_file)
+    if snapshot is None:
+        return None
+    params = load_serving_config()["trend"]
+    version = (snapshot.version, tuple(sorted(params.items())))
+
+    with _forecaster_lock:
+        if _forecaster is None or _forecaster_version != version:
+            _forecaster = build_trend_forecaster(snapshot, **params)
+            _forecaster_version = version
+        return _forecaster
@@ -6,9 +6,14 @@ import http.server
 import socketserver
 import os
 import json
-import pandas as pd
+import sys
 from urllib.parse import urlparse, parse_qs
 
+# Add the src directory to the path so we can import data_processor
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_processor import get_dataset_snapshot, write_chunks
+
 class CO2DashboardHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         if self.path == '/' or self.path == '/dashboard.html':
@@ -23,54 +28,29 @@ class CO2DashboardHandler(http.server.SimpleHTTPRequestHandler):
     
     def serve_data(self):
         try:
-            # Load the CO2 data
+            # Load the CO2 data (cached and pre-encoded per dataset version)
             data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'owid-co2-data.csv')
-            df = pd.read_csv(data_path)
+            snapshot = get_dataset_snapshot(os.path.abspath(data_path))
+            if snapshot is None:
+                raise FileNotFoundError(f"Data file not found: {data_path}")
             
             # Get query parameters
             parsed_url = urlparse(self.path)
             query_params = parse_qs(parsed_url.query)
             
             # Filter by countries if specified
+            countries = None
             if 'countries' in query_params:
                 countries = query_params['countries'][0].split(',')
-                df = df[df['country'].isin(countries)]
-            
-            # Get unique countries and years
-            countries = sorted(df['country'].unique().tolist())
-            years = sorted(df['year'].unique().tolist())
-            
-            # Prepare response data
-            response_data = {
-                'countries': countries,
-                'years': years,
-                'data': {}
-            }
-            
-            # Process data for each country
-            for country in countries:
-                country_df = df[df['country'] == country].copy()
-                country_df = country_df.dropna(subset=['co2', 'year'])
-                country_df = country_df.sort_values('year')
-                
-                response_data['data'][country] = {
-                    'historical': []
-                }
-                
-                for _, row in country_df.iterrows():
-                    response_data['data'][country]['historical'].append({
-                        'year': int(row['year']),
-                        'co2': float(row['co2']) if pd.notna(row['co2']) else 0,
-                        'population': float(row['population']) if pd.notna(row['population']) else 0,
-                        'energy': float(row['primary_energy_consumption']) if pd.notna(row['primary_energy_consumption']) else 0
-                    })
             
             # Send response
+            chunks = snapshot.response_chunks('web', countries)
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(sum(len(chunk) for chunk in chunks)))
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps(response_data).encode())
+            write_chunks(self, chunks)
             
         except Exception as e:
             self.send_response(500)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the rolling-origin backtesting harness
+Runs a few folds on synthetic exponential series
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from backtesting import BacktestData, run_backtest, run_fold
+from feature_store import get_feature_store
+
+FEATURES = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+
+def make_data():
+    """Two countries with exact 5% / 2% CO2 growth; the second stops reporting in 2014"""
+    countries, years, rows, targets = [], [], [], []
+    for country, rate, last_year in (('Kenya', 1.05, 2020), ('Chad', 1.02, 2014)):
+        for year in range(2000, last_year + 1):
+            countries.append(country)
+            years.append(year)
+            rows.append([year, 1e9 * 1.02 ** (year - 2000), 1e6, 10.0, 1000.0])
+            targets.append(10.0 * rate ** (year - 2000))
+    return BacktestData(countries, years, rows, targets)
+
+def test_folds_never_see_future_years():
+    """A fold only trains on years up to its cutoff and scores the following years"""
+    print("\n⏪ Testing rolling-origin folds...")
+    data = make_data()
+    fold = run_fold(data, "trend", 2012, 3)
+    kenya = list(data.names).index('Kenya')
+    chad = list(data.names).index('Chad')
+
+    assert np.allclose(fold["actual"][kenya], 10.0 * 1.05 ** np.array([13, 14, 15]))
+    assert np.isnan(fold["actual"][chad, 2])
+    # Exact exponential growth is recovered up to the damping of the trend
+    assert np.all(np.abs(fold["predicted"] / fold["actual"] - 1)[kenya] < 0.1)
+    print("✅ Folds are split on the cutoff year")
+
+def test_folds_impute_from_past_years_only():
+    """Gaps before the cutoff are filled from earlier years; imputed targets are never scored"""
+    print("\n🕳️  Testing fold-local imputation...")
+    rows = ["country,year,population,gdp,co2,primary_energy_consumption,energy_per_capita"]
+    for year in range(2000, 2011):
+        # GDP is missing from 2005 to 2009 and jumps in 2010; CO2 is missing in 2009
+        gdp = "" if 2005 <= year <= 2009 else (1000.0 if year == 2010 else 100.0 + year - 2000)
+        co2 = "" if year == 2009 else 10.0 + year - 2000
+        rows.append(f"Kenya,{year},30,{gdp},{co2},50,500")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text("\n".join(rows) + "\n", encoding='utf-8')
+        store = get_feature_store(str(data_file), Path(tmp) / 'features')
+        data = BacktestData.from_feature_store(store, FEATURES, 'co2')
+
+        # The store interpolates 2007 towards the 2010 value; the fold extrapolates 2000-2004
+        assert store.column('gdp')[7] > 200
+        X = data.fold_features(2007)
+        assert X[5:8, 1].tolist() == [105.0, 106.0, 107.0]
+        assert np.isnan(X[8:10, 1]).all() and X[10, 1] == 1000.0
+
+        fold = run_fold(data, "linear_regression", 2007, 3)
+        assert np.isnan(fold["actual"][0, 1]) and fold["actual"][0, 0] == 18.0
+        assert np.isfinite(fold["predicted"]).all()
+        print("✅ Folds never impute from future years")
+
+def test_backtest_tables_and_timings():
+    """Parallel folds produce MAE/MAPE tables and timings in the JSON output"""
+    print("\n📊 Testing backtest tables...")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / 'backtest.json'
+        results = run_backtest(make_data(), range(2008, 2013), horizon=2,
+                               models=("linear_regression", "trend"), max_workers=2, output_file=output_file)
+
+        assert json.loads(output_file.read_text(encoding='utf-8')) == results
+        assert len(results["folds"]) == 10 and results["wall_clock_seconds"] > 0
+        for summary in results["models"].values():
+            assert summary["mae"] >= 0 and summary["mape"] >= 0
+            assert len(summary["by_horizon"]) == 2
+            assert summary["fit_seconds_total"] >= 0
+        assert set(results["by_country"]["trend"]) == {'Kenya', 'Chad'}
+        assert results["models"]["trend"]["mape"] < results["models"]["linear_regression"]["mape"]
+        print("✅ Backtest tables are written")
+
+def main():
+    """Main test function"""
+    print("🌍 Backtesting Test Suite")
+    print("=" * 50)
+
+    test_folds_never_see_future_years()
+    test_folds_impute_from_past_years_only()
+    test_backtest_tables_and_timings()
+
+    print("\n🎉 All backtesting tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
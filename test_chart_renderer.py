@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless chart renderer
+Renders charts from a temporary feature store and exported forest
+"""
+
+import json
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from chart_renderer import ChartRenderer
+from feature_store import get_feature_store
+from forest_export import export_forest
+
+FEATURES = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+
+def make_renderer(tmp, n_estimators=10):
+    """Renderer over a small dataset, its feature store and an exported forest in tmp"""
+    rows = ["country,year,population,gdp,co2,primary_energy_consumption,energy_per_capita"]
+    for country, scale in (('Kenya', 1.0), ('Chad', 0.5), ('Peru', 2.0)):
+        for year in range(2000, 2011):
+            growth = 1.03 ** (year - 2000)
+            rows.append(f"{country},{year},{30e6 * scale},{1e10 * scale * growth},{10 * scale * growth},"
+                        f"{50 * scale * growth},{500 * growth}")
+    data_file = Path(tmp) / 'owid-co2-data.csv'
+    data_file.write_text("\n".join(rows) + "\n", encoding='utf-8')
+    features_dir = str(Path(tmp) / 'features')
+    forest_dir = str(Path(tmp) / 'forest')
+
+    store = get_feature_store(str(data_file), features_dir)
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=42)
+    export_forest(model.fit(store.features(FEATURES), store.column('co2')), forest_dir, features=FEATURES)
+    return ChartRenderer(str(Path(tmp) / 'charts'), data_file=str(data_file), features_dir=features_dir,
+                         forest_dir=forest_dir)
+
+def png_size(path):
+    """(width, height) from a PNG header"""
+    header = Path(path).read_bytes()[:24]
+    assert header[:8] == b'\x89PNG\r\n\x1a\n'
+    return struct.unpack('>II', header[16:24])
+
+def test_content_addressed_cache():
+    """Charts are keyed by data version, countries, horizon and size, and drawn once"""
+    print("\n🖼️  Testing the chart cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = make_renderer(tmp)
+        key, path = renderer.render(['Kenya', 'Chad'], horizon=5, size=(640, 480))
+        assert png_size(path) == (640, 480)
+
+        # A cache hit returns the stored file without drawing again
+        Path(path).write_bytes(b'cached')
+        assert renderer.render(['Kenya', 'Chad'], horizon=5, size=(640, 480)) == (key, path)
+        assert Path(path).read_bytes() == b'cached'
+
+        other_keys = {
+            renderer.render(['Chad', 'Kenya'], horizon=5, size=(640, 480))[0],
+            renderer.render(['Kenya', 'Chad'], horizon=6, size=(640, 480))[0],
+            renderer.render(['Kenya', 'Chad'], horizon=5, size=(800, 480))[0]
+        }
+        assert key not in other_keys and len(other_keys) == 3
+
+        # A newly exported forest is a new data version
+        retrained = make_renderer(tmp, n_estimators=12)
+        assert retrained.render(['Kenya', 'Chad'], horizon=5, size=(640, 480))[0] != key
+
+        for bad in ([[], 5, (640, 480)], [['Kenya'], 5, (50, 50)], [['Kenya'] * 13, 5, (640, 480)]):
+            try:
+                renderer.render(*bad)
+                raise AssertionError(f"Expected {bad} to be rejected")
+            except ValueError:
+                pass
+
+        # Over the disk budget, older charts are evicted but the new one is kept
+        retrained.max_bytes = 1
+        _, newest = retrained.render(['Peru'], horizon=5, size=(640, 480))
+        assert [str(p) for p in Path(retrained.directory).glob('*.png')] == [newest]
+    print("✅ Charts are content-addressed")
+
+def test_render_many_in_pool():
+    """A batch renders each distinct chart once across worker processes, without pyplot"""
+    print("\n⚙️  Testing batch rendering...")
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = make_renderer(tmp)
+        requests = [(['Kenya'],), (['Chad', 'Peru'], 3), (['Kenya'],), (['Peru'], 8, (400, 300))]
+        results = renderer.render_many(requests, max_workers=2)
+
+        assert results[0] == results[2]
+        assert len(list(Path(renderer.directory).glob('*.png'))) == 3
+        assert png_size(results[3][1]) == (400, 300)
+        assert results[1] == renderer.render(['Chad', 'Peru'], 3)
+        assert 'matplotlib.pyplot' not in sys.modules
+    print("✅ Batch rendered in the pool")
+
+def test_served_with_cache_headers():
+    """The data server returns PNGs with ETags, 304s and immutable content-addressed URLs"""
+    print("\n🌐 Testing chart serving...")
+    import simple_server
+
+    with tempfile.TemporaryDirectory() as tmp:
+        simple_server._chart_renderer = make_renderer(tmp)
+        server = socketserver.TCPServer(('127.0.0.1', 0), simple_server.CO2DashboardHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            response = urllib.request.urlopen(f"{base_url}/api/chart?countries=Kenya,Peru&horizon=4&width=500&height=400")
+            etag = response.headers['ETag']
+            assert response.headers['Content-type'] == 'image/png'
+            assert response.headers['Cache-Control'] == 'public, max-age=300'
+            assert response.read()[:4] == b'\x89PNG'
+
+            request = urllib.request.Request(f"{base_url}/api/chart?countries=Kenya,Peru&horizon=4&width=500&height=400",
+                                             headers={'If-None-Match': etag})
+            try:
+                urllib.request.urlopen(request)
+                raise AssertionError("Expected 304 Not Modified")
+            except urllib.error.HTTPError as e:
+                assert e.code == 304
+
+            cached = urllib.request.urlopen(f"{base_url}/api/charts/{etag.strip(chr(34))}.png")
+            assert 'immutable' in cached.headers['Cache-Control']
+
+            for path, status in (("/api/charts/0123abcd.png", 404), ("/api/chart?countries=", 400)):
+                try:
+                    urllib.request.urlopen(base_url + path)
+                    raise AssertionError(f"Expected {status} for {path}")
+                except urllib.error.HTTPError as e:
+                    assert e.code == status, (path, e.code)
+                    assert 'error' in json.loads(e.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+            simple_server._chart_renderer = None
+    print("✅ Charts served with cache headers")
+
+def main():
+    """Main test function"""
+    print("🌍 Chart Renderer Test Suite")
+    print("=" * 50)
+
+    test_content_addressed_cache()
+    test_render_many_in_pool()
+    test_served_with_cache_headers()
+
+    print("\n🎉 All chart renderer tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
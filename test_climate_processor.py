@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Test script for the ClimateDataProcessor derivations
+Uses small in-memory CO2 fixtures so no dataset download is needed
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import climate_data_processor
+from climate_data_processor import ClimateDataProcessor
+
+def make_co2_data(countries, years):
+    """Build a minimal CO2 structure in the load_co2_data() format"""
+    return {
+        country: {"historical": [{"year": year, "co2": 1.0} for year in years]}
+        for country in countries
+    }
+
+def test_regional_temperature_derivation():
+    """Regional anomalies are the global series scaled by the region multiplier"""
+    print("\n🌡️ Testing regional temperature derivation...")
+    processor = ClimateDataProcessor()
+    co2_data = make_co2_data(["Norway", "Kenya", "Atlantis"], [1989, 1990, 2016])
+
+    temp_data = processor.generate_regional_temperature_data(co2_data)
+    global_temp = processor.load_temperature_data()["global_temperature_anomaly"]
+
+    assert set(temp_data) == {"Norway", "Kenya"}
+    norway = temp_data["Norway"]
+    assert norway["region"] == "Arctic"
+    assert [point["year"] for point in norway["historical"]] == [1990, 2016]
+    assert norway["historical"][1]["temperature_anomaly"] == round(global_temp[2016] * 2.0, 2)
+    print("✅ Regional temperature anomalies are correct")
+
+def test_regional_sea_level_derivation():
+    """Coastal rises only cover years present in the global sea level series"""
+    print("\n🌊 Testing regional sea level derivation...")
+    processor = ClimateDataProcessor()
+    co2_data = make_co2_data(["Japan", "Chad"], [1990, 1993, 2023])
+
+    sea_data = processor.generate_regional_sea_level_data(co2_data)
+
+    # Chad is landlocked, so it has no coastal region
+    assert list(sea_data) == ["Japan"]
+    japan = sea_data["Japan"]
+    assert japan["vulnerability_level"] == "High"
+    assert [point["year"] for point in japan["historical"]] == [1993, 2023]
+    assert japan["historical"][1]["sea_level_rise"] == round(94.9 * 1.5, 1)
+    print("✅ Regional sea level rises are correct")
+
+def test_memoized_products_track_dependencies():
+    """A new CO2 file version invalidates only the products derived from CO2"""
+    print("\n🗃️ Testing dependency-tracked memoization...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text("country,year,co2\nNorway,2016,40.0\nJapan,2016,1200.0\n", encoding='utf-8')
+        processor = ClimateDataProcessor(data_path=tmp)
+
+        first = processor.get_comprehensive_climate_data()
+        assert processor.get_comprehensive_climate_data() is first
+        global_temp = processor.load_temperature_data()
+
+        data_file.write_text("country,year,co2\nNorway,2016,40.0\nNorway,2017,41.0\n", encoding='utf-8')
+        os.utime(data_file, ns=(0, 0))
+        second = processor.get_comprehensive_climate_data()
+
+        assert second is not first
+        assert "Japan" not in second["sea_level_data"]
+        assert processor.load_temperature_data() is global_temp
+
+        products = processor.cache_stats()["products"]
+        assert products["regional_temperature"]["invalidations"] == 1
+        assert products["load_temperature_data"]["invalidations"] == 0
+        assert products["get_comprehensive_climate_data"]["hits"] == 1
+        print("✅ Only CO2-derived products were recomputed")
+
+def test_country_bundle_lru():
+    """Country bundles are derived per country and bounded by the LRU size"""
+    print("\n📦 Testing per-country bundles...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text(
+            "country,year,co2\nNorway,2016,40.0\nJapan,2016,1200.0\nChad,2016,1.5\n", encoding='utf-8'
+        )
+        processor = ClimateDataProcessor(data_path=tmp, bundle_cache_size=2)
+
+        japan = processor.get_country_bundle("Japan")
+        assert japan["co2"]["historical"][0]["co2"] == 1200.0
+        assert japan["temperature"]["region"] == "Asia"
+        assert japan["sea_level"]["coastal_region"] == "Pacific Islands"
+        assert processor.get_country_bundle("Chad")["sea_level"] is None
+        assert processor.get_country_bundle("Atlantis") is None
+
+        assert processor.get_country_bundle("Japan") is japan
+        processor.get_country_bundle("Norway")
+        stats = processor.cache_stats()["country_bundles"]
+        assert stats["size"] == 2 and stats["evictions"] == 1 and stats["hits"] == 1
+        print("✅ Country bundles are cached with an LRU bound")
+
+def test_region_rollups_from_membership_table():
+    """Aggregates are excluded by iso_code and regions are reduced per year"""
+    print("\n🗺️ Testing region rollups...")
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'owid-co2-data.csv').write_text(
+            "country,year,iso_code,co2\n"
+            "Kenya,2015,KEN,17.0\nKenya,2016,KEN,18.0\n"
+            "Nigeria,2016,NGA,120.0\n"
+            "Africa (GCP),2016,,1400.0\n"
+            "European Union (27),2016,OWID_EU27,2800.0\n",
+            encoding='utf-8'
+        )
+        processor = ClimateDataProcessor(data_path=tmp)
+
+        assert set(processor.load_co2_data()) == {"Kenya", "Nigeria"}
+
+        rollups = processor.get_region_rollups()
+        assert rollups["years"] == [2015, 2016]
+        africa = processor.get_region_rollup("Africa")
+        assert africa["countries"] == ["Kenya", "Nigeria"]
+        assert africa["co2"] == [17.0, 138.0]
+        assert africa["reporting_countries"] == [1, 2]
+        global_temp = processor.load_temperature_data()["global_temperature_anomaly"]
+        assert africa["temperature_anomaly"] == [round(global_temp[2015] * 0.9, 2), round(global_temp[2016] * 0.9, 2)]
+
+        indian_ocean = processor.get_region_rollup("Indian Ocean")
+        assert indian_ocean["countries"] == ["Kenya"]
+        assert processor.get_region_rollups() is rollups
+        print("✅ Region rollups are correct")
+
+NOAA_FIXTURE = """Global Land and Ocean Temperature Anomalies, January-December
+Units: Degrees Celsius
+Base Period: 1901-2000
+Missing: -999
+Year,Anomaly
+1992,0.23
+1993,0.24
+1994,-999
+1995,0.45
+"""
+
+NASA_FIXTURE = """HDR Global Mean Sea Level Data
+HDR column 3 = year+fraction of year
+HDR column 12 = smoothed GMSL (GIA applied) variation (mm)
+0 11 1993.0115 1 1 -38.0 1 -38.0 -38.0 1 -38.0 -37.0
+0 12 1993.5000 1 1 -38.0 1 -38.0 -38.0 1 -38.0 -35.0
+0 48 1994.0100 1 1 -30.0 1 -30.0 -30.0 1 -30.0 -33.0
+0 49 1994.5000 1 1 -30.0 1 -30.0 -30.0 1 -30.0 99900.000
+0 84 1995.0200 1 1 -30.0 1 -30.0 -30.0 1 -30.0 -30.0
+"""
+
+def test_local_file_loaders_and_snapshots():
+    """NOAA/NASA mirrors are parsed once, cached as .npz and joined on year"""
+    print("\n🛰️ Testing local temperature and sea level loaders...")
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'noaa_global_temperature_anomaly.csv').write_text(NOAA_FIXTURE, encoding='utf-8')
+        (Path(tmp) / 'nasa_gmsl.txt').write_text(NASA_FIXTURE, encoding='utf-8')
+        processor = ClimateDataProcessor(data_path=tmp)
+
+        temperature = processor.load_temperature_data()
+        assert temperature["global_temperature_anomaly"] == {1992: 0.23, 1993: 0.24, 1995: 0.45}
+        assert temperature["baseline"] == "1901-2000 average"
+
+        sea_level = processor.load_sea_level_data()
+        # Annual means -36.0 (1993), -33.0 (1994, fill value skipped), -30.0 (1995), rebased to 1993
+        assert sea_level["global_mean_sea_level_rise"] == {1993: 0.0, 1994: 3.0, 1995: 6.0}
+        assert sea_level["baseline_year"] == 1993
+
+        snapshots = sorted(os.listdir(Path(tmp) / 'cache'))
+        assert len(snapshots) == 2 and all(name.endswith('.npz') for name in snapshots)
+
+        # A fresh processor reads the binary snapshots without reparsing
+        def fail_parse(path):
+            raise AssertionError(f"unexpected reparse of {path}")
+
+        original_parse = climate_data_processor.parse_noaa_temperature_csv
+        climate_data_processor.parse_noaa_temperature_csv = fail_parse
+        try:
+            reloaded = ClimateDataProcessor(data_path=tmp)
+            assert reloaded.load_temperature_data() == temperature
+        finally:
+            climate_data_processor.parse_noaa_temperature_csv = original_parse
+        assert sorted(os.listdir(Path(tmp) / 'cache')) == snapshots
+
+        joined = processor.get_global_climate_series()
+        assert joined["years"] == [1992, 1993, 1994, 1995]
+        assert joined["temperature_anomaly"] == [0.23, 0.24, None, 0.45]
+        assert joined["sea_level_rise"] == [None, 0.0, 3.0, 6.0]
+        print("✅ Local loaders, snapshots and year alignment work")
+
+def test_resampled_granularities():
+    """Sub-annual views aggregate dense data, interpolate sparse data and are cached"""
+    print("\n🗓️ Testing granularity resampling...")
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'nasa_gmsl.txt').write_text(NASA_FIXTURE, encoding='utf-8')
+        (Path(tmp) / 'owid-co2-data.csv').write_text("country,year,co2\nJapan,2016,1200.0\nChad,2016,1.5\n", encoding='utf-8')
+        processor = ClimateDataProcessor(data_path=tmp)
+
+        # ~Half-yearly samples: the two 1993 samples fall in Q1 and Q3, Q2 is interpolated
+        quarterly = processor.get_resampled_series("sea_level", "quarterly")
+        assert quarterly["periods"][:4] == ["1993-Q1", "1993-Q2", "1993-Q3", "1993-Q4"]
+        assert quarterly["values"][0] == -1.0 and quarterly["values"][2] == 1.0
+        assert quarterly["interpolated"][1] and not quarterly["interpolated"][2]
+        annual = processor.get_resampled_series("sea_level", "annual")
+        assert annual["values"].tolist() == [0.0, 3.0, 6.0]
+        assert processor.get_resampled_series("sea_level", "quarterly") is quarterly
+
+        regional = processor.get_regional_resampled_series("sea_level", "annual")
+        assert list(regional["countries"]) == ["Japan"]
+        assert regional["countries"]["Japan"] == [0.0, 4.5, 9.0]
+
+        # Built-in annual temperatures upsample to monthly between mid-year points
+        monthly = processor.get_resampled_series("temperature", "monthly")
+        global_temp = processor.load_temperature_data()["global_temperature_anomaly"]
+        july_1990 = monthly["periods"].index("1990-07")
+        assert monthly["values"][july_1990] == global_temp[1990]
+        assert len(monthly["periods"]) == 12 * len(global_temp)
+        print("✅ Granularity views are correct")
+
+def test_temperature_ensemble_is_reproducible():
+    """Seeded ensembles are identical and the bands are ordered"""
+    print("\n🎲 Testing temperature ensemble generation...")
+    processor = ClimateDataProcessor()
+
+    ensemble = processor.generate_temperature_ensemble(n_realizations=500, seed=7)
+    assert ensemble == processor.generate_temperature_ensemble(n_realizations=500, seed=7)
+    assert ensemble["years"][0] == 1990 and ensemble["years"][-1] == 2023
+
+    low, mid, high = (ensemble["percentiles"][key] for key in ("p5", "p50", "p95"))
+    assert all(l <= m <= h for l, m, h in zip(low, mid, high))
+    # The 1998 El Niño bump (+0.15°C) dominates the ±0.1°C noise
+    index_1998 = ensemble["years"].index(1998)
+    assert ensemble["mean"][index_1998] > ensemble["mean"][index_1998 + 1]
+
+    series = processor.generate_temperature_data(seed=7)
+    assert len(series) == 34 and series[0]["type"] == "global"
+    print("✅ Ensemble is seeded and well-formed")
+
+def main():
+    """Main test function"""
+    print("🌍 Climate Processor Test Suite")
+    print("=" * 50)
+
+    test_regional_temperature_derivation()
+    test_regional_sea_level_derivation()
+    test_memoized_products_track_dependencies()
+    test_country_bundle_lru()
+    test_region_rollups_from_membership_table()
+    test_local_file_loaders_and_snapshots()
+    test_resampled_granularities()
+    test_temperature_ensemble_is_reproducible()
+
+    print("\n🎉 All climate processor tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-encoded dataset snapshot
+Checks that assembled API responses match the plain json.dumps output
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import data_processor
+
+SAMPLE_CSV = """country,year,iso_code,population,co2,primary_energy_consumption
+Kenya,2000,KEN,30.7,8.5,15.2
+Kenya,2001,KEN,31.5,9.1,
+Kenya,2002,KEN,32.3,9.8,16.0
+Kenya,2003,KEN,33.1,10.2,16.4
+Kenya,2004,KEN,34.0,11.0,17.1
+Kenya,2005,KEN,35.1,12.3,18.7
+Chad,2000,TCD,8.3,,
+Chad,2001,TCD,8.6,0.5,
+World,2000,OWID_WRL,6100.0,25000.0,110000.0
+World,2001,OWID_WRL,6180.0,25500.0,111000.0
+"""
+
+def write_sample_csv(directory):
+    """Write the fixture dataset and return its path"""
+    path = Path(directory) / 'owid-co2-data.csv'
+    path.write_text(SAMPLE_CSV, encoding='utf-8')
+    return str(path)
+
+def test_simple_response_matches_major_countries():
+    """The full 'simple' response is the encoded get_major_countries_data() payload"""
+    print("\n📦 Testing simple response assembly...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_sample_csv(tmp)
+        snapshot = data_processor.get_dataset_snapshot(data_file)
+
+        body = b''.join(snapshot.response_chunks('simple'))
+        expected = data_processor._filter_major_countries(data_processor.load_co2_data(data_file))
+        assert json.loads(body) == expected
+        assert json.loads(body)['countries'] == ['Kenya']
+        print("✅ Simple response matches the loader output")
+
+def test_web_response_subset():
+    """Country subsets are assembled from fragments, including aggregates in the 'web' view"""
+    print("\n📦 Testing web response subsets...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_sample_csv(tmp)
+        snapshot = data_processor.get_dataset_snapshot(data_file)
+
+        body = json.loads(b''.join(snapshot.response_chunks('web', ['World', 'Chad', 'Unknown'])))
+        assert body['countries'] == ['Chad', 'World']
+        assert body['years'] == [2000, 2001]
+        assert body['data']['Chad']['historical'] == [
+            {'year': 2001, 'co2': 0.5, 'population': 8.6, 'energy': 0}
+        ]
+
+        try:
+            snapshot.response_chunks('pandas')
+            raise AssertionError("Expected an unknown response format to be rejected")
+        except ValueError as e:
+            assert 'simple, web' in str(e)
+        print("✅ Web subset response is correct")
+
+def test_snapshot_reused_until_file_changes():
+    """The snapshot is cached per file version"""
+    print("\n📦 Testing snapshot versioning...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_sample_csv(tmp)
+        first = data_processor.get_dataset_snapshot(data_file)
+        assert data_processor.get_dataset_snapshot(data_file) is first
+
+        with open(data_file, 'a', encoding='utf-8') as f:
+            f.write("Kenya,2006,KEN,36.0,13.0,19.0\n")
+        second = data_processor.get_dataset_snapshot(data_file)
+        assert second is not first
+        assert 2006 in json.loads(b''.join(second.response_chunks('simple')))['years']
+        print("✅ Snapshot rebuilt after the data file changed")
+
+def test_statistics_catalog_collected_at_ingest():
+    """The snapshot carries per-column and per-country statistics from the ingest pass"""
+    print("\n📊 Testing the statistics catalog...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_sample_csv(tmp)
+        snapshot = data_processor.get_dataset_snapshot(data_file)
+
+        catalog = json.loads(b''.join(snapshot.statistics_chunks()))
+        assert catalog == snapshot.statistics
+        # Every country row is cataloged, including Chad's 2000 row without emissions
+        assert catalog["countries"] == 2 and catalog["rows"] == 8
+        assert catalog["year_range"] == [2000, 2005]
+        assert catalog["columns"]["co2"]["null_rate"] == round(1 / 8, 4)
+        assert catalog["columns"]["population"]["count"] == 8
+
+        kenya = json.loads(b''.join(snapshot.statistics_chunks('Kenya')))
+        assert kenya["years"] == 6 and kenya["year_range"] == [2000, 2005]
+        assert kenya["columns"]["co2"]["min"] == 8.5
+        assert kenya["columns"]["co2"]["max"] == 12.3
+        assert kenya["columns"]["co2"]["latest"] == {"year": 2005, "value": 12.3}
+        assert kenya["columns"]["energy"]["null_rate"] == round(1 / 6, 4)
+        chad = json.loads(b''.join(snapshot.statistics_chunks('Chad')))
+        assert chad["columns"]["co2"]["null_rate"] == 0.5 and chad["columns"]["co2"]["count"] == 1
+        assert snapshot.statistics_chunks('World') is None
+        print("✅ Statistics catalog is correct")
+
+def main():
+    """Main test function"""
+    print("🌍 Dataset Snapshot Test Suite")
+    print("=" * 50)
+
+    test_simple_response_matches_major_countries()
+    test_web_response_subset()
+    test_snapshot_reused_until_file_changes()
+    test_statistics_catalog_collected_at_ingest()
+
+    print("\n🎉 All dataset snapshot tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the precomputed feature store
+Builds stores from a small CSV into a temporary directory
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from feature_store import get_feature_store, prune_feature_stores
+
+SAMPLE_CSV = """country,year,iso_code,population,gdp,co2,primary_energy_consumption,energy_per_capita
+Kenya,2001,KEN,31.0,,11.0,16.0,500.0
+Kenya,2000,KEN,30.0,100.0,10.0,,480.0
+Kenya,2002,KEN,32.0,120.0,,18.0,520.0
+Chad,2000,TCD,8.0,,1.0,,
+World,2000,OWID_WRL,6100.0,5000.0,25000.0,110000.0,18000.0
+"""
+
+def test_imputed_lagged_and_growth_features():
+    """Missing values are interpolated per country, else the column mean; lags follow the year order"""
+    print("\n🧮 Testing feature computation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text(SAMPLE_CSV, encoding='utf-8')
+        store = get_feature_store(str(data_file), Path(tmp) / 'features')
+
+        assert isinstance(store.matrix, np.memmap)
+        assert store.countries == ['Chad', 'Kenya', 'World']
+        assert store.is_aggregate('World') and not store.is_aggregate('Chad')
+
+        kenya = store.select(['Kenya'])
+        assert store.column('year', kenya).tolist() == [2000, 2001, 2002]
+        assert store.column('gdp', kenya).tolist() == [100.0, 110.0, 120.0]
+        assert store.column('gdp_imputed', kenya).tolist() == [0.0, 1.0, 0.0]
+        assert store.column('co2', kenya).tolist() == [10.0, 11.0, 12.0]
+        assert store.column('primary_energy_consumption', kenya).tolist() == [14.0, 16.0, 18.0]
+        assert np.isnan(store.column('co2_lag1', kenya)[0])
+        assert store.column('co2_lag1', kenya)[1:].tolist() == [10.0, 11.0]
+        assert np.isclose(store.column('co2_growth', kenya)[1], 0.1)
+
+        # Chad has no GDP at all, so the global mean is used
+        chad = store.select(['Chad'])
+        assert store.column('gdp', chad).tolist() == [(100.0 + 120.0 + 5000.0) / 3]
+        print("✅ Features are imputed, lagged and differenced")
+
+def test_selection_and_versioning():
+    """Rows are selected by country and year, and the store is rebuilt per file version"""
+    print("\n🗄️ Testing feature store selection and versioning...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text(SAMPLE_CSV, encoding='utf-8')
+        features_dir = Path(tmp) / 'features'
+        store = get_feature_store(str(data_file), features_dir)
+        assert get_feature_store(str(data_file), features_dir) is store
+
+        assert store.features(['year', 'co2'], store.select(['Kenya', 'Atlantis'], 2001, 2001)).tolist() == [[2001.0, 11.0]]
+        found, rows = store.latest_rows(['World', 'Kenya', 'Atlantis'], end_year=2001)
+        assert found == ['World', 'Kenya']
+        assert store.column('year', rows).tolist() == [2000, 2001]
+
+        manifest = json.loads((Path(store.directory) / 'manifest.json').read_text(encoding='utf-8'))
+        assert manifest["columns"] == store.columns and manifest["shape"] == list(store.matrix.shape)
+
+        with open(data_file, 'a', encoding='utf-8') as f:
+            f.write("Kenya,2003,KEN,33.0,130.0,12.0,19.0,540.0\n")
+        rebuilt = get_feature_store(str(data_file), features_dir)
+        assert rebuilt is not store and rebuilt.matrix.shape[0] == 6
+
+        # The old version is kept while it is open, and stores of other files are never pruned
+        old_directory = store.directory
+        other_file = Path(tmp) / 'other.csv'
+        other_file.write_text(SAMPLE_CSV, encoding='utf-8')
+        other = get_feature_store(str(other_file), features_dir)
+        assert os.path.isdir(old_directory) and os.path.isdir(rebuilt.directory)
+        del store
+        assert prune_feature_stores(str(data_file), features_dir, keep=os.path.basename(rebuilt.directory)) == [old_directory]
+        assert sorted(os.listdir(features_dir)) == sorted([os.path.basename(rebuilt.directory),
+                                                           os.path.basename(other.directory)])
+        print("✅ Selection and versioning work")
+
+def main():
+    """Main test function"""
+    print("🌍 Feature Store Test Suite")
+    print("=" * 50)
+
+    test_imputed_lagged_and_growth_features()
+    test_selection_and_versioning()
+
+    print("\n🎉 All feature store tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
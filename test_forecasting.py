@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched forecaster
+Compares batched predictions against the original per-year loop
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from forecasting import batch_forecast, forecast_intervals
+
+FEATURES = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+
+class CountingForest(RandomForestRegressor):
+    """Random Forest that counts predict calls"""
+
+    def predict(self, X):
+        self.predict_calls = getattr(self, 'predict_calls', 0) + 1
+        return super().predict(X)
+
+def make_frame(n_countries, years=range(2000, 2010)):
+    """Synthetic per-country rows with growing features"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for index in range(n_countries):
+        scale = 1.0 + index
+        for year in years:
+            growth = 1.03 ** (year - 2000)
+            rows.append({
+                'country': f"Country {index}",
+                'year': year,
+                'gdp': 1e9 * scale * growth,
+                'population': 1e6 * scale * growth,
+                'primary_energy_consumption': 50.0 * scale * growth,
+                'energy_per_capita': 5000.0 * growth,
+                'co2': 10.0 * scale * growth + rng.normal()
+            })
+    return pd.DataFrame(rows)
+
+def latest_feature_rows(df, country_column, features, countries):
+    """Last row in file order per requested country, as (found countries, feature matrix)"""
+    latest = df[df[country_column].isin(countries)].drop_duplicates(country_column, keep='last')
+    latest = latest.set_index(country_column)
+    found = [country for country in countries if country in latest.index]
+    return found, latest.loc[found, features].to_numpy(dtype=float)
+
+def loop_forecast(model, latest, start_year, end_year):
+    """The original per-year predict loop"""
+    predictions = []
+    for year in range(start_year, end_year + 1):
+        gdp = latest['gdp'] * (1.02 ** (year - latest['year']))
+        population = latest['population'] * (1.01 ** (year - latest['year']))
+        energy_use = latest['primary_energy_consumption'] * (1.02 ** (year - latest['year']))
+        energy_per_capita = latest['energy_per_capita'] * (1.05 ** (year - latest['year']))
+        row = pd.DataFrame([[year, gdp, population, energy_use, energy_per_capita]], columns=FEATURES)
+        predictions.append(model.predict(row)[0])
+        latest = {'year': year, 'gdp': gdp, 'population': population,
+                  'primary_energy_consumption': energy_use, 'energy_per_capita': energy_per_capita}
+    return predictions
+
+def test_batch_matches_per_year_loop():
+    """Batched predictions equal the per-year loop"""
+    print("\n📈 Testing batched forecasts against the per-year loop...")
+    df = make_frame(3)
+    model = RandomForestRegressor(n_estimators=10, random_state=42).fit(df[FEATURES], df['co2'])
+
+    found, latest = latest_feature_rows(df, 'country', FEATURES, ['Country 2', 'Missing', 'Country 0'])
+    assert found == ['Country 2', 'Country 0']
+    predictions = batch_forecast(model, latest, np.arange(2010, 2016))
+
+    for row, country in enumerate(found):
+        expected = loop_forecast(model, df[df['country'] == country].iloc[-1], 2010, 2015)
+        assert np.allclose(predictions[row], expected)
+    print("✅ Batched forecasts match")
+
+def test_single_predict_call():
+    """250 countries x 20 years are forecast with one predict call"""
+    print("\n⚡ Testing a single model invocation...")
+    df = make_frame(250, years=range(2005, 2010))
+    model = CountingForest(n_estimators=5, random_state=42).fit(df[FEATURES], df['co2'])
+
+    countries = sorted(df['country'].unique())
+    found, latest = latest_feature_rows(df, 'country', FEATURES, countries)
+    predictions = batch_forecast(model, latest, np.arange(2010, 2030))
+
+    assert predictions.shape == (250, 20)
+    assert model.predict_calls == 1
+    print("✅ One predict call for the whole grid")
+
+def test_prediction_intervals_from_trees():
+    """Bands come from the per-tree distribution and widen with the confidence level"""
+    print("\n📏 Testing prediction intervals...")
+    df = make_frame(5)
+    model = RandomForestRegressor(n_estimators=30, random_state=42).fit(df[FEATURES].to_numpy(), df['co2'])
+    found, latest = latest_feature_rows(df, 'country', FEATURES, sorted(df['country'].unique()))
+    years = np.arange(2010, 2015)
+
+    mean, lower, upper = forecast_intervals(model, latest, years, confidence_level=0.95)
+    assert np.array_equal(mean, batch_forecast(model, latest, years))
+
+    rows = np.column_stack([years, latest[0, 1:] * np.array([1.02, 1.01, 1.02, 1.05]) ** (years[:, None] - latest[0, 0])])
+    per_tree = np.stack([tree.predict(rows) for tree in model.estimators_], axis=1)
+    assert np.allclose(lower[0], np.quantile(per_tree, 0.025, axis=1))
+    assert np.allclose(upper[0], np.quantile(per_tree, 0.975, axis=1))
+
+    _, narrow_lower, narrow_upper = forecast_intervals(model, latest, years, confidence_level=0.5)
+    assert np.all(narrow_lower >= lower) and np.all(narrow_upper <= upper)
+    print("✅ Intervals match the per-tree quantiles")
+
+def main():
+    """Main test function"""
+    print("🌍 Forecasting Test Suite")
+    print("=" * 50)
+
+    test_batch_matches_per_year_loop()
+    test_single_predict_call()
+    test_prediction_intervals_from_trees()
+
+    print("\n🎉 All forecasting tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact random forest evaluator
+Checks exported forests reproduce scikit-learn predictions exactly
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from forest_export import CompactForest, export_forest
+
+def make_forest(with_missing=False):
+    """A small forest on noisy synthetic data"""
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(300, 5)) * [1.0, 1e9, 1e6, 10.0, 1e3]
+    y = X[:, 0] * 2.0 + X[:, 3] + rng.normal(size=300)
+    if with_missing:
+        X[::7, 2] = np.nan
+    return RandomForestRegressor(n_estimators=25, random_state=0).fit(X, y), X
+
+def test_identical_predictions():
+    """Packed forests predict exactly what scikit-learn predicts, including missing values"""
+    print("\n🌲 Testing compact forest predictions...")
+    for with_missing in (False, True):
+        model, X = make_forest(with_missing)
+        compact = CompactForest.from_model(model)
+        assert np.array_equal(compact.predict(X), model.predict(X))
+        assert np.array_equal(compact.predict(X[:1]), model.predict(X[:1]))
+    print("✅ Predictions are identical")
+
+def test_mmap_load_without_sklearn():
+    """Exported forests load memory-mapped in a process that never imports scikit-learn"""
+    print("\n📦 Testing exported forest loading...")
+    model, X = make_forest()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = export_forest(model, Path(tmp) / 'forest')
+        np.save(Path(tmp) / 'X.npy', X)
+
+        script = (
+            "import sys, numpy as np\n"
+            f"sys.path.insert(0, {str(Path(__file__).parent / 'src')!r})\n"
+            "from forest_export import CompactForest\n"
+            f"forest = CompactForest.load({str(directory)!r})\n"
+            "assert isinstance(forest.value, np.memmap)\n"
+            f"np.save({str(Path(tmp) / 'out.npy')!r}, forest.predict(np.load({str(Path(tmp) / 'X.npy')!r})))\n"
+            "assert 'sklearn' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True)
+        assert np.array_equal(np.load(Path(tmp) / 'out.npy'), model.predict(X))
+        print("✅ Exported forest serves without scikit-learn")
+
+def main():
+    """Main test function"""
+    print("🌍 Forest Export Test Suite")
+    print("=" * 50)
+
+    test_identical_predictions()
+    test_mmap_load_without_sklearn()
+
+    print("\n🎉 All forest export tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the hyperparameter search
+Runs a small successive-halving search on synthetic exponential series
+"""
+
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import backtesting
+from backtesting import BacktestData
+from hyperparameter_search import pareto_frontier, run_search, sample_candidates, successive_halving
+from serving_config import DEFAULT_SERVING_CONFIG, load_serving_config
+
+def make_data():
+    """Three countries with exact exponential CO2 growth"""
+    countries, years, rows, targets = [], [], [], []
+    for country, rate in (('Kenya', 1.05), ('Chad', 1.02), ('Peru', 0.99)):
+        for year in range(1990, 2021):
+            countries.append(country)
+            years.append(year)
+            rows.append([year, 1e9 * 1.02 ** (year - 1990), 1e6, 10.0, 1000.0])
+            targets.append(10.0 * rate ** (year - 1990))
+    return BacktestData(countries, years, rows, targets)
+
+def test_successive_halving_search():
+    """Rungs shrink the candidate pool, the best configuration reaches the serving config"""
+    print("\n🔎 Testing successive halving...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = str(Path(tmp) / 'serving.json')
+        results_file = str(Path(tmp) / 'tuning.json')
+        results = run_search(make_data(), range(2000, 2016), horizon=3, budget_seconds=120, n_candidates=6,
+                             max_workers=2, config_file=config_file, results_file=results_file)
+
+        trials = results["trials"]
+        rungs = sorted({trial["rung"] for trial in trials})
+        per_rung = [sum(trial["rung"] == rung for trial in trials) for rung in rungs]
+        assert per_rung == sorted(per_rung, reverse=True) and per_rung[-1] < per_rung[0]
+        assert max(trial["folds"] for trial in trials) == 16
+
+        # Exact exponential series are fitted best by the undamped trend
+        assert results["models"]["trend"]["params"]["damping"] == 1.0
+        assert results["models"]["random_forest"]["folds"] == 16
+        assert json.loads(Path(results_file).read_text(encoding='utf-8')) == results
+
+        served = load_serving_config(config_file)
+        assert served["trend"] == results["models"]["trend"]["params"]
+        assert served["random_forest"] == results["models"]["random_forest"]["params"]
+    print("✅ Best configuration written to the serving config")
+
+def test_exhausted_budget_keeps_current_config():
+    """With no time for a single rung the served parameters stay as they were"""
+    print("\n⏱️  Testing the wall-clock budget...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = str(Path(tmp) / 'serving.json')
+        results = run_search(make_data(), range(2000, 2016), horizon=3, budget_seconds=0, n_candidates=4,
+                             max_workers=1, config_file=config_file)
+        assert results["trials"] == []
+        assert load_serving_config(config_file) == DEFAULT_SERVING_CONFIG
+    print("✅ Budget respected")
+
+class SlowModel:
+    """Model whose fit outlasts any test budget"""
+
+    def __init__(self, seconds=60):
+        self.seconds = seconds
+
+    def fit(self, X, y):
+        time.sleep(self.seconds)
+        return self
+
+def test_budget_kills_running_folds():
+    """Folds still running at the deadline are killed, so the search returns within the budget"""
+    print("\n🪓 Testing the hard budget...")
+    backtesting.MODEL_FACTORIES["slow"] = SlowModel
+    try:
+        start = time.perf_counter()
+        trials = successive_halving(make_data(), range(2010, 2016), [("slow", {}), ("trend", {})],
+                                    horizon=3, budget_seconds=2, max_workers=2)
+        elapsed = time.perf_counter() - start
+    finally:
+        del backtesting.MODEL_FACTORIES["slow"]
+    assert elapsed < 8, f"Search took {elapsed:.1f}s on a 2s budget"
+    # No worker is left running the slow fold (the interpreter would wait for it at exit)
+    assert not multiprocessing.active_children()
+    assert all(trial["model"] == "trend" for trial in trials)
+    print(f"✅ Search stopped after {elapsed:.1f}s")
+
+def test_candidates_and_frontier():
+    """Current parameters are always candidates; the frontier is non-dominated"""
+    print("\n📐 Testing candidates and the accuracy/latency frontier...")
+    candidates = sample_candidates(5, current=DEFAULT_SERVING_CONFIG)
+    assert ('random_forest', DEFAULT_SERVING_CONFIG['random_forest']) in candidates
+    assert sum(family == 'random_forest' for family, _ in candidates) <= 6
+
+    rng = np.random.default_rng(0)
+    trials = [{"mape": float(mape), "mae": 0.0, "predict_ms": float(ms)}
+              for mape, ms in zip(rng.uniform(1, 10, 50), rng.uniform(1, 100, 50))]
+    frontier = pareto_frontier(trials)
+    for trial in trials:
+        assert any(point["mape"] <= trial["mape"] and point["predict_ms"] <= trial["predict_ms"] for point in frontier)
+    assert all(a["mape"] > b["mape"] for a, b in zip(frontier, frontier[1:]))
+    print("✅ Frontier holds only non-dominated trials")
+
+def main():
+    """Main test function"""
+    print("🌍 Hyperparameter Search Test Suite")
+    print("=" * 50)
+
+    test_successive_halving_search()
+    test_exhausted_budget_keeps_current_config()
+    test_budget_kills_running_folds()
+    test_candidates_and_frontier()
+
+    print("\n🎉 All hyperparameter search tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
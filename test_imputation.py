@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the gap imputation engine
+Checks the vectorized interpolation against a per-country reference
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import feature_store
+from imputation import impute_rows, interpolate_grid
+
+def reference_series(years, values):
+    """Per-series loop: np.interp inside, linear extrapolation from the two nearest observations outside"""
+    known = ~np.isnan(values)
+    x, y = years[known], values[known]
+    if x.size == 1:
+        return np.full(years.shape, y[0])
+    filled = np.interp(years, x, y)
+    before, after = years < x[0], years > x[-1]
+    filled[before] = y[0] + (y[1] - y[0]) / (x[1] - x[0]) * (years[before] - x[0])
+    filled[after] = y[-1] + (y[-1] - y[-2]) / (x[-1] - x[-2]) * (years[after] - x[-1])
+    return np.where(known, values, filled)
+
+def test_matches_per_country_reference():
+    """Interior gaps are interpolated and ends extrapolated exactly like the per-country loop"""
+    print("\n📈 Testing interpolation against the reference...")
+    rng = np.random.default_rng(0)
+    years = np.array([1990, 1991, 1993, 1994, 1995, 1998, 2000, 2001], dtype=float)
+    grid = rng.uniform(10, 100, size=(30, years.size, 3))
+    grid[rng.random(grid.shape) < 0.4] = np.nan
+    # Keep at least two observations in every series
+    grid[:, 2] = 50.0
+    grid[:, 5] = 60.0
+
+    filled, mask = interpolate_grid(grid, years, lower=None)
+    assert np.array_equal(mask, np.isnan(grid))
+    for country in range(grid.shape[0]):
+        for column in range(grid.shape[2]):
+            expected = reference_series(years, grid[country, :, column])
+            assert np.allclose(filled[country, :, column], expected), (country, column)
+    print("✅ Vectorized interpolation matches the reference")
+
+def test_sparse_series_and_row_layout():
+    """Single observations are carried, empty series use the column mean, values stay non-negative"""
+    print("\n🕳️  Testing sparse series...")
+    codes = [0, 0, 0, 1, 1, 2]
+    years = [2000, 2001, 2002, 2000, 2002, 2001]
+    values = np.array([
+        [10.0, np.nan],
+        [4.0, np.nan],
+        [np.nan, 7.0],
+        [np.nan, np.nan],
+        [np.nan, 3.0],
+        [2.0, np.nan]
+    ])
+    imputed, mask = impute_rows(codes, years, values)
+    assert np.array_equal(mask, np.isnan(values))
+    # Country 0: extrapolated downward trend is clipped at zero; single GDP observation is carried back
+    assert imputed[:, 0].tolist()[:3] == [10.0, 4.0, 0.0]
+    assert imputed[:3, 1].tolist() == [7.0, 7.0, 7.0]
+    # Country 1 has no first-column values: the mean of all observed cells
+    assert imputed[3, 0] == imputed[4, 0] == (10.0 + 4.0 + 2.0) / 3
+    assert imputed[3, 1] == 3.0 and imputed[5, 1] == (7.0 + 3.0) / 2
+
+    unbounded, _ = impute_rows(codes, years, values, lower=None)
+    assert unbounded[2, 0] == -2.0
+    print("✅ Sparse series are handled")
+
+def test_full_grid_once_per_dataset_version():
+    """A country x year grid of OWID size imputes quickly, once per feature store build"""
+    print("\n⚡ Testing the dataset-sized grid...")
+    rng = np.random.default_rng(1)
+    n_countries, n_years = 250, 274
+    codes = np.repeat(np.arange(n_countries), n_years)
+    years = np.tile(np.arange(1750, 1750 + n_years), n_countries)
+    values = rng.uniform(1, 100, size=(codes.size, 5))
+    values[rng.random(values.shape) < 0.5] = np.nan
+
+    start = time.perf_counter()
+    imputed, mask = impute_rows(codes, years, values, n_countries)
+    elapsed = time.perf_counter() - start
+    assert not np.isnan(imputed).any() and mask.sum() == np.isnan(values).sum()
+    assert elapsed < 2.0, f"Imputation took {elapsed:.2f}s"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text("country,year,population,gdp,co2,primary_energy_consumption,energy_per_capita\n"
+                             "Kenya,2000,30,100,10,,480\nKenya,2002,32,,14,18,520\n", encoding='utf-8')
+        store = feature_store.get_feature_store(str(data_file), Path(tmp) / 'features')
+        manifest = json.loads((Path(store.directory) / 'manifest.json').read_text(encoding='utf-8'))
+        assert manifest["imputation"]["cells"] == {'co2': 0, 'gdp': 1, 'population': 0,
+                                                   'primary_energy_consumption': 1, 'energy_per_capita': 0}
+        assert store.column('gdp').tolist() == [100.0, 100.0]
+
+        # Another imputation method is another store
+        method = feature_store.IMPUTATION_METHOD
+        feature_store.IMPUTATION_METHOD = method + '-changed'
+        try:
+            rebuilt = feature_store.FeatureStore(feature_store.build_feature_store(str(data_file), store.version,
+                                                                                   Path(tmp) / 'features'))
+            assert rebuilt.directory != store.directory
+        finally:
+            feature_store.IMPUTATION_METHOD = method
+    print(f"✅ {codes.size} rows imputed in {elapsed * 1000:.1f} ms")
+
+def main():
+    """Main test function"""
+    print("🌍 Imputation Test Suite")
+    print("=" * 50)
+
+    test_matches_per_country_reference()
+    test_sparse_series_and_row_layout()
+    test_full_grid_once_per_dataset_version()
+
+    print("\n🎉 All imputation tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+Checks claiming, worker execution and the Flask job endpoints
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from job_queue import JobQueue, JobWorkerPool
+
+def wait_for(predicate, timeout=30):
+    """Poll until predicate() is truthy"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.05)
+    raise AssertionError("Timed out waiting for job")
+
+def test_jobs_are_claimed_once():
+    """Concurrent claimers split the queue without running a job twice"""
+    print("\n🔒 Testing atomic job claims...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'))
+        submitted = {queue.submit('forecast', {'index': index}) for index in range(40)}
+
+        claimed = []
+        def claim_all():
+            while (job := queue.claim()) is not None:
+                claimed.append(job['id'])
+        threads = [threading.Thread(target=claim_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(submitted)
+        assert queue.counts() == {'queued': 0, 'running': 40, 'done': 0, 'failed': 0}
+    print("✅ Every job claimed exactly once")
+
+def test_worker_pool_runs_jobs():
+    """Workers store results, record failures and reclaim jobs whose lease expired"""
+    print("\n⚙️  Testing the worker pool...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'))
+        finished = []
+        def square(payload):
+            if payload['value'] < 0:
+                raise ValueError("negative value")
+            return {'square': payload['value'] ** 2}
+
+        stale = queue.submit('square', {'value': 2})
+        assert queue.claim('dead-worker', lease=-1)['id'] == stale
+        assert not queue.renew(stale, 'other-worker')
+
+        pool = JobWorkerPool(queue, workers=2, handlers={'square': square}, on_complete=finished.append).start()
+        try:
+            good = queue.submit('square', {'value': 3})
+            bad = queue.submit('square', {'value': -1})
+            unknown = queue.submit('cube', {'value': 3})
+            pool.wake()
+            wait_for(lambda: len(finished) == 4)
+        finally:
+            pool.stop()
+
+        assert queue.get(stale)['result'] == {'square': 4}
+        assert queue.get(good)['status'] == 'done' and queue.get(good)['result'] == {'square': 9}
+        assert queue.get(bad)['status'] == 'failed' and 'negative' in queue.get(bad)['error']
+        assert 'Unknown job kind' in queue.get(unknown)['error']
+        assert not queue.complete(stale, {'square': 0}, worker='dead-worker')
+        assert queue.get(stale)['result'] == {'square': 4}
+    print("✅ Results, failures and expired leases handled")
+
+def test_heartbeat_keeps_long_jobs_leased():
+    """A job running longer than its lease is renewed and never claimed by a second worker"""
+    print("\n💓 Testing lease heartbeats...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'))
+        runs = []
+        def slow(payload):
+            runs.append(payload)
+            time.sleep(1.0)
+            return {'ok': True}
+
+        job_id = queue.submit('slow')
+        pool = JobWorkerPool(queue, workers=1, handlers={'slow': slow}, lease=0.3)
+        runner = threading.Thread(target=pool.run_one)
+        runner.start()
+        wait_for(lambda: runs)
+        for _ in range(5):
+            time.sleep(0.15)
+            assert queue.claim('second-worker') is None
+        runner.join()
+        assert len(runs) == 1 and queue.get(job_id)['status'] == 'done'
+    print("✅ Running jobs keep their lease")
+
+def test_flask_job_endpoints():
+    """POST /api/jobs returns a job ID at once; polling yields the result, also saved on the analysis"""
+    print("\n🌐 Testing the Flask job endpoints...")
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'users.db')}"
+        os.environ['JOB_DATABASE'] = os.path.join(directory, 'jobs.db')
+        import simple_auth_app as auth  # creates the demo users
+
+        # Jobs run in the standalone worker processes, not in the app
+        worker = subprocess.Popen([sys.executable, str(Path(__file__).parent / 'src' / 'job_queue.py'),
+                                   '--workers', '1'], start_new_session=True)
+        try:
+            client = auth.app.test_client()
+            client.post('/login', data={'username': 'user', 'password': 'user123'})
+
+            response = client.post('/api/jobs', json={
+                'title': 'Kenya outlook',
+                'countries': ['Kenya', 'World'],
+                'parameters': {'method': 'damped'}
+            })
+            assert response.status_code == 202
+            job = response.get_json()
+
+            status = wait_for(lambda: (lambda body: body if body['status'] in ('done', 'failed') else None)(
+                client.get(job['status_url']).get_json()))
+            assert status['status'] == 'done', status
+            assert status['result']['countries'] == ['Kenya', 'World']
+            assert len(status['result']['years']) == 8  # the user's default_forecast_years
+
+            with auth.app.app_context():
+                analysis = auth.db.session.get(auth.SavedAnalysis, job['analysis_id'])
+                assert analysis.get_results() == status['result']
+                assert analysis.get_parameters()['confidence_level'] == 0.95
+
+            # A job nobody polls is still saved once the user's analyses are listed
+            unpolled = client.post('/api/jobs', json={'countries': ['Kenya'], 'parameters': {'horizon': 3}}).get_json()
+            queue = JobQueue(os.environ['JOB_DATABASE'])
+            wait_for(lambda: queue.get(unpolled['job_id'])['status'] == 'done')
+            assert client.get('/saved_analyses').status_code == 200
+            with auth.app.app_context():
+                analysis = auth.db.session.get(auth.SavedAnalysis, unpolled['analysis_id'])
+                assert analysis.get_results() == queue.get(unpolled['job_id'])['result']
+
+            # Malformed submissions are rejected before anything is queued
+            for body in ([1, 2], {'parameters': ['horizon']}, {'countries': 'Kenya'},
+                         {'countries': [1]}, {'parameters': {'horizon': 500}},
+                         {'parameters': {'horizon': '5'}}, {'parameters': {'confidence_level': 2}},
+                         {'parameters': {'method': 'magic'}}, {'kind': ['forecast']}):
+                response = client.post('/api/jobs', json=body)
+                assert response.status_code == 400, (body, response.status_code)
+                assert response.get_json()['success'] is False
+            assert sum(queue.counts().values()) == 2
+
+            client.get('/logout')
+            client.post('/login', data={'username': 'guest', 'password': 'guest123'})
+            assert client.get(job['status_url']).status_code == 404
+        finally:
+            os.killpg(worker.pid, signal.SIGTERM)
+            worker.wait()
+        del os.environ['DATABASE_URL'], os.environ['JOB_DATABASE']
+    print("✅ Jobs queued, polled and saved")
+
+def main():
+    """Main test function"""
+    print("🌍 Job Queue Test Suite")
+    print("=" * 50)
+
+    test_jobs_are_claimed_once()
+    test_worker_pool_runs_jobs()
+    test_heartbeat_keeps_long_jobs_leased()
+    test_flask_job_endpoints()
+
+    print("\n🎉 All job queue tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent model store
+Fits tiny models into a temporary directory
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from model_store import ModelStore, model_key, training_data_fingerprint
+
+FEATURES = ['year', 'gdp']
+
+def make_training_data(offset=0.0):
+    """A small linear training set"""
+    X = np.column_stack([np.arange(2000, 2020, dtype=float), np.linspace(1.0, 2.0, 20)])
+    y = X[:, 0] * 0.5 + X[:, 1] + offset
+    return X, y
+
+def test_model_key_components():
+    """Data, features, params and countries all change the key; country order does not"""
+    print("\n🔑 Testing model keys...")
+    fingerprint = training_data_fingerprint(*make_training_data())
+    base = model_key(fingerprint, FEATURES, {'n_estimators': 100}, ['Kenya', 'China'])
+
+    assert base == model_key(fingerprint, FEATURES, {'n_estimators': 100}, ['China', 'Kenya'])
+    assert base != model_key(training_data_fingerprint(*make_training_data(1.0)), FEATURES, {'n_estimators': 100}, ['Kenya', 'China'])
+    assert base != model_key(fingerprint, FEATURES[::-1], {'n_estimators': 100}, ['Kenya', 'China'])
+    assert base != model_key(fingerprint, FEATURES, {'n_estimators': 50}, ['Kenya', 'China'])
+    assert base != model_key(fingerprint, FEATURES, {'n_estimators': 100}, ['Kenya'])
+    print("✅ Model keys are correct")
+
+def test_models_persist_across_stores():
+    """A second store instance loads the fitted model instead of refitting"""
+    print("\n💾 Testing model persistence...")
+    X, y = make_training_data()
+    key = model_key(training_data_fingerprint(X, y), FEATURES, {})
+    fits = []
+
+    def fit():
+        fits.append(1)
+        return LinearRegression().fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ModelStore(tmp)
+        model = store.get_or_fit(key, fit)
+        assert store.get_or_fit(key, fit) is model
+
+        reloaded = ModelStore(tmp).get_or_fit(key, fit)
+        assert len(fits) == 1
+        assert np.allclose(reloaded.predict(X), model.predict(X))
+        print("✅ Stored models are reused")
+
+def test_size_bounded_lru_eviction():
+    """The least recently used model is evicted once the size budget is exceeded"""
+    print("\n🧹 Testing LRU eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ModelStore(tmp)
+        keys = []
+        for offset in range(3):
+            X, y = make_training_data(float(offset))
+            keys.append(model_key(training_data_fingerprint(X, y), FEATURES, {}))
+            store.put(keys[-1], LinearRegression().fit(X, y))
+            # mtime resolution differs between filesystems; space the writes out
+            past = time.time() - 100 + offset * 10
+            os.utime(os.path.join(tmp, keys[-1] + '.joblib'), (past, past))
+
+        # Use the oldest model, then shrink the budget to two models
+        assert ModelStore(tmp).get(keys[0]) is not None
+        model_size = max(os.path.getsize(os.path.join(tmp, key + '.joblib')) for key in keys)
+        small_store = ModelStore(tmp, max_bytes=2 * model_size)
+        X, y = make_training_data(5.0)
+        small_store.put('newest', LinearRegression().fit(X, y))
+
+        remaining = sorted(name[:-len('.joblib')] for name in os.listdir(tmp))
+        assert remaining == sorted([keys[0], 'newest'])
+        assert small_store.stats()["evictions"] == 2
+        print("✅ Old models are evicted first")
+
+def main():
+    """Main test function"""
+    print("🌍 Model Store Test Suite")
+    print("=" * 50)
+
+    test_model_key_components()
+    test_models_persist_across_stores()
+    test_size_bounded_lru_eviction()
+
+    print("\n🎉 All model store tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental forest updates
+Simulates new data years arriving in a small feature store
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from feature_store import get_feature_store
+from model_store import ModelStore
+from model_updates import PRODUCTION_ALIAS, refresh_production_forest
+
+FEATURES = ['year', 'gdp', 'population']
+PARAMS = {'n_estimators': 10, 'random_state': 42}
+
+def write_csv(path, last_year, jump=1.0):
+    """Two countries with smooth growth; years after 2010 can jump by a factor"""
+    lines = ["country,year,iso_code,population,gdp,co2"]
+    for country, scale in (('Kenya', 1.0), ('Chad', 0.2)):
+        for year in range(2000, last_year + 1):
+            factor = jump if year > 2010 else 1.0
+            growth = 1.03 ** (year - 2000)
+            lines.append(f"{country},{year},X{country[:2]},{30 * scale * growth * factor},"
+                         f"{1e9 * scale * growth * factor},{10 * scale * growth * factor}")
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+def test_incremental_update_and_drift_refit():
+    """New years add warm-started trees; drifted years trigger a full refit"""
+    print("\n🔄 Testing incremental forest updates...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        features_dir = Path(tmp) / 'features'
+        store = ModelStore(Path(tmp) / 'models')
+
+        write_csv(data_file, 2010)
+        initial, report = refresh_production_forest(get_feature_store(str(data_file), features_dir),
+                                                    FEATURES, 'co2', PARAMS, store)
+        assert report["mode"] == "initial"
+
+        unchanged, report = refresh_production_forest(get_feature_store(str(data_file), features_dir),
+                                                      FEATURES, 'co2', PARAMS, store)
+        assert report["mode"] == "unchanged" and unchanged is initial
+
+        write_csv(data_file, 2011)
+        updated, report = refresh_production_forest(get_feature_store(str(data_file), features_dir),
+                                                    FEATURES, 'co2', PARAMS, store)
+        assert report["mode"] == "incremental", report
+        assert report["trees_added"] == report["trees_retired"] == 2
+        assert len(updated.estimators_) == 10 and updated.n_estimators == 10
+        # The two oldest trees are retired and the rest kept in order
+        assert (updated.estimators_[0].tree_.threshold == initial.estimators_[2].tree_.threshold).all()
+        assert store.get_alias(PRODUCTION_ALIAS)["trained_through"] == 2011
+        assert store.get(report["key"]) is not None
+
+        # The same new data applied to a different parent forest is a different model
+        feature_store = get_feature_store(str(data_file), features_dir)
+        before = feature_store.select(end_year=2010)
+        other = RandomForestRegressor(n_estimators=10, random_state=7).fit(
+            feature_store.features(FEATURES, before), feature_store.column('co2', before))
+        store.put('other-parent', other)
+        store.set_alias(PRODUCTION_ALIAS, 'other-parent', trained_through=2010, mode='initial')
+        branched, branch_report = refresh_production_forest(feature_store, FEATURES, 'co2', PARAMS, store)
+        assert branch_report["mode"] == "incremental" and branch_report["key"] != report["key"]
+        assert (store.get(report["key"]).estimators_[0].tree_.threshold ==
+                updated.estimators_[0].tree_.threshold).all()
+
+        write_csv(data_file, 2012, jump=5.0)
+        _, report = refresh_production_forest(get_feature_store(str(data_file), features_dir),
+                                              FEATURES, 'co2', PARAMS, store)
+        assert report["mode"] == "refit"
+        assert report["drift"]["feature_shift"] > 1.0
+        print("✅ Incremental updates and drift refits work")
+
+def main():
+    """Main test function"""
+    print("🌍 Model Update Test Suite")
+    print("=" * 50)
+
+    test_incremental_update_and_drift_refit()
+
+    print("\n🎉 All model update tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
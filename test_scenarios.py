@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the what-if scenario engine
+Checks grids, batching and caching against the single-scenario forecaster
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from feature_store import get_feature_store
+from forecasting import batch_forecast
+from forest_export import CompactForest
+import scenarios
+from scenarios import ScenarioEngine, parse_growth_range, scenario_forecast, scenario_grid
+
+FEATURES = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+
+class CountingForest(RandomForestRegressor):
+    """Random Forest that counts predict calls"""
+
+    def predict(self, X):
+        self.predict_calls = getattr(self, 'predict_calls', 0) + 1
+        return super().predict(X)
+
+def make_model_and_rows(n_countries=20):
+    """Forest on synthetic growing features plus each country's latest row"""
+    rng = np.random.default_rng(0)
+    years = np.arange(2000, 2010)
+    scales = 1.0 + np.arange(n_countries)
+    growth = 1.03 ** (years - 2000)
+    X = np.column_stack([
+        np.tile(years, n_countries),
+        np.repeat(scales, years.size) * np.tile(growth, n_countries) * 1e9,
+        np.repeat(scales, years.size) * 1e6,
+        np.repeat(scales, years.size) * np.tile(growth, n_countries) * 50,
+        np.tile(growth, n_countries) * 5000
+    ])
+    y = X[:, 1] / 1e8 + rng.normal(size=len(X))
+    model = CountingForest(n_estimators=10, random_state=42).fit(X, y)
+    return model, X.reshape(n_countries, years.size, -1)[:, -1]
+
+def test_grid_matches_single_scenarios():
+    """Every scenario of the grid equals a single-scenario batch forecast"""
+    print("\n🧭 Testing the scenario grid...")
+    assert np.allclose(parse_growth_range("1.00:1.04:5"), [1.00, 1.01, 1.02, 1.03, 1.04])
+    assert parse_growth_range("1.005,1.01").tolist() == [1.005, 1.01]
+
+    rates = scenario_grid({'gdp': [1.0, 1.02, 1.04], 'energy_per_capita': [1.01, 1.05]})
+    assert rates.shape == (6, 4)
+    assert set(rates[:, 1]) == {1.01} and set(rates[:, 2]) == {1.02}
+
+    model, latest = make_model_and_rows(5)
+    years = np.arange(2010, 2016)
+    _, predictions = ScenarioEngine(model).run(latest, years, rates)
+    assert predictions.shape == (6, 5, 6)
+    for scenario, growth_rates in enumerate(rates):
+        assert np.array_equal(predictions[scenario], batch_forecast(model, latest, years, growth_rates))
+    print("✅ Grid forecasts match the per-scenario forecaster")
+
+def test_hundreds_of_scenarios_in_chunked_predicts():
+    """A 500-scenario grid is predicted in fixed-size chunks; repeated scenarios come from the cache"""
+    print("\n⚡ Testing batching and the scenario cache...")
+    model, latest = make_model_and_rows(20)
+    years = np.arange(2010, 2030)
+    # 20 countries x 20 years: ten scenarios per 4000-row chunk
+    engine = ScenarioEngine(model, chunk_rows=4000)
+    rates = scenario_grid({'gdp': np.linspace(0.98, 1.06, 5), 'population': np.linspace(0.99, 1.02, 4),
+                           'primary_energy_consumption': np.linspace(0.97, 1.03, 5),
+                           'energy_per_capita': np.linspace(1.0, 1.05, 5)})
+    assert len(rates) == 500
+
+    hashes, first = engine.run(latest, years, rates)
+    assert model.predict_calls == 50 and len(set(hashes)) == 500
+    _, unchunked = ScenarioEngine(model, chunk_rows=len(rates) * 400).run(latest, years, rates)
+    assert model.predict_calls == 51 and np.array_equal(first, unchunked)
+
+    # Half the grid again plus new scenarios: only the new ones are predicted
+    model.predict_calls = 0
+    extra = scenario_grid({'gdp': [1.1, 1.2]})
+    again_hashes, again = engine.run(latest, years, np.vstack([rates[:250], extra]))
+    assert model.predict_calls == 1
+    assert again_hashes[:250] == hashes[:250]
+    assert np.array_equal(again[:250], first[:250])
+    assert engine.stats() == {"hits": 250, "misses": 502, "cached": 502}
+
+    # Different base rows are different scenarios
+    engine.run(latest * 1.01, years, rates[:1])
+    assert model.predict_calls == 2
+    print("✅ Chunked predicts, cached per scenario hash")
+
+def test_request_limits():
+    """Range steps, grid size and forecast rows are bounded before anything is allocated"""
+    print("\n🛑 Testing request limits...")
+    for text in ("0:1:0", "0:1:100000", ",".join(["1.0"] * 51)):
+        try:
+            parse_growth_range(text)
+            raise AssertionError(f"Expected {text[:20]} to be rejected")
+        except ValueError:
+            pass
+    try:
+        scenario_grid({'gdp': np.ones(50), 'population': np.ones(50)})
+        raise AssertionError("Expected the scenario limit to be enforced")
+    except ValueError as e:
+        assert "2500 scenarios" in str(e)
+    print("✅ Oversized requests are rejected")
+
+def test_scenario_response_from_exported_forest():
+    """scenario_forecast serves the exported forest over the feature store"""
+    print("\n🌐 Testing the scenario response...")
+    rows = ["country,year,population,gdp,co2,primary_energy_consumption,energy_per_capita"]
+    for country, scale in (('Kenya', 1.0), ('Chad', 0.5)):
+        for year in range(2000, 2011):
+            growth = 1.03 ** (year - 2000)
+            rows.append(f"{country},{year},{30e6 * scale},{1e10 * scale * growth},{10 * scale * growth},"
+                        f"{50 * scale * growth},{500 * growth}")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text("\n".join(rows) + "\n", encoding='utf-8')
+        store = get_feature_store(str(data_file), Path(tmp) / 'features')
+        model = RandomForestRegressor(n_estimators=10, random_state=42).fit(store.features(FEATURES), store.column('co2'))
+        forest = CompactForest.from_model(model)
+        forest.meta["features"] = FEATURES
+
+        response = scenario_forecast(forest, store, ['Kenya', 'Chad'], 3, {'gdp': [1.0, 1.05]})
+        assert response["years"] == [2011, 2012, 2013]
+        assert [scenario["growth"]["gdp"] for scenario in response["scenarios"]] == [1.0, 1.05]
+        assert set(response["scenarios"][0]["co2"]) == {'Kenya', 'Chad'}
+        assert len(response["scenarios"][0]["co2"]['Kenya']) == 3
+
+        try:
+            scenario_forecast(forest, store, None, 3, {'gdp': np.ones(40), 'population': np.ones(30)})
+            raise AssertionError("Expected the scenario limit to be enforced")
+        except ValueError as e:
+            assert "at most" in str(e)
+
+        # 100 scenarios x 2 countries x 50 years is over a lowered row limit
+        scenarios.MAX_SCENARIO_ROWS, limit = 5_000, scenarios.MAX_SCENARIO_ROWS
+        try:
+            scenario_forecast(forest, store, None, 50, {'gdp': np.ones(10), 'population': np.ones(10)})
+            raise AssertionError("Expected the row limit to be enforced")
+        except ValueError as e:
+            assert "forecast rows" in str(e)
+        finally:
+            scenarios.MAX_SCENARIO_ROWS = limit
+    print("✅ Scenario responses are served")
+
+def main():
+    """Main test function"""
+    print("🌍 Scenario Engine Test Suite")
+    print("=" * 50)
+
+    test_grid_matches_single_scenarios()
+    test_hundreds_of_scenarios_in_chunked_predicts()
+    test_request_limits()
+    test_scenario_response_from_exported_forest()
+
+    print("\n🎉 All scenario tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for entry point startup time
+Imports every entry point in a fresh interpreter and enforces its cold-start budget
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from startup_profile import DEFERRED_MODULES, ENTRY_POINTS, format_report, parse_importtime, profile_startup
+
+SAMPLE_IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      5000 |       9000 |     numpy._core
+import time:      1000 |      10000 |   numpy
+import time:       200 |      10200 | main
+"""
+
+def test_parse_importtime():
+    """importtime rows are parsed with their nesting depth"""
+    print("\n🔬 Testing the importtime parser...")
+    rows = parse_importtime(SAMPLE_IMPORTTIME)
+    assert rows[0] == ('_io', 120, 120, 1)
+    assert rows[2] == ('numpy._core', 5000, 9000, 2)
+    assert rows[-1] == ('main', 200, 10200, 0)
+    print("✅ Import times parsed")
+
+def test_entry_points_start_within_budget():
+    """No entry point loads pandas/scikit-learn/matplotlib at startup or exceeds its budget"""
+    print("\n🚀 Testing cold-start budgets...")
+    for name in ENTRY_POINTS:
+        profile = profile_startup(name, runs=2)
+        print(format_report(profile, top=3))
+        assert not profile["deferred_loaded"], f"{name} imports {profile['deferred_loaded']} at startup"
+        assert profile["wall_ms"] <= profile["budget_ms"], f"{name} took {profile['wall_ms']} ms"
+    print(f"✅ All entry points start within budget without {', '.join(DEFERRED_MODULES)}")
+
+def main():
+    """Main test function"""
+    print("🌍 Startup Time Test Suite")
+    print("=" * 50)
+
+    test_parse_importtime()
+    test_entry_points_start_within_budget()
+
+    print("\n🎉 All startup tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
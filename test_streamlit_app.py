@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for the Streamlit forecast app
+Drives src/app.py headlessly through selection, slider and empty-selection reruns
+"""
+
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).parent / 'src' / 'app.py')
+
+def test_app_reruns():
+    """The app trains, forecasts and reruns on slider changes without errors"""
+    print("\n🖥️  Testing the Streamlit app...")
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    assert not at.exception, at.exception
+    assert 'Forecasted Data' in at.subheader.values
+    assert [value for value in at.markdown.values if value.startswith('**')] == ['**Kenya**', '**China**', '**United States**']
+
+    # Horizon and confidence only change the cached forecast and chart
+    at.sidebar.slider[2].set_value(12).run()
+    at.sidebar.slider[3].set_value(0.8).run()
+    assert not at.exception, at.exception
+    assert len(at.dataframe[-1].value) == 12
+
+    at.sidebar.multiselect[0].set_value([]).run()
+    assert not at.exception, at.exception
+    assert at.warning.values == ['No training data for the selected countries and years.']
+    print("✅ App reruns cleanly")
+
+def main():
+    """Main test function"""
+    print("🌍 Streamlit App Test Suite")
+    print("=" * 50)
+
+    test_app_reruns()
+
+    print("\n🎉 All Streamlit app tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the parallel training scheduler
+Fits small per-group models in a two-worker process pool
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from model_store import ModelStore
+from training_scheduler import TrainingScheduler, group_rows
+
+FEATURES = ['year', 'gdp']
+
+def make_training_data():
+    """Three groups with different slopes"""
+    labels = np.repeat(['Kenya', 'Chad', 'Japan'], 10)
+    X = np.column_stack([np.tile(np.arange(2000, 2010, dtype=float), 3), np.arange(30, dtype=float)])
+    slopes = np.repeat([1.0, 2.0, 3.0], 10)
+    return labels, X, X[:, 0] * slopes
+
+def test_group_rows():
+    """Rows are grouped by label in their original order"""
+    groups = group_rows(['b', 'a', 'b', 'c', 'a'])
+    assert {name: rows.tolist() for name, rows in groups.items()} == {'a': [1, 4], 'b': [0, 2], 'c': [3]}
+
+def test_parallel_fits_are_stored_and_reused():
+    """Groups are fitted in workers, stored, and loaded on the next run"""
+    print("\n🏭 Testing parallel per-group training...")
+    labels, X, y = make_training_data()
+    events = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scheduler = TrainingScheduler(store=ModelStore(tmp), max_workers=2,
+                                      model_class=LinearRegression, progress=events.append)
+        result = scheduler.train(X, y, group_rows(labels), FEATURES, {})
+
+        assert sorted(result["models"]) == ['Chad', 'Japan', 'Kenya']
+        assert not result["cached"] and not result["failed"]
+        japan = labels == 'Japan'
+        assert np.allclose(result["models"]['Japan'].predict(X[japan]), y[japan])
+        assert sorted(event["done"] for event in events) == [1, 2, 3]
+        assert all(event["seconds"] >= 0 for event in events)
+
+        rerun = TrainingScheduler(store=ModelStore(tmp), model_class=LinearRegression, progress=None)
+        second = rerun.train(X, y, group_rows(labels), FEATURES, {})
+        assert sorted(second["cached"]) == ['Chad', 'Japan', 'Kenya']
+        print("✅ Per-group models trained in parallel and cached")
+
+def main():
+    """Main test function"""
+    print("🌍 Training Scheduler Test Suite")
+    print("=" * 50)
+
+    test_group_rows()
+    test_parallel_fits_are_stored_and_reused()
+
+    print("\n🎉 All training scheduler tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
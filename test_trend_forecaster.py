@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized trend forecaster
+Uses exact exponential series so fitted trends can be checked directly
+"""
+
+import json
+import socketserver
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import data_processor
+import feature_store
+import forest_export
+import trend_forecaster
+from trend_forecaster import TrendForecaster, build_trend_forecaster
+
+def test_log_linear_recovers_growth():
+    """Exponential series are fitted exactly, with missing years ignored"""
+    print("\n📈 Testing batched log-linear fits...")
+    years = np.arange(2000, 2011)
+    co2 = np.column_stack([100.0 * 1.05 ** (years - 2000), 50.0 * 0.98 ** (years - 2000), np.full(years.size, np.nan)])
+    co2[3, 0] = np.nan
+    co2[-1, 2] = 7.0
+    forecaster = TrendForecaster(['Growing', 'Shrinking', 'Sparse'], years, co2)
+
+    result = forecaster.forecast(horizon=3, method="log_linear")
+    assert result["countries"] == ['Growing', 'Shrinking']
+    assert result["years"] == [2011, 2012, 2013]
+    growing = result["forecasts"]['Growing']
+    assert np.allclose(growing["co2"], 100.0 * 1.05 ** np.array([11, 12, 13]), atol=1e-3)
+    assert growing["annual_growth"] == 0.05 and growing["fit_years"] == 10
+    assert result["forecasts"]['Shrinking']["last_observed"] == {"year": 2010, "co2": co2[-1, 1]}
+    print("✅ Trends are recovered for every country")
+
+def test_damped_trend_flattens():
+    """Damped forecasts grow less than log-linear ones and level off"""
+    print("\n🪶 Testing damped trends...")
+    years = np.arange(2000, 2011)
+    forecaster = TrendForecaster(['Growing'], years, (100.0 * 1.05 ** (years - 2000))[:, None], damping=0.8)
+
+    damped = np.array(forecaster.forecast(['Growing'], 30)["forecasts"]['Growing']["co2"])
+    linear = np.array(forecaster.forecast(['Growing'], 30, "log_linear")["forecasts"]['Growing']["co2"])
+    assert np.all(damped <= linear + 1e-9)
+    assert np.all(np.diff(damped) > 0) and damped[-1] < damped[-2] * 1.001
+    print("✅ Damped trends level off")
+
+def test_forecaster_from_snapshot():
+    """Forecasters fitted on a snapshot include aggregates and honour the horizon cap"""
+    print("\n🗂️ Testing snapshot-fitted forecasts...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text(
+            "country,year,iso_code,co2\n"
+            "Kenya,2000,KEN,10.0\nKenya,2001,KEN,11.0\n"
+            "World,2000,OWID_WRL,100.0\nWorld,2001,OWID_WRL,102.0\n",
+            encoding='utf-8'
+        )
+        forecaster = build_trend_forecaster(data_processor.get_dataset_snapshot(str(data_file)))
+
+        result = forecaster.forecast(['World', 'Atlantis'], horizon=500)
+        assert result["countries"] == ['World']
+        assert result["base_year"] == 2001 and len(result["years"]) == 50
+        print("✅ Snapshot forecasts are correct")
+
+def test_forest_forecasts_skip_the_trend_forecaster():
+    """method=random_forest is served from the exported forest without building trend forecasts"""
+    print("\n🌲 Testing forest forecast routing...")
+    import simple_server
+
+    rows = ["country,year,population,gdp,co2,primary_energy_consumption,energy_per_capita"]
+    for year in range(2000, 2011):
+        growth = 1.03 ** (year - 2000)
+        rows.append(f"Kenya,{year},30000000,{1e10 * growth},{10 * growth},{50 * growth},{500 * growth}")
+    trend_calls = []
+    originals = (trend_forecaster.get_trend_forecaster, forest_export.get_serving_forest,
+                 feature_store.get_feature_store)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / 'owid-co2-data.csv'
+        data_file.write_text("\n".join(rows) + "\n", encoding='utf-8')
+        store = feature_store.get_feature_store(str(data_file), Path(tmp) / 'features')
+        features = ['year', 'gdp', 'population', 'primary_energy_consumption', 'energy_per_capita']
+        model = RandomForestRegressor(n_estimators=5, random_state=42).fit(store.features(features), store.column('co2'))
+        forest = forest_export.CompactForest.from_model(model)
+        forest.meta["features"] = features
+
+        # An unavailable trend forecaster must not affect forest forecasts
+        trend_forecaster.get_trend_forecaster = lambda *args: trend_calls.append(args)
+        forest_export.get_serving_forest = lambda *args: forest
+        feature_store.get_feature_store = lambda *args: store
+        server = socketserver.TCPServer(('127.0.0.1', 0), simple_server.CO2DashboardHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/api/forecast?method=random_forest&countries=Kenya&horizon=2"
+            response = json.loads(urllib.request.urlopen(url).read())
+            assert response["method"] == "random_forest" and response["years"] == [2011, 2012]
+            assert trend_calls == []
+
+            # A forest exported without its feature columns is a JSON error, not a crash
+            forest.meta["features"] = None
+            try:
+                urllib.request.urlopen(url)
+                raise AssertionError("Expected 503 for a forest without features")
+            except urllib.error.HTTPError as e:
+                assert e.code == 503 and 'feature columns' in json.loads(e.read())['error']
+        finally:
+            server.shutdown()
+            server.server_close()
+            (trend_forecaster.get_trend_forecaster, forest_export.get_serving_forest,
+             feature_store.get_feature_store) = originals
+    print("✅ Forest forecasts bypass the trend forecaster")
+
+def main():
+    """Main test function"""
+    print("🌍 Trend Forecaster Test Suite")
+    print("=" * 50)
+
+    test_log_linear_recovers_growth()
+    test_damped_trend_flattens()
+    test_forecaster_from_snapshot()
+    test_forest_forecasts_skip_the_trend_forecaster()
+
+    print("\n🎉 All trend forecaster tests passed!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())